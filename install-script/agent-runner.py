@@ -4,21 +4,44 @@
 from __future__ import annotations
 
 import argparse
-import json
+import marshal
 import os
-import subprocess
+import re
 import sys
 import threading
-from dataclasses import dataclass
-from datetime import datetime
+from dataclasses import astuple, dataclass, fields, replace
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Tuple
+from typing import TYPE_CHECKING, BinaryIO, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+if TYPE_CHECKING:
+    import codecs
+    import subprocess
 
 
 INSTALL_ROOT = Path(__file__).resolve().parent
 REPO_ROOT = INSTALL_ROOT.parent
 CONFIG_PATH = INSTALL_ROOT / "agent-tools.json"
-LOG_ROOT = Path.home() / ".local" / "share" / "hpf-linux-config" / "logs"
+DATA_ROOT = Path.home() / ".local" / "share" / "hpf-linux-config"
+LOG_ROOT = DATA_ROOT / "logs"
+JOURNAL_ROOT = DATA_ROOT / "journal"
+LOG_KEEP = 20
+LOG_MAX_MB = 256
+LOG_SETTLE_SECONDS = 60
+JOURNAL_FORMAT = 1
+CHECK_CACHE_PATH = DATA_ROOT / "check-cache.json"
+CATALOG_SNAPSHOT_PATH = DATA_ROOT / "cache" / "agent-tools.marshal"
+CATALOG_SNAPSHOT_FORMAT = 2
+CHECK_CACHE_TTL = 3600
+CHECK_TIMEOUT = 30
+LOGIN_PROFILE_FILES = (
+    Path("/etc/profile"),
+    Path("/etc/profile.d"),
+    Path("/etc/bash.bashrc"),
+    Path.home() / ".bash_profile",
+    Path.home() / ".bash_login",
+    Path.home() / ".profile",
+    Path.home() / ".bashrc",
+)
 EXPECTED_REPO_ROOT = Path.home() / "hpf_Linux_Config"
 PRESET_TOOL_IDS = {
     "bootstrap": "preset-bootstrap",
@@ -42,6 +65,11 @@ class ToolSpec:
     requires_ssh: bool
     check_cmd: str
     timeout: int
+    depends_on: Tuple[str, ...] = ()
+    locks: Tuple[str, ...] = ()
+    check_login_shell: bool = False
+    check_cache_binary: Optional[str] = None
+    check_timeout: Optional[int] = None
 
     @property
     def script_path(self) -> Path:
@@ -54,7 +82,28 @@ class ToolSpec:
         return self.tool_id
 
 
+@dataclass(frozen=True)
+class PresetSpec:
+    name: str
+    mode: str
+    includes: Tuple[str, ...]
+    members: Tuple[str, ...]
+
+    @property
+    def tool_id(self) -> str:
+        return PRESET_TOOL_IDS[self.name]
+
+
+@dataclass(frozen=True)
+class PresetNode:
+    label: str
+    spec: ToolSpec
+    depends_on: Tuple[str, ...]
+    locks: Tuple[str, ...]
+
+
 Catalog = List[Tuple[str, str, List[ToolSpec]]]
+PRESET_MODES = ("members", "script")
 
 
 def eprint(message: str) -> None:
@@ -72,9 +121,106 @@ def assert_expected_repo_root() -> int:
     return 0
 
 
-def load_catalog() -> Tuple[Catalog, Dict[str, ToolSpec]]:
-    with CONFIG_PATH.open("r", encoding="utf-8") as handle:
-        data = json.load(handle)
+def _string_list(value: object, label: str) -> Tuple[str, ...]:
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise ValueError("{} must be a list of strings".format(label))
+    return tuple(value)
+
+
+LoadedCatalog = Tuple[Catalog, Dict[str, ToolSpec], Dict[str, PresetSpec]]
+
+
+def load_catalog(use_snapshot: bool = True) -> LoadedCatalog:
+    """Load agent-tools.json, reusing the compiled snapshot while the source is unchanged."""
+    stat = CONFIG_PATH.stat()
+    # inode and ctime catch rewrites that keep the size and restore the mtime.
+    fingerprint = [stat.st_mtime_ns, stat.st_size, stat.st_ino, stat.st_ctime_ns]
+    snapshot = _read_catalog_snapshot() if use_snapshot else None
+    if snapshot and snapshot["fingerprint"] == fingerprint:
+        return _thaw_catalog(snapshot["catalog"], snapshot["presets"])
+
+    import hashlib
+
+    raw = CONFIG_PATH.read_bytes()
+    digest = hashlib.sha256(raw).hexdigest()
+    if snapshot and snapshot["sha256"] == digest:
+        loaded = _thaw_catalog(snapshot["catalog"], snapshot["presets"])
+    else:
+        import json
+
+        loaded = parse_catalog(json.loads(raw.decode("utf-8")))
+    if use_snapshot:
+        _write_catalog_snapshot(loaded, fingerprint, digest)
+    return loaded
+
+
+def _snapshot_signature() -> Tuple[object, ...]:
+    return (
+        CATALOG_SNAPSHOT_FORMAT,
+        marshal.version,
+        tuple(sys.version_info[:2]),
+        str(CONFIG_PATH),
+        tuple(field.name for field in fields(ToolSpec)),
+        tuple(field.name for field in fields(PresetSpec)),
+    )
+
+
+def _read_catalog_snapshot() -> Optional[dict]:
+    try:
+        with CATALOG_SNAPSHOT_PATH.open("rb") as handle:
+            snapshot = marshal.load(handle)
+    except (OSError, EOFError, TypeError, ValueError):
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get("signature") != _snapshot_signature():
+        return None
+    return snapshot
+
+
+def _write_catalog_snapshot(loaded: LoadedCatalog, fingerprint: List[int], digest: str) -> None:
+    catalog, _tool_map, presets = loaded
+    snapshot = {
+        "signature": _snapshot_signature(),
+        "fingerprint": fingerprint,
+        "sha256": digest,
+        "catalog": [
+            (category_id, category_name, [astuple(spec) for spec in tools])
+            for category_id, category_name, tools in catalog
+        ],
+        "presets": [astuple(preset) for preset in presets.values()],
+    }
+    try:
+        CATALOG_SNAPSHOT_PATH.parent.mkdir(parents=True, exist_ok=True)
+        temporary = CATALOG_SNAPSHOT_PATH.with_name(
+            ".{}.{}.tmp".format(CATALOG_SNAPSHOT_PATH.name, os.getpid())
+        )
+        with temporary.open("wb") as handle:
+            marshal.dump(snapshot, handle)
+        temporary.replace(CATALOG_SNAPSHOT_PATH)
+    except OSError:
+        pass
+
+
+def _thaw_catalog(raw_catalog: list, raw_presets: list) -> LoadedCatalog:
+    """Rebuild specs from a snapshot that was validated when it was written."""
+    catalog: Catalog = []
+    tool_map: Dict[str, ToolSpec] = {}
+    for category_id, category_name, raw_tools in raw_catalog:
+        tools = [ToolSpec(*values) for values in raw_tools]
+        for spec in tools:
+            tool_map[spec.tool_id] = spec
+        catalog.append((category_id, category_name, tools))
+    presets = {values[0]: PresetSpec(*values) for values in raw_presets}
+    return catalog, tool_map, presets
+
+
+def parse_catalog(data: dict) -> LoadedCatalog:
+    """Validate decoded agent-tools.json data and build the runner's specs."""
+    if not isinstance(data, dict):
+        raise ValueError("agent-tools.json must contain an object")
+
+    lock_names = data.get("locks", {})
+    if not isinstance(lock_names, dict):
+        raise ValueError("agent-tools.json 'locks' must be an object")
 
     categories = data.get("categories")
     if not isinstance(categories, list):
@@ -124,8 +270,32 @@ def load_catalog() -> Tuple[Catalog, Dict[str, ToolSpec]]:
                 requires_ssh=bool(tool["requires_ssh"]),
                 check_cmd=str(tool["check_cmd"]),
                 timeout=int(tool["timeout"]),
+                depends_on=_string_list(
+                    tool.get("depends_on", []), "depends_on of {}".format(tool["id"])
+                ),
+                locks=_string_list(tool.get("locks", []), "locks of {}".format(tool["id"])),
+                check_login_shell=bool(tool.get("check_login_shell", False)),
+                check_cache_binary=tool.get("check_cache_binary"),
+                check_timeout=int(tool["check_timeout"]) if "check_timeout" in tool else None,
             )
 
+            if spec.check_cache_binary is not None and (
+                not isinstance(spec.check_cache_binary, str) or not spec.check_cache_binary
+            ):
+                raise ValueError(
+                    "check_cache_binary of {} must be a non-empty string".format(spec.tool_id)
+                )
+            if spec.check_timeout is not None and spec.check_timeout < 1:
+                raise ValueError("check_timeout of {} must be at least 1".format(spec.tool_id))
+
+            unknown_locks = [lock for lock in spec.locks if lock not in lock_names]
+            if unknown_locks:
+                raise ValueError(
+                    "tool {} uses undeclared locks: {}".format(
+                        spec.tool_id, ", ".join(unknown_locks)
+                    )
+                )
+
             if spec.tool_id in tool_map:
                 raise ValueError("duplicate tool id: {}".format(spec.tool_id))
 
@@ -134,7 +304,158 @@ def load_catalog() -> Tuple[Catalog, Dict[str, ToolSpec]]:
 
         catalog.append((str(category_id), str(category_name), tools))
 
-    return catalog, tool_map
+    validate_dependencies(tool_map)
+    presets = load_presets(data.get("presets"), tool_map)
+    return catalog, tool_map, presets
+
+
+def validate_dependencies(tool_map: Dict[str, ToolSpec]) -> None:
+    for spec in tool_map.values():
+        unknown = [dep for dep in spec.depends_on if dep not in tool_map]
+        if unknown:
+            raise ValueError(
+                "tool {} depends on unknown tools: {}".format(spec.tool_id, ", ".join(unknown))
+            )
+
+    visiting: Set[str] = set()
+    visited: Set[str] = set()
+
+    def visit(tool_id: str, path: List[str]) -> None:
+        if tool_id in visited:
+            return
+        if tool_id in visiting:
+            raise ValueError("dependency cycle: {}".format(" -> ".join(path + [tool_id])))
+        visiting.add(tool_id)
+        for dep in tool_map[tool_id].depends_on:
+            visit(dep, path + [tool_id])
+        visiting.discard(tool_id)
+        visited.add(tool_id)
+
+    for tool_id in tool_map:
+        visit(tool_id, [])
+
+
+def load_presets(raw: object, tool_map: Dict[str, ToolSpec]) -> Dict[str, PresetSpec]:
+    if not isinstance(raw, dict):
+        raise ValueError("agent-tools.json must contain a 'presets' object")
+    if set(raw) != set(PRESET_TOOL_IDS):
+        raise ValueError(
+            "presets must be exactly: {}".format(", ".join(sorted(PRESET_TOOL_IDS)))
+        )
+
+    presets: Dict[str, PresetSpec] = {}
+    for name, entry in raw.items():
+        if not isinstance(entry, dict):
+            raise ValueError("preset {!r} must be an object".format(name))
+        preset = PresetSpec(
+            name=name,
+            mode=str(entry.get("mode", "members")),
+            includes=_string_list(entry.get("includes", []), "includes of preset {}".format(name)),
+            members=_string_list(entry.get("members", []), "members of preset {}".format(name)),
+        )
+        if preset.mode not in PRESET_MODES:
+            raise ValueError("preset {} has unknown mode: {}".format(name, preset.mode))
+        if preset.tool_id not in tool_map:
+            raise ValueError("preset {} has no catalog entry {}".format(name, preset.tool_id))
+        unknown = [item for item in preset.includes if item not in raw]
+        unknown += [item for item in preset.members if item not in tool_map]
+        if unknown:
+            raise ValueError(
+                "preset {} references unknown entries: {}".format(name, ", ".join(unknown))
+            )
+        presets[name] = preset
+
+    for name in presets:
+        _expand_preset(name, presets, [])
+    return presets
+
+
+def _expand_preset(
+    name: str, presets: Dict[str, PresetSpec], stack: List[str]
+) -> List[Tuple[str, PresetSpec]]:
+    """Return ``(kind, preset)`` pairs in execution order, flattening includes."""
+    if name in stack:
+        raise ValueError("preset include cycle: {}".format(" -> ".join(stack + [name])))
+    preset = presets[name]
+    if stack and preset.mode == "script":
+        return [("script", preset)]
+    expanded: List[Tuple[str, PresetSpec]] = []
+    for included in preset.includes:
+        expanded.extend(_expand_preset(included, presets, stack + [name]))
+    expanded.append(("members", preset))
+    return expanded
+
+
+def unique(items: Sequence[str]) -> List[str]:
+    seen: Set[str] = set()
+    result: List[str] = []
+    for item in items:
+        if item not in seen:
+            seen.add(item)
+            result.append(item)
+    return result
+
+
+def preset_members(name: str, presets: Dict[str, PresetSpec]) -> List[str]:
+    """Every tool id a preset promises, in declaration order."""
+    members: List[str] = []
+    preset = presets[name]
+    for included in preset.includes:
+        members.extend(preset_members(included, presets))
+    members.extend(preset.members)
+    return unique(members)
+
+
+def preset_check_ids(name: str, presets: Dict[str, PresetSpec]) -> List[str]:
+    """Tool ids whose check results a run of this preset can change.
+
+    That is the preset itself, every preset it includes and all their members.
+    """
+    preset = presets[name]
+    ids = [preset.tool_id]
+    for included in preset.includes:
+        ids.extend(preset_check_ids(included, presets))
+    ids.extend(preset.members)
+    return unique(ids)
+
+
+def plan_preset(
+    name: str, presets: Dict[str, PresetSpec], tool_map: Dict[str, ToolSpec]
+) -> List[PresetNode]:
+    """Build the install DAG for a preset.
+
+    Script-mode presets stay opaque and act as barriers: every node planned after
+    them waits for them. Dependencies on tools outside the plan are assumed to be
+    provided beforehand, exactly like the shell presets assume it.
+    """
+    ordered: List[Tuple[ToolSpec, Tuple[str, ...]]] = []
+    planned: Set[str] = set()
+    barriers: List[str] = []
+
+    def add(spec: ToolSpec) -> None:
+        if spec.tool_id not in planned:
+            planned.add(spec.tool_id)
+            ordered.append((spec, tuple(barriers)))
+
+    for kind, preset in _expand_preset(name, presets, []):
+        if kind == "script" or preset.mode == "script":
+            add(tool_map[preset.tool_id])
+            barriers.append(preset.tool_id)
+            continue
+        for tool_id in preset.members:
+            add(tool_map[tool_id])
+
+    return [
+        PresetNode(
+            label=spec.tool_id,
+            spec=spec,
+            depends_on=tuple(
+                dep for dep in unique(list(waits_for) + list(spec.depends_on)) if dep in planned
+            ),
+            locks=spec.locks,
+        )
+        for spec, waits_for in ordered
+    ]
 
 
 def resolve_tool(tool_id: str, tool_map: Dict[str, ToolSpec]) -> ToolSpec:
@@ -144,18 +465,458 @@ def resolve_tool(tool_id: str, tool_map: Dict[str, ToolSpec]) -> ToolSpec:
         raise KeyError("unknown tool id: {}".format(tool_id)) from exc
 
 
-def run_check_command(command: str) -> subprocess.CompletedProcess:
-    return subprocess.run(
-        ["bash", "-lc", command],
-        cwd=str(INSTALL_ROOT),
-        text=True,
-        capture_output=True,
-    )
+_REDIRECTS = r"(?:\s+(?:[12&]?>\s*/dev/null|2>&1))*\s*"
+_WHICH_CHECK = re.compile(r"^(?:command -v|which) ([A-Za-z0-9._+-]+)" + _REDIRECTS + "$")
+_VERSION_CHECK = re.compile(r"^([A-Za-z0-9._+-]+) --version" + _REDIRECTS + "$")
+_LOGIN_PATH_MARKER = "__HPF_LOGIN_PATH__="
+_login_path: Optional[str] = None
+_login_path_lock = threading.Lock()
+
+
+def login_path() -> str:
+    """PATH as seen by a login shell, computed once per process."""
+    global _login_path
+    with _login_path_lock:
+        if _login_path is None:
+            import subprocess
+
+            completed = subprocess.run(
+                ["bash", "-lc", "printf '\\n{}%s\\n' \"$PATH\"".format(_LOGIN_PATH_MARKER)],
+                cwd=str(INSTALL_ROOT),
+                text=True,
+                capture_output=True,
+            )
+            _login_path = os.environ.get("PATH", "")
+            for line in completed.stdout.splitlines():
+                if line.startswith(_LOGIN_PATH_MARKER):
+                    _login_path = line[len(_LOGIN_PATH_MARKER) :]
+        return _login_path
+
+
+def classify_check(command: str) -> Optional[Tuple[str, str]]:
+    """Return ``(kind, executable)`` for check_cmds that need no shell at all."""
+    command = command.strip()
+    match = _WHICH_CHECK.match(command)
+    if match:
+        return "which", match.group(1)
+    match = _VERSION_CHECK.match(command)
+    if match:
+        return "version", match.group(1)
+    return None
+
+
+def _check_env() -> Dict[str, str]:
+    env = os.environ.copy()
+    env["PATH"] = login_path()
+    return env
+
+
+def check_timeout(spec: ToolSpec) -> int:
+    """Seconds a tool's check_cmd may run: its catalog ``check_timeout`` or CHECK_TIMEOUT."""
+    return spec.check_timeout or CHECK_TIMEOUT
+
+
+def _run_check_process(
+    command: str, argv: List[str], env: Optional[Dict[str, str]], timeout: int
+) -> subprocess.CompletedProcess:
+    """Run one check process, turning a hang past ``timeout`` seconds into status 124."""
+    import subprocess
+
+    try:
+        return subprocess.run(
+            argv,
+            cwd=str(INSTALL_ROOT),
+            env=env,
+            stdin=subprocess.DEVNULL,
+            text=True,
+            capture_output=True,
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        return subprocess.CompletedProcess(
+            command, 124, "", "[runner] check timed out after {} seconds\n".format(timeout)
+        )
+
+
+def run_check_command(spec: ToolSpec) -> subprocess.CompletedProcess:
+    """Run a tool's check_cmd through the cheapest engine that keeps its meaning.
+
+    ``command -v X`` / ``which X`` are answered in-process and ``X --version`` is
+    executed directly; everything else runs in a non-login ``bash -c`` with the
+    login shell's PATH. Only entries with ``check_login_shell`` pay for
+    ``bash -lc``.
+    """
+    import shutil
+    import subprocess
+
+    command = spec.check_cmd
+    timeout = check_timeout(spec)
+    if spec.check_login_shell:
+        return _run_check_process(command, ["bash", "-lc", command], None, timeout)
+
+    simple = classify_check(command)
+    if simple is not None:
+        kind, name = simple
+        executable = shutil.which(name, path=login_path())
+        if executable is None:
+            return subprocess.CompletedProcess(
+                command, 1 if kind == "which" else 127, "", ""
+            )
+        if kind == "which":
+            return subprocess.CompletedProcess(command, 0, executable + "\n", "")
+        return _run_check_process(command, [executable, "--version"], _check_env(), timeout)
+
+    return _run_check_process(command, ["bash", "-c", command], _check_env(), timeout)
+
+
+def check_binary(spec: ToolSpec) -> Optional[str]:
+    """The executable whose identity fully determines a check's result, if any.
+
+    That is the target of a simple check. Any other check_cmd is only cached
+    when its catalog entry names that executable in ``check_cache_binary``;
+    the catalog, not the runner, vouches that nothing else affects it.
+    """
+    if spec.check_login_shell:
+        return None
+    simple = classify_check(spec.check_cmd)
+    if simple is not None:
+        return simple[1]
+    return spec.check_cache_binary
+
+
+def _fingerprint(path: Path) -> Optional[List[object]]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return [str(path), stat.st_mtime_ns, stat.st_size, stat.st_ino]
+
+
+def _profile_fingerprint() -> List[object]:
+    return [_fingerprint(path) for path in LOGIN_PROFILE_FILES]
+
+
+class CheckCache:
+    """Persistent check results keyed by tool id, check_cmd hash and binary fingerprint.
+
+    Entries expire after ``ttl`` seconds and are dropped explicitly whenever an
+    install touches the tool. The login-shell PATH is cached alongside, keyed by
+    the fingerprints of the bash startup files.
+    """
+
+    def __init__(self, path: Path = CHECK_CACHE_PATH, ttl: Optional[int] = None) -> None:
+        self.path = path
+        self.ttl = ttl if ttl is not None else env_int("HPF_CHECK_CACHE_TTL", CHECK_CACHE_TTL, minimum=0)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, dict] = self._read().get("entries", {})
+        self._updated: Dict[str, dict] = {}
+        self._dropped: Set[str] = set()
+        self._seeded_login_path = False
+
+    def _read(self) -> dict:
+        import json
+
+        try:
+            with self.path.open("r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) and data.get("version") == 1 else {}
+
+    def _fresh(self, entry: dict) -> bool:
+        import time
+
+        return time.time() - float(entry.get("checked_at", 0)) < self.ttl
+
+    def seed_login_path(self) -> None:
+        """Reuse a cached login PATH while the shell startup files are unchanged."""
+        global _login_path
+        entry = self._read().get("login_path")
+        if (
+            isinstance(entry, dict)
+            and self._fresh(entry)
+            and entry.get("profile") == _profile_fingerprint()
+        ):
+            with _login_path_lock:
+                if _login_path is None:
+                    _login_path = str(entry["path"])
+                    self._seeded_login_path = True
+
+    def _key(self, spec: ToolSpec) -> Optional[Tuple[str, List[object]]]:
+        import hashlib
+        import shutil
+
+        binary = check_binary(spec)
+        if binary is None:
+            return None
+        resolved = shutil.which(binary, path=login_path())
+        if resolved is None:
+            return None
+        fingerprint = _fingerprint(Path(resolved))
+        if fingerprint is None:
+            return None
+        return hashlib.sha256(spec.check_cmd.encode("utf-8")).hexdigest(), fingerprint
+
+    def get(self, spec: ToolSpec) -> Optional[subprocess.CompletedProcess]:
+        import subprocess
+
+        key = self._key(spec)
+        if key is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(spec.tool_id)
+        if (
+            not entry
+            or entry.get("check_sha256") != key[0]
+            or entry.get("fingerprint") != key[1]
+            or not self._fresh(entry)
+        ):
+            return None
+        return subprocess.CompletedProcess(
+            spec.check_cmd, int(entry["returncode"]), entry["stdout"], entry["stderr"]
+        )
+
+    def put(self, spec: ToolSpec, completed: subprocess.CompletedProcess) -> None:
+        import time
+
+        key = self._key(spec)
+        # A timed-out check says nothing about the binary; ask again next time.
+        if key is None or completed.returncode == 124:
+            return
+        entry = {
+            "check_sha256": key[0],
+            "fingerprint": key[1],
+            "returncode": completed.returncode,
+            "stdout": completed.stdout or "",
+            "stderr": completed.stderr or "",
+            "checked_at": time.time(),
+        }
+        with self._lock:
+            self._entries[spec.tool_id] = entry
+            self._updated[spec.tool_id] = entry
+            self._dropped.discard(spec.tool_id)
+
+    def invalidate(self, tool_ids: Sequence[str]) -> None:
+        with self._lock:
+            for tool_id in tool_ids:
+                self._entries.pop(tool_id, None)
+                self._updated.pop(tool_id, None)
+                self._dropped.add(tool_id)
+
+    def save(self) -> None:
+        """Merge this process's changes into the file written by any other run."""
+        import json
+        import time
+
+        with self._lock:
+            data = self._read()
+            entries = data.get("entries", {})
+            for tool_id in self._dropped:
+                entries.pop(tool_id, None)
+            entries.update(self._updated)
+            login_entry = data.get("login_path")
+            if _login_path is not None and not self._seeded_login_path:
+                login_entry = {
+                    "path": _login_path,
+                    "profile": _profile_fingerprint(),
+                    "checked_at": time.time(),
+                }
+            payload = {"version": 1, "entries": entries, "login_path": login_entry}
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                temporary = self.path.with_name(
+                    ".{}.{}.tmp".format(self.path.name, os.getpid())
+                )
+                temporary.write_text(json.dumps(payload, sort_keys=True), encoding="utf-8")
+                temporary.replace(self.path)
+            except OSError as exc:
+                eprint("[runner] could not write check cache {}: {}".format(self.path, exc))
+            self._updated.clear()
+            self._dropped.clear()
+
+
+def open_check_cache(enabled: bool = True) -> Optional[CheckCache]:
+    """Return the shared check cache unless disabled by flag or HPF_CHECK_NO_CACHE."""
+    if not enabled or os.environ.get("HPF_CHECK_NO_CACHE") == "1":
+        return None
+    cache = CheckCache()
+    cache.seed_login_path()
+    return cache
+
+
+def invalidate_checks(tool_ids: Sequence[str]) -> None:
+    cache = open_check_cache()
+    if cache is not None:
+        cache.invalidate(tool_ids)
+        cache.save()
+
+
+def run_cached_check(
+    spec: ToolSpec, cache: Optional[CheckCache]
+) -> subprocess.CompletedProcess:
+    if cache is None:
+        return run_check_command(spec)
+    completed = cache.get(spec)
+    if completed is None:
+        completed = run_check_command(spec)
+        cache.put(spec, completed)
+    return completed
+
+
+def run_checks(
+    specs: Sequence[ToolSpec], jobs: int = 1, cache: Optional[CheckCache] = None
+) -> Iterator[Tuple[ToolSpec, subprocess.CompletedProcess]]:
+    """Yield check results in the order of ``specs``, running up to ``jobs`` at once."""
+    if jobs <= 1 or len(specs) <= 1:
+        for spec in specs:
+            yield spec, run_cached_check(spec, cache)
+        return
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=min(jobs, len(specs))) as executor:
+        results = executor.map(lambda spec: run_cached_check(spec, cache), specs)
+        yield from zip(specs, results)
+
+
+_BATCH_STATUS = re.compile(r"^(\d+) (\d+)$")
+
+
+def _run_shell_batch(
+    specs: Sequence[ToolSpec], login: bool
+) -> List[Optional[subprocess.CompletedProcess]]:
+    """Run shell check_cmds as one generated bash script.
+
+    Each check is sourced in its own subshell with stdin closed and its output
+    captured to files, so ``exit``, ``cd`` or variable changes never leak into
+    the next check. The batch's stdout carries only ``<index> <status>``
+    records. A check that reports nothing within its :func:`check_timeout`
+    gets status 124, its batch is killed and the checks after it run in a
+    fresh batch; a check without a record for any other reason (the batch
+    shell died) comes back as None.
+    """
+    import selectors
+    import signal
+    import subprocess
+    import tempfile
+    import time
+
+    with tempfile.TemporaryDirectory(prefix="hpf-check-batch-") as workdir:
+        root = Path(workdir)
+        lines = []
+        for index, spec in enumerate(specs):
+            (root / "{}.sh".format(index)).write_text(spec.check_cmd + "\n", encoding="utf-8")
+            lines.append(
+                '( . "$1/{0}.sh" ) </dev/null >"$1/{0}.out" 2>"$1/{0}.err"; '
+                "printf '%s %s\\n' {0} \"$?\"".format(index)
+            )
+        script = root / "batch.sh"
+        script.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+        process = subprocess.Popen(
+            ["bash"] + (["-l"] if login else []) + [str(script), workdir],
+            cwd=str(INSTALL_ROOT),
+            env=None if login else _check_env(),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        statuses: Dict[int, int] = {}
+        timed_out: Optional[int] = None
+        pending = b""
+        # Checks run in order, so the clock always belongs to the first unreported one.
+        running = 0
+        deadline = time.monotonic() + check_timeout(specs[0])
+        with selectors.DefaultSelector() as selector:
+            selector.register(process.stdout, selectors.EVENT_READ)
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    timed_out = running
+                    os.killpg(process.pid, signal.SIGKILL)
+                    break
+                if not selector.select(remaining):
+                    continue
+                chunk = os.read(process.stdout.fileno(), 4096)
+                if not chunk:
+                    break
+                *records, pending = (pending + chunk).split(b"\n")
+                for record in records:
+                    match = _BATCH_STATUS.match(record.decode("ascii", errors="replace"))
+                    if match:
+                        statuses[int(match.group(1))] = int(match.group(2))
+                        while running in statuses:
+                            running += 1
+                        if running < len(specs):
+                            deadline = time.monotonic() + check_timeout(specs[running])
+        process.stdout.close()
+        process.wait()
+
+        results: List[Optional[subprocess.CompletedProcess]] = []
+        for index, spec in enumerate(specs):
+            if index not in statuses and index != timed_out:
+                results.append(None)
+                continue
+            output = [
+                (root / "{}.{}".format(index, stream)).read_text(encoding="utf-8", errors="replace")
+                for stream in ("out", "err")
+            ]
+            if index == timed_out:
+                output[1] += "[runner] check timed out after {} seconds\n".format(check_timeout(spec))
+            results.append(
+                subprocess.CompletedProcess(
+                    spec.check_cmd, statuses.get(index, 124), output[0], output[1]
+                )
+            )
+    if timed_out is not None and timed_out + 1 < len(specs):
+        results[timed_out + 1 :] = _run_shell_batch(specs[timed_out + 1 :], login)
+    return results
+
+
+def run_check_batch(
+    specs: Sequence[ToolSpec], cache: Optional[CheckCache] = None
+) -> List[subprocess.CompletedProcess]:
+    """Check many tools with one shell startup instead of one per tool.
+
+    Cached results and shell-free checks are answered as in
+    :func:`run_check_command`; the remaining check_cmds run together in one
+    ``bash`` (and one ``bash -l`` for ``check_login_shell`` entries). Results
+    keep the order of ``specs``. Any check the batch did not report on is rerun
+    on its own.
+    """
+    results: List[Optional[subprocess.CompletedProcess]] = [None] * len(specs)
+    batches: Dict[bool, List[int]] = {False: [], True: []}
+    for index, spec in enumerate(specs):
+        if cache is not None:
+            results[index] = cache.get(spec)
+            if results[index] is not None:
+                continue
+        if not spec.check_login_shell and classify_check(spec.check_cmd) is not None:
+            results[index] = run_check_command(spec)
+        else:
+            batches[spec.check_login_shell].append(index)
+        if results[index] is not None and cache is not None:
+            cache.put(spec, results[index])
+
+    for login, indexes in batches.items():
+        if not indexes:
+            continue
+        batch = _run_shell_batch([specs[index] for index in indexes], login)
+        for index, completed in zip(indexes, batch):
+            if completed is None:
+                completed = run_check_command(specs[index])
+            results[index] = completed
+            if cache is not None:
+                cache.put(specs[index], completed)
+    return [completed for completed in results if completed is not None]
 
 
 def ensure_sudo(spec: ToolSpec) -> int:
     if not spec.requires_sudo:
         return 0
+    import subprocess
+
     print("[runner] refreshing sudo credentials...")
     completed = subprocess.run(["sudo", "-v"], cwd=str(INSTALL_ROOT))
     if completed.returncode != 0:
@@ -177,6 +938,8 @@ def is_bootstrap_owner() -> bool:
     owner = os.environ.get("HPF_BOOTSTRAP_OWNER", "hpf")
     current_user = os.environ.get("USER", "")
 
+    import subprocess
+
     try:
         login_user = subprocess.run(
             ["id", "-un"],
@@ -225,6 +988,8 @@ def format_flags(spec: ToolSpec) -> str:
 
 
 def make_log_path(tool_id: str, create_dir: bool = True) -> Path:
+    from datetime import datetime
+
     if create_dir:
         LOG_ROOT.mkdir(parents=True, exist_ok=True)
     stamp = datetime.now().strftime("%Y%m%dT%H%M%S")
@@ -238,55 +1003,692 @@ def append_log(log_path: Path, line: str) -> None:
             handle.write("\n")
 
 
-def stream_script(spec: ToolSpec, log_path: Path) -> int:
-    env = os.environ.copy()
-    env["DEBIAN_FRONTEND"] = "noninteractive"
-    command = ["bash", str(spec.script_path)]
-
-    with log_path.open("w", encoding="utf-8") as log_handle:
-        log_handle.write("tool_id: {}\n".format(spec.tool_id))
-        log_handle.write("script: {}\n".format(spec.script_path))
-        log_handle.write("cwd: {}\n".format(INSTALL_ROOT))
-        log_handle.write("started_at: {}\n\n".format(datetime.now().isoformat()))
-        log_handle.flush()
+_LOG_NAME = re.compile(r"^(?P<tool>.+)_(?P<stamp>\d{8}T\d{6})\.log(?P<suffix>\.gz|\.zst)?$")
 
-        process = subprocess.Popen(
+
+class LogHold:
+    """Shared flock on a log file for as long as a run may still write to it.
+
+    Log maintenance takes the exclusive lock before compressing or deleting a
+    plain log, so it never touches a log that a runner still holds.
+    """
+
+    def __init__(self, log_path: Path) -> None:
+        import fcntl
+
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        self._descriptor = os.open(str(log_path), os.O_WRONLY | os.O_CREAT, 0o644)
+        fcntl.flock(self._descriptor, fcntl.LOCK_SH)
+
+    def release(self) -> None:
+        if self._descriptor >= 0:
+            os.close(self._descriptor)
+            self._descriptor = -1
+
+
+def log_files(tool_id: Optional[str] = None) -> List[Tuple[str, str, Path]]:
+    """``(tool id, stamp, path)`` for every run log, oldest first per tool."""
+    if not LOG_ROOT.is_dir():
+        return []
+    entries = []
+    for path in LOG_ROOT.iterdir():
+        match = _LOG_NAME.match(path.name)
+        if match and (tool_id is None or match.group("tool") == tool_id):
+            entries.append((match.group("tool"), match.group("stamp"), path))
+    return sorted(entries)
+
+
+def log_compression() -> Optional[str]:
+    """Compressor for finished logs: HPF_LOG_COMPRESSION=zstd|gzip|none, else zstd when installed."""
+    import shutil
+
+    choice = os.environ.get("HPF_LOG_COMPRESSION", "auto")
+    if choice == "none":
+        return None
+    if choice == "auto":
+        return "zstd" if shutil.which("zstd") else "gzip"
+    if choice not in ("zstd", "gzip"):
+        raise ValueError("HPF_LOG_COMPRESSION must be zstd, gzip, none or auto")
+    return choice
+
+
+def _try_exclusive(path: Path) -> Optional[int]:
+    """Open ``path`` with an exclusive flock, or None while a run still holds it."""
+    import fcntl
+
+    try:
+        descriptor = os.open(str(path), os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        fcntl.flock(descriptor, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(descriptor)
+        return None
+    return descriptor
+
+
+def compress_log(path: Path, method: str) -> Path:
+    import subprocess
+
+    suffix = ".zst" if method == "zstd" else ".gz"
+    target = path.with_name(path.name + suffix)
+    temporary = path.with_name(".{}.{}.tmp".format(target.name, os.getpid()))
+    try:
+        if method == "zstd":
+            subprocess.run(
+                ["zstd", "-q", "-f", "-o", str(temporary), "--", str(path)],
+                check=True,
+                stdin=subprocess.DEVNULL,
+            )
+        else:
+            import gzip
+            import shutil
+
+            with path.open("rb") as source, gzip.open(str(temporary), "wb") as sink:
+                shutil.copyfileobj(source, sink, STREAM_CHUNK_SIZE)
+        stat = path.stat()
+        os.utime(str(temporary), ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        temporary.replace(target)
+    except BaseException:
+        temporary.unlink(missing_ok=True)
+        raise
+    path.unlink()
+    return target
+
+
+def _prune_logs(keep: int, max_bytes: int) -> int:
+    by_tool: Dict[str, List[Path]] = {}
+    for tool_id, _stamp, path in log_files():
+        by_tool.setdefault(tool_id, []).append(path)
+    removed = 0
+    for paths in by_tool.values():
+        total = 0
+        for index, path in enumerate(reversed(paths)):
+            try:
+                total += path.stat().st_size
+            except OSError:
+                continue
+            if index == 0 or (index < keep and total <= max_bytes):
+                continue
+            descriptor = _try_exclusive(path)
+            if descriptor is None:
+                continue
+            try:
+                path.unlink()
+                removed += 1
+            except OSError as exc:
+                eprint("[runner] could not remove {}: {}".format(path, exc))
+            finally:
+                os.close(descriptor)
+    return removed
+
+
+def maintain_logs(
+    keep: int, max_bytes: int, quiet: bool = False, finished: Sequence[Path] = ()
+) -> int:
+    """Compress finished logs and apply per-tool count/size retention.
+
+    Plain logs that a run still holds (see :class:`LogHold`) are left alone, and
+    so are logs that changed in the last ``LOG_SETTLE_SECONDS`` unless they are
+    listed in ``finished`` by the run that wrote them. Per tool, the newest logs
+    are kept while there are at most ``keep`` of them and their total size
+    stays within ``max_bytes``; the newest log is always kept.
+    """
+    import fcntl
+    import subprocess
+    import time
+
+    if not LOG_ROOT.is_dir():
+        return 0
+    guard = os.open(str(LOG_ROOT / ".maintenance.lock"), os.O_WRONLY | os.O_CREAT, 0o644)
+    try:
+        try:
+            fcntl.flock(guard, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            return 0
+        method = log_compression()
+        # Prune before compressing so logs about to be dropped are not compressed.
+        removed = _prune_logs(keep, max_bytes)
+        compressed = 0
+        now = time.time()
+        finished_paths = {Path(path).resolve() for path in finished}
+        for _tool_id, _stamp, path in log_files():
+            if method is None or path.suffix != ".log":
+                continue
+            descriptor = _try_exclusive(path)
+            if descriptor is None:
+                continue
+            try:
+                if (
+                    path.resolve() in finished_paths
+                    or now - path.stat().st_mtime >= LOG_SETTLE_SECONDS
+                ):
+                    compress_log(path, method)
+                    compressed += 1
+            except (OSError, subprocess.CalledProcessError) as exc:
+                eprint("[runner] could not compress {}: {}".format(path, exc))
+            finally:
+                os.close(descriptor)
+    finally:
+        os.close(guard)
+    if not quiet:
+        print("[runner] logs compressed: {}, removed: {}".format(compressed, removed))
+    return 0
+
+
+def schedule_log_maintenance(finished: Sequence[Path] = ()) -> None:
+    """Run ``logs maintain`` in a detached child so the current run returns immediately.
+
+    ``finished`` are the logs this run wrote; they are compressed right away
+    instead of on a later run once they have settled.
+    """
+    import subprocess
+
+    if os.environ.get("HPF_LOG_MAINTENANCE") == "0":
+        return
+    command = [sys.executable, str(Path(__file__).resolve()), "logs", "maintain", "--quiet"]
+    for path in finished:
+        command += ["--finished", str(path)]
+    try:
+        subprocess.Popen(
             command,
-            cwd=str(INSTALL_ROOT),
-            env=env,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
         )
+    except OSError as exc:
+        eprint("[runner] could not start log maintenance: {}".format(exc))
 
-        def pump_output() -> None:
-            assert process.stdout is not None
-            for line in process.stdout:
-                sys.stdout.write(line)
-                sys.stdout.flush()
-                log_handle.write(line)
-                log_handle.flush()
 
-        thread = threading.Thread(target=pump_output, daemon=True)
-        thread.start()
+def iter_log_lines(path: Path) -> Iterator[str]:
+    """Stream a plain, gzip or zstd log line by line without unpacking it to disk."""
+    if path.name.endswith(".zst"):
+        import subprocess
 
+        process = subprocess.Popen(
+            ["zstd", "-dc", "--", str(path)],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+        )
+        assert process.stdout is not None
         try:
-            return_code = process.wait(timeout=spec.timeout)
-        except subprocess.TimeoutExpired:
-            process.kill()
-            return_code = 124
-            message = "[runner] timed out after {} seconds".format(spec.timeout)
-            eprint(message)
-            log_handle.write(message + "\n")
-            log_handle.flush()
-
-        thread.join()
-        log_handle.write("\nfinished_at: {}\n".format(datetime.now().isoformat()))
-        log_handle.write("exit_code: {}\n".format(return_code))
+            for raw in process.stdout:
+                yield raw.decode("utf-8", errors="replace")
+        finally:
+            process.stdout.close()
+            if process.poll() is None:
+                process.terminate()
+            process.wait()
+        return
+    if path.name.endswith(".gz"):
+        import gzip
+
+        with gzip.open(str(path), "rt", encoding="utf-8", errors="replace") as handle:
+            yield from handle
+        return
+    with path.open("r", encoding="utf-8", errors="replace") as handle:
+        yield from handle
+
+
+def command_logs(args: argparse.Namespace) -> int:
+    if args.logs_command == "maintain":
+        keep = args.keep if args.keep is not None else env_int("HPF_LOG_KEEP", LOG_KEEP)
+        max_mb = (
+            args.max_mb if args.max_mb is not None else env_int("HPF_LOG_MAX_MB", LOG_MAX_MB)
+        )
+        return maintain_logs(keep, max_mb * 1024 * 1024, args.quiet, args.finished)
+
+    if args.logs_command == "list":
+        for tool_id, stamp, path in log_files(args.tool_id):
+            print("{:<24} {} {:>10}  {}".format(tool_id, stamp, path.stat().st_size, path.name))
+        return 0
+
+    if args.logs_command == "tail":
+        from collections import deque
+
+        target = Path(args.target)
+        if not target.is_file():
+            runs = log_files(args.target)
+            if not runs:
+                eprint("[runner] no logs for {}".format(args.target))
+                return 2
+            target = runs[-1][2]
+        for line in deque(iter_log_lines(target), maxlen=args.lines):
+            sys.stdout.write(line)
+        return 0
+
+    flags = re.IGNORECASE if args.ignore_case else 0
+    try:
+        pattern = re.compile(args.pattern, flags)
+    except re.error as exc:
+        eprint("[runner] invalid pattern: {}".format(exc))
+        return 2
+    matched = False
+    for _tool_id, _stamp, path in log_files(args.tool):
+        for number, line in enumerate(iter_log_lines(path), 1):
+            if pattern.search(line):
+                matched = True
+                sys.stdout.write("{}:{}: {}".format(path.name, number, line))
+                if not line.endswith("\n"):
+                    sys.stdout.write("\n")
+    return 0 if matched else 1
+
+
+STREAM_CHUNK_SIZE = 64 * 1024
+STREAM_FLUSH_INTERVAL = 0.2
+STREAM_DRAIN_GRACE = 2.0
+
+
+@dataclass
+class SupervisedScript:
+    key: str
+    spec: ToolSpec
+    process: "subprocess.Popen[bytes]"
+    log_path: Path
+    log_handle: BinaryIO
+    prefix: str
+    deadline: float
+    decoder: "codecs.IncrementalDecoder"
+    started_at: float
+    partial: str = ""
+    line_open: bool = False
+    return_code: Optional[int] = None
+    exited_at: Optional[float] = None
+    output_bytes: int = 0
+    maxrss_kb: int = 0
+
+    @property
+    def runtime(self) -> float:
+        return (self.exited_at or self.started_at) - self.started_at
+
+
+class ScriptSupervisor:
+    """Run install scripts and pump their output from one selector loop.
+
+    Output is read in large chunks, written to the terminal (prefixed per line
+    when a prefix is set) and to each script's log, and both are flushed at
+    most every ``flush_interval`` seconds instead of once per line. Several
+    scripts can be supervised at once without a thread per child. Children are
+    reaped with ``wait4`` so each one reports its own peak RSS.
+    """
+
+    def __init__(self, flush_interval: float = STREAM_FLUSH_INTERVAL) -> None:
+        import selectors
+
+        self.flush_interval = flush_interval
+        self._selector = selectors.DefaultSelector()
+        self._children: Dict[str, SupervisedScript] = {}
+        self._last_flush = 0.0
+
+    def __len__(self) -> int:
+        return len(self._children)
+
+    def start(self, key: str, spec: ToolSpec, log_path: Path, prefix: str = "") -> None:
+        import codecs
+        import selectors
+        import subprocess
+        import time
+        from datetime import datetime
+
+        env = os.environ.copy()
+        env["DEBIAN_FRONTEND"] = "noninteractive"
+        import fcntl
+
+        log_handle = log_path.open("wb")
+        fcntl.flock(log_handle.fileno(), fcntl.LOCK_SH)
+        header = "tool_id: {}\nscript: {}\ncwd: {}\nstarted_at: {}\n\n".format(
+            spec.tool_id, spec.script_path, INSTALL_ROOT, datetime.now().isoformat()
+        )
+        log_handle.write(header.encode("utf-8"))
         log_handle.flush()
+        try:
+            process = subprocess.Popen(
+                ["bash", str(spec.script_path)],
+                cwd=str(INSTALL_ROOT),
+                env=env,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                bufsize=0,
+            )
+        except OSError:
+            log_handle.close()
+            raise
+        assert process.stdout is not None
+        os.set_blocking(process.stdout.fileno(), False)
+        now = time.monotonic()
+        child = SupervisedScript(
+            key=key,
+            spec=spec,
+            process=process,
+            log_path=log_path,
+            log_handle=log_handle,
+            prefix=prefix,
+            deadline=now + spec.timeout,
+            decoder=codecs.getincrementaldecoder("utf-8")(errors="replace"),
+            started_at=now,
+        )
+        self._children[key] = child
+        self._selector.register(process.stdout, selectors.EVENT_READ, child)
+
+    def wait_any(self) -> List[SupervisedScript]:
+        """Pump output until at least one script finishes and return the finished ones."""
+        import time
+
+        while self._children:
+            now = time.monotonic()
+            timeout = min(
+                [self._last_flush + self.flush_interval - now]
+                + [child.deadline - now for child in self._children.values()]
+            )
+            if any(
+                child.return_code is None and child.process.stdout.closed
+                for child in self._children.values()
+                if child.process.stdout is not None
+            ):
+                # EOF usually means the script is exiting; poll for it promptly.
+                timeout = min(timeout, 0.01)
+            for selector_key, _events in self._selector.select(max(0.0, timeout)):
+                self._read(selector_key.data)
+
+            finished = []
+            now = time.monotonic()
+            for child in list(self._children.values()):
+                if self._settle(child, now):
+                    self._finish(child)
+                    finished.append(child)
+            if now - self._last_flush >= self.flush_interval or finished:
+                self._flush()
+            if finished:
+                return finished
+        return []
+
+    def _read(self, child: SupervisedScript) -> None:
+        stream = child.process.stdout
+        assert stream is not None
+        try:
+            chunk = os.read(stream.fileno(), STREAM_CHUNK_SIZE)
+        except BlockingIOError:
+            return
+        if not chunk:
+            self._close_stream(child)
+            return
+        child.output_bytes += len(chunk)
+        child.log_handle.write(chunk)
+        self._echo(child, child.decoder.decode(chunk))
+
+    def _echo(self, child: SupervisedScript, text: str) -> None:
+        if not child.prefix:
+            if text:
+                sys.stdout.write(text)
+                child.line_open = not text.endswith("\n")
+            return
+        lines = (child.partial + text).split("\n")
+        child.partial = lines.pop()
+        if lines:
+            sys.stdout.write("".join(child.prefix + line + "\n" for line in lines))
+
+    def _close_stream(self, child: SupervisedScript) -> None:
+        stream = child.process.stdout
+        if stream is None or stream.closed:
+            return
+        self._selector.unregister(stream)
+        stream.close()
+        self._echo(child, child.decoder.decode(b"", final=True))
+        # End a final line that had no newline so the next writer starts clean.
+        if child.partial:
+            sys.stdout.write(child.prefix + child.partial + "\n")
+            child.partial = ""
+        elif child.line_open:
+            sys.stdout.write("\n")
+            child.line_open = False
+
+    def _settle(self, child: SupervisedScript, now: float) -> bool:
+        """Advance a child's exit state; True once it can be reaped."""
+        stream = child.process.stdout
+        stream_open = stream is not None and not stream.closed
+        if child.return_code is None:
+            if self._reap(child, block=False):
+                child.exited_at = now
+            elif now >= child.deadline:
+                child.process.kill()
+                self._reap(child, block=True)
+                child.return_code = 124
+                child.exited_at = now
+                message = "[runner] timed out after {} seconds".format(child.spec.timeout)
+                self._flush()
+                eprint(child.prefix + message)
+                child.log_handle.write((message + "\n").encode("utf-8"))
+        if child.return_code is None:
+            return False
+        # Background processes started by a script may keep the pipe open after
+        # the script itself exited; stop waiting for them after a short grace.
+        if stream_open and child.exited_at is not None and now - child.exited_at < STREAM_DRAIN_GRACE:
+            return False
+        self._close_stream(child)
+        return True
+
+    @staticmethod
+    def _reap(child: SupervisedScript, block: bool) -> bool:
+        pid, status, usage = os.wait4(child.process.pid, 0 if block else os.WNOHANG)
+        if pid == 0:
+            return False
+        # Keep Popen consistent: it must not try to reap the pid again.
+        child.process.returncode = child.return_code = os.waitstatus_to_exitcode(status)
+        child.maxrss_kb = usage.ru_maxrss
+        return True
+
+    def _finish(self, child: SupervisedScript) -> None:
+        from datetime import datetime
+
+        del self._children[child.key]
+        assert child.return_code is not None
+        footer = "\nfinished_at: {}\nexit_code: {}\n".format(
+            datetime.now().isoformat(), child.return_code
+        )
+        child.log_handle.write(footer.encode("utf-8"))
+        child.log_handle.close()
+
+    def _flush(self) -> None:
+        import time
+
+        sys.stdout.flush()
+        for child in self._children.values():
+            child.log_handle.flush()
+        self._last_flush = time.monotonic()
+
+
+def stream_script(spec: ToolSpec, log_path: Path, prefix: str = "") -> SupervisedScript:
+    supervisor = ScriptSupervisor()
+    supervisor.start(spec.tool_id, spec, log_path, prefix)
+    return supervisor.wait_any()[0]
+
+
+class RunJournal:
+    """Structured record of one install/preset run, appended to a JSONL journal.
+
+    Phases are timed with :meth:`timed`; every supervised script becomes a
+    step with its runtime, exit code, output size and peak RSS. Nothing is
+    written until :meth:`finish`, so a journal that is never finished (dry
+    runs, helpers called outside ``main``) leaves no trace. The logs the run
+    wrote are collected in ``logs`` so they can be compressed as soon as the
+    run is over.
+    """
+
+    def __init__(self, command: str, tool_id: str) -> None:
+        import time
+        from datetime import datetime
+
+        self._started = time.monotonic()
+        self.record: dict = {
+            "version": JOURNAL_FORMAT,
+            "started_at": datetime.now().astimezone().isoformat(),
+            "host": os.uname().nodename,
+            "command": command,
+            "tool_id": tool_id,
+            "phases": {},
+            "steps": [],
+        }
+        self.logs: List[str] = []
+
+    def timed(self, phase: str, func, *args, **kwargs):
+        import time
+
+        started = time.monotonic()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            phases = self.record["phases"]
+            phases[phase] = round(phases.get(phase, 0.0) + time.monotonic() - started, 4)
+
+    def add_step(self, label: str, spec: ToolSpec, child: Optional[SupervisedScript]) -> None:
+        step: Dict[str, object] = {"label": label, "tool_id": spec.tool_id}
+        if child is None:
+            step["exit_code"] = None
+        else:
+            step.update(
+                exit_code=child.return_code,
+                runtime=round(child.runtime, 4),
+                output_bytes=child.output_bytes,
+                maxrss_kb=child.maxrss_kb,
+            )
+            self.logs.append(str(child.log_path))
+        self.record["steps"].append(step)
 
-    return return_code
+    def finish(self, exit_code: int) -> None:
+        import json
+        import time
+
+        self.record["exit_code"] = exit_code
+        self.record["duration"] = round(time.monotonic() - self._started, 4)
+        line = (json.dumps(self.record, sort_keys=True) + "\n").encode("utf-8")
+        path = JOURNAL_ROOT / "runs-{}.jsonl".format(self.record["started_at"][:7])
+        try:
+            JOURNAL_ROOT.mkdir(parents=True, exist_ok=True)
+            descriptor = os.open(str(path), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                os.write(descriptor, line)
+            finally:
+                os.close(descriptor)
+        except OSError as exc:
+            eprint("[runner] could not write run journal {}: {}".format(path, exc))
+
+
+def read_journals(paths: Sequence[Path]) -> Iterator[dict]:
+    """Yield journal records from JSONL files or directories of them."""
+    import json
+
+    for path in paths:
+        if not path.exists():
+            continue
+        files = sorted(path.glob("*.jsonl")) if path.is_dir() else [path]
+        for journal_file in files:
+            with journal_file.open("r", encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if isinstance(record, dict) and record.get("version") == JOURNAL_FORMAT:
+                        yield record
+
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of a non-empty sequence."""
+    import math
+
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def aggregate_journals(records: Iterator[dict]) -> Dict[str, dict]:
+    """Group run and step metrics per tool id.
+
+    A run contributes its phase timings and total duration to its own tool
+    id; each script step contributes its runtime, output size and peak RSS
+    to the step's tool id.
+    """
+    tools: Dict[str, dict] = {}
+
+    def entry(tool_id: str) -> dict:
+        return tools.setdefault(tool_id, {"runs": 0, "failures": 0, "metrics": {}})
+
+    def add(tool_id: str, metric: str, value: object) -> None:
+        if isinstance(value, (int, float)):
+            entry(tool_id)["metrics"].setdefault(metric, []).append(float(value))
+
+    for record in records:
+        tool_id = str(record.get("tool_id"))
+        run = entry(tool_id)
+        run["runs"] += 1
+        run["failures"] += record.get("exit_code") != 0
+        add(tool_id, "total", record.get("duration"))
+        for phase, seconds in record.get("phases", {}).items():
+            if phase != "script":
+                add(tool_id, phase, seconds)
+        for step in record.get("steps", []):
+            step_tool = str(step.get("tool_id"))
+            if step_tool != tool_id:
+                step_entry = entry(step_tool)
+                step_entry["runs"] += 1
+                step_entry["failures"] += step.get("exit_code") != 0
+            add(step_tool, "script", step.get("runtime"))
+            add(step_tool, "output_bytes", step.get("output_bytes"))
+            add(step_tool, "maxrss_kb", step.get("maxrss_kb"))
+
+    for stats in tools.values():
+        stats["metrics"] = {
+            metric: {
+                "count": len(values),
+                "p50": percentile(values, 0.5),
+                "p95": percentile(values, 0.95),
+            }
+            for metric, values in sorted(stats["metrics"].items())
+        }
+    return dict(sorted(tools.items()))
+
+
+def format_metric(metric: str, value: float) -> str:
+    if metric == "maxrss_kb":
+        return "{:.1f}MiB".format(value / 1024)
+    if metric == "output_bytes":
+        if value < 1024:
+            return "{:.0f}B".format(value)
+        return "{:.1f}KiB".format(value / 1024)
+    return "{:.2f}s".format(value)
+
+
+def command_stats(paths: Sequence[Path], as_json: bool) -> int:
+    # The default journal directory only appears after the first run.
+    missing = [path for path in paths if not path.exists() and path != JOURNAL_ROOT]
+    if missing:
+        eprint("[runner] journal not found: {}".format(", ".join(str(path) for path in missing)))
+        return 2
+    stats = aggregate_journals(read_journals(paths))
+    if as_json:
+        import json
+
+        print(json.dumps(stats, indent=2, sort_keys=True))
+        return 0
+    if not stats:
+        print("[runner] no journal records")
+        return 0
+
+    print("{:<24} {:>5} {:>5}  {:<24} {:>10} {:>10}".format("tool", "runs", "fail", "metric", "p50", "p95"))
+    for tool_id, entry in stats.items():
+        head = "{:<24} {:>5} {:>5}".format(tool_id, entry["runs"], entry["failures"])
+        for metric, values in entry["metrics"].items():
+            print(
+                "{}  {:<24} {:>10} {:>10}".format(
+                    head,
+                    metric,
+                    format_metric(metric, values["p50"]),
+                    format_metric(metric, values["p95"]),
+                )
+            )
+            head = " " * len(head)
+    return 0
 
 
 def print_list(catalog: Catalog) -> int:
@@ -309,7 +1711,13 @@ def print_list(catalog: Catalog) -> int:
     return 0
 
 
-def command_check(target: str, catalog: Catalog, tool_map: Dict[str, ToolSpec]) -> int:
+def command_check(
+    target: str,
+    catalog: Catalog,
+    tool_map: Dict[str, ToolSpec],
+    jobs: int = 1,
+    use_cache: bool = True,
+) -> int:
     targets: List[ToolSpec] = []
     if target == "all":
         for _category_id, _category_name, tools in catalog:
@@ -321,13 +1729,17 @@ def command_check(target: str, catalog: Catalog, tool_map: Dict[str, ToolSpec])
             eprint(str(exc))
             return 2
 
+    if not use_cache:
+        os.environ["HPF_CHECK_NO_CACHE"] = "1"
+    cache = open_check_cache(use_cache)
     failed = False
-    for spec in targets:
-        completed = run_check_command(spec.check_cmd)
+    for spec, completed in run_checks(targets, jobs, cache):
         status = "ok" if completed.returncode == 0 else "missing"
         print("{:<8} {} - {}".format(status, spec.tool_id, spec.name))
         failed = failed or completed.returncode != 0
 
+    if cache is not None:
+        cache.save()
     return 1 if failed else 0
 
 
@@ -342,7 +1754,15 @@ def print_dry_run(spec: ToolSpec, log_path: Path) -> None:
     print("  log: {}".format(log_path))
 
 
-def command_install(tool_id: str, dry_run: bool, tool_map: Dict[str, ToolSpec]) -> int:
+def command_install(
+    tool_id: str,
+    dry_run: bool,
+    tool_map: Dict[str, ToolSpec],
+    journal: Optional[RunJournal] = None,
+    presets: Optional[Dict[str, PresetSpec]] = None,
+) -> int:
+    if journal is None:
+        journal = RunJournal("install", tool_id)
     try:
         spec = resolve_tool(tool_id, tool_map)
     except KeyError as exc:
@@ -358,30 +1778,48 @@ def command_install(tool_id: str, dry_run: bool, tool_map: Dict[str, ToolSpec])
         print_dry_run(spec, log_path)
         return 0
 
-    personal_bootstrap_result = ensure_personal_bootstrap_allowed(spec)
+    personal_bootstrap_result = journal.timed(
+        "personal_bootstrap_check", ensure_personal_bootstrap_allowed, spec
+    )
     if personal_bootstrap_result != 0:
         return personal_bootstrap_result
 
-    ssh_result = ensure_ssh(spec)
+    ssh_result = journal.timed("ssh_check", ensure_ssh, spec)
     if ssh_result != 0:
         return ssh_result
 
-    sudo_result = ensure_sudo(spec)
+    sudo_result = journal.timed("sudo", ensure_sudo, spec)
     if sudo_result != 0:
         return sudo_result
 
-    print("[runner] executing {}".format(spec.tool_id))
-    print("[runner] log: {}".format(log_path))
-    install_return_code = stream_script(spec, log_path)
-    if install_return_code != 0:
-        eprint(
-            "[runner] script failed for {} with exit code {}".format(
-                spec.tool_id, install_return_code
+    hold = LogHold(log_path)
+    try:
+        print("[runner] executing {}".format(spec.tool_id))
+        print("[runner] log: {}".format(log_path))
+        child = journal.timed("script", stream_script, spec, log_path)
+        journal.add_step(spec.tool_id, spec, child)
+        install_return_code = child.return_code
+        # A preset wrapper script installs its members too.
+        preset_names = [name for name, preset_id in PRESET_TOOL_IDS.items() if preset_id == spec.tool_id]
+        if preset_names and presets is not None:
+            invalidate_checks(preset_check_ids(preset_names[0], presets))
+        else:
+            invalidate_checks([spec.tool_id])
+        if install_return_code != 0:
+            eprint(
+                "[runner] script failed for {} with exit code {}".format(
+                    spec.tool_id, install_return_code
+                )
             )
-        )
-        return install_return_code
+            return install_return_code
+
+        return journal.timed("verify", verify_install, spec, log_path)
+    finally:
+        hold.release()
+
 
-    completed = run_check_command(spec.check_cmd)
+def verify_install(spec: ToolSpec, log_path: Path) -> int:
+    completed = run_check_command(spec)
     append_log(log_path, "")
     append_log(log_path, "verification_cmd: {}".format(spec.check_cmd))
     append_log(log_path, "verification_exit_code: {}".format(completed.returncode))
@@ -404,12 +1842,194 @@ def command_install(tool_id: str, dry_run: bool, tool_map: Dict[str, ToolSpec])
     return 0
 
 
-def command_preset(preset_name: str, dry_run: bool, tool_map: Dict[str, ToolSpec]) -> int:
+def start_preset_node(supervisor: ScriptSupervisor, node: PresetNode) -> bool:
+    if not node.spec.script_path.is_file():
+        eprint("[runner] missing script: {}".format(node.spec.script_path))
+        return False
+    log_path = make_log_path(node.label)
+    print("[runner] preset step started: {} (log: {})".format(node.label, log_path))
+    supervisor.start(node.label, node.spec, log_path, prefix="[{}] ".format(node.label))
+    return True
+
+
+def execute_preset_plan(
+    nodes: Sequence[PresetNode], jobs: int, journal: Optional[RunJournal] = None
+) -> Dict[str, Optional[int]]:
+    """Run preset nodes as a DAG and return each label's exit code.
+
+    A node starts once its dependencies succeeded and none of its locks is held.
+    Nodes whose dependencies failed are not run and map to ``None``. All running
+    steps are supervised from one :class:`ScriptSupervisor` loop.
+    """
+    results: Dict[str, Optional[int]] = {}
+    pending = list(nodes)
+    running: Dict[str, PresetNode] = {}
+    held_locks: Set[str] = set()
+    supervisor = ScriptSupervisor()
+
+    def finish(node: PresetNode, return_code: int) -> None:
+        results[node.label] = return_code
+        if return_code == 0:
+            print("[runner] preset step completed: {}".format(node.label))
+        else:
+            eprint("[runner] preset step failed: {} (exit {})".format(node.label, return_code))
+
+    while pending or running:
+        progressed = True
+        while progressed:
+            progressed = False
+            for node in list(pending):
+                if any(dep in results and results[dep] != 0 for dep in node.depends_on):
+                    pending.remove(node)
+                    results[node.label] = None
+                    if journal is not None:
+                        journal.add_step(node.label, node.spec, None)
+                    eprint("[runner] preset step skipped: {} (dependency failed)".format(node.label))
+                    progressed = True
+                    continue
+                if len(running) >= jobs:
+                    continue
+                if any(dep not in results for dep in node.depends_on):
+                    continue
+                if held_locks.intersection(node.locks):
+                    continue
+                pending.remove(node)
+                progressed = True
+                if not start_preset_node(supervisor, node):
+                    finish(node, 2)
+                    continue
+                held_locks.update(node.locks)
+                running[node.label] = node
+
+        if not running:
+            break
+        for child in supervisor.wait_any():
+            node = running.pop(child.key)
+            held_locks.difference_update(node.locks)
+            if journal is not None:
+                journal.add_step(node.label, node.spec, child)
+            finish(node, child.return_code)
+
+    return results
+
+
+def print_preset_plan(preset: PresetSpec, nodes: Sequence[PresetNode], jobs: int) -> None:
+    print("[runner] dry run for preset {} ({} steps, jobs {})".format(preset.name, len(nodes), jobs))
+    for node in nodes:
+        details = []
+        if node.depends_on:
+            details.append("after: {}".format(", ".join(node.depends_on)))
+        if node.locks:
+            details.append("locks: {}".format(", ".join(node.locks)))
+        suffix = " ({})".format("; ".join(details)) if details else ""
+        print("  - {}{}: {}".format(node.label, suffix, node.spec.script_path))
+
+
+def command_preset_parallel(
+    preset: PresetSpec,
+    dry_run: bool,
+    tool_map: Dict[str, ToolSpec],
+    presets: Dict[str, PresetSpec],
+    jobs: int,
+    journal: Optional[RunJournal] = None,
+) -> int:
+    spec = resolve_tool(preset.tool_id, tool_map)
+    nodes = plan_preset(preset.name, presets, tool_map)
+    if dry_run:
+        print_preset_plan(preset, nodes, jobs)
+        return 0
+    if journal is None:
+        journal = RunJournal("preset", spec.tool_id)
+
+    targets = [spec] + [node.spec for node in nodes]
+    for phase, check in (
+        ("personal_bootstrap_check", ensure_personal_bootstrap_allowed),
+        ("ssh_check", ensure_ssh),
+    ):
+        for target in targets:
+            result = journal.timed(phase, check, target)
+            if result != 0:
+                return result
+    if any(target.requires_sudo for target in targets):
+        sudo_result = journal.timed("sudo", ensure_sudo, replace(spec, requires_sudo=True))
+        if sudo_result != 0:
+            return sudo_result
+
+    log_path = make_log_path(spec.tool_id)
+    journal.logs.append(str(log_path))
+    hold = LogHold(log_path)
+    try:
+        print("[runner] executing preset {} with {} steps, jobs {}".format(preset.name, len(nodes), jobs))
+        results = journal.timed("script", execute_preset_plan, nodes, jobs, journal)
+        invalidate_checks(unique(preset_check_ids(preset.name, presets) + [node.label for node in nodes]))
+        with log_path.open("w", encoding="utf-8") as handle:
+            handle.write("preset: {}\n".format(preset.name))
+            handle.write("jobs: {}\n\n".format(jobs))
+            for node in nodes:
+                return_code = results.get(node.label)
+                handle.write("{}: {}\n".format(node.label, "skipped" if return_code is None else return_code))
+
+        failures = [
+            "{}:{}".format(node.label, "skipped" if results.get(node.label) is None else results[node.label])
+            for node in nodes
+            if results.get(node.label) != 0
+        ]
+        if failures:
+            message = "Preset failed. Failed steps: {}".format(" ".join(failures))
+            append_log(log_path, "")
+            append_log(log_path, message)
+            eprint("[runner] {}".format(message))
+            eprint("[runner] inspect log: {}".format(log_path))
+            return 1
+
+        return journal.timed("verify", verify_install, spec, log_path)
+    finally:
+        hold.release()
+
+
+def command_preset(
+    preset_name: str,
+    dry_run: bool,
+    tool_map: Dict[str, ToolSpec],
+    presets: Optional[Dict[str, PresetSpec]] = None,
+    jobs: Optional[int] = None,
+    journal: Optional[RunJournal] = None,
+) -> int:
     tool_id = PRESET_TOOL_IDS.get(preset_name)
     if tool_id is None:
         eprint("[runner] unknown preset: {}".format(preset_name))
         return 2
-    return command_install(tool_id, dry_run, tool_map)
+    if jobs is not None and presets is not None:
+        return command_preset_parallel(
+            presets[preset_name], dry_run, tool_map, presets, jobs, journal
+        )
+    return command_install(tool_id, dry_run, tool_map, journal, presets)
+
+
+def int_at_least(value: str, minimum: int) -> int:
+    try:
+        number = int(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError("expected an integer: {}".format(value)) from exc
+    if number < minimum:
+        raise argparse.ArgumentTypeError("expected a value >= {}: {}".format(minimum, value))
+    return number
+
+
+def positive_int(value: str) -> int:
+    return int_at_least(value, 1)
+
+
+def env_int(name: str, default: int, minimum: int = 1) -> int:
+    """Read an integer setting from the environment, warning on bad values."""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    try:
+        return int_at_least(value, minimum)
+    except argparse.ArgumentTypeError as exc:
+        eprint("[runner] ignoring {}={!r} ({}); using {}".format(name, value, exc, default))
+        return default
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -425,6 +2045,18 @@ def build_parser() -> argparse.ArgumentParser:
         "check", help="Run check_cmd for one tool or for all catalog entries."
     )
     check_parser.add_argument("target", help="tool id or 'all'")
+    check_parser.add_argument(
+        "--jobs",
+        "-j",
+        type=positive_int,
+        default=1,
+        help="Run up to N check commands concurrently (output keeps catalog order).",
+    )
+    check_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore and do not update the persistent check-result cache.",
+    )
 
     install_parser = subparsers.add_parser(
         "install", help="Run one tool or preset by tool id."
@@ -449,6 +2081,70 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Print the resolved preset execution without running it.",
     )
+    preset_parser.add_argument(
+        "--jobs",
+        "-j",
+        type=positive_int,
+        help=(
+            "Run the preset members natively as a dependency graph with up to N "
+            "installers at once instead of the sequential wrapper script."
+        ),
+    )
+
+    stats_parser = subparsers.add_parser(
+        "stats", help="Aggregate run journals into p50/p95 timings per tool."
+    )
+    stats_parser.add_argument(
+        "journals",
+        nargs="*",
+        type=Path,
+        help="journal files or directories (default: {})".format(JOURNAL_ROOT),
+    )
+    stats_parser.add_argument(
+        "--json", action="store_true", help="Print the aggregate as JSON."
+    )
+
+    logs_parser = subparsers.add_parser(
+        "logs", help="List, tail, search or maintain run logs (compressed logs are streamed)."
+    )
+    logs_subparsers = logs_parser.add_subparsers(dest="logs_command")
+    logs_subparsers.required = True
+    logs_list_parser = logs_subparsers.add_parser("list", help="List run logs, oldest first.")
+    logs_list_parser.add_argument("tool_id", nargs="?", help="only logs of this tool id")
+    logs_tail_parser = logs_subparsers.add_parser(
+        "tail", help="Print the end of the newest log of a tool, or of a log file."
+    )
+    logs_tail_parser.add_argument("target", help="tool id or log path")
+    logs_tail_parser.add_argument("--lines", "-n", type=positive_int, default=50)
+    logs_search_parser = logs_subparsers.add_parser(
+        "search", help="Print log lines matching a regular expression."
+    )
+    logs_search_parser.add_argument("pattern", help="Python regular expression")
+    logs_search_parser.add_argument("--tool", help="only search logs of this tool id")
+    logs_search_parser.add_argument("--ignore-case", "-i", action="store_true")
+    logs_maintain_parser = logs_subparsers.add_parser(
+        "maintain", help="Compress finished logs and apply per-tool retention now."
+    )
+    logs_maintain_parser.add_argument(
+        "--keep",
+        type=positive_int,
+        default=None,
+        help="logs kept per tool (default: HPF_LOG_KEEP or {})".format(LOG_KEEP),
+    )
+    logs_maintain_parser.add_argument(
+        "--max-mb",
+        type=positive_int,
+        default=None,
+        help="size budget per tool in MiB (default: HPF_LOG_MAX_MB or {})".format(LOG_MAX_MB),
+    )
+    logs_maintain_parser.add_argument(
+        "--finished",
+        action="append",
+        default=[],
+        metavar="PATH",
+        help="log of a finished run; compressed without waiting for it to settle",
+    )
+    logs_maintain_parser.add_argument("--quiet", action="store_true")
 
     return parser
 
@@ -457,27 +2153,51 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
     parser = build_parser()
     args = parser.parse_args(argv)
 
+    if args.command == "stats":
+        # Journals may be collected from other machines; no repo checkout needed.
+        return command_stats(args.journals or [JOURNAL_ROOT], args.json)
+    if args.command == "logs":
+        try:
+            return command_logs(args)
+        except (OSError, ValueError) as exc:
+            eprint("[runner] logs {} failed: {}".format(args.logs_command, exc))
+            return 2
+
     path_check = assert_expected_repo_root()
     if path_check != 0:
         return path_check
 
+    journal: Optional[RunJournal] = None
+    if args.command in ("install", "preset") and not args.dry_run:
+        target = args.tool_id if args.command == "install" else PRESET_TOOL_IDS[args.preset_name]
+        journal = RunJournal(args.command, target)
     try:
-        catalog, tool_map = load_catalog()
-    except (OSError, ValueError, json.JSONDecodeError) as exc:
+        if journal is not None:
+            catalog, tool_map, presets = journal.timed("catalog_load", load_catalog)
+        else:
+            catalog, tool_map, presets = load_catalog()
+    except (OSError, ValueError) as exc:
         eprint("[runner] failed to load catalog: {}".format(exc))
         return 2
 
     if args.command == "list":
         return print_list(catalog)
     if args.command == "check":
-        return command_check(args.target, catalog, tool_map)
+        return command_check(args.target, catalog, tool_map, args.jobs, not args.no_cache)
     if args.command == "install":
-        return command_install(args.tool_id, args.dry_run, tool_map)
-    if args.command == "preset":
-        return command_preset(args.preset_name, args.dry_run, tool_map)
+        return_code = command_install(args.tool_id, args.dry_run, tool_map, journal, presets)
+    elif args.command == "preset":
+        return_code = command_preset(
+            args.preset_name, args.dry_run, tool_map, presets, args.jobs, journal
+        )
+    else:
+        parser.error("unknown command")
+        return 2
 
-    parser.error("unknown command")
-    return 2
+    if journal is not None:
+        journal.finish(return_code)
+        schedule_log_maintenance([Path(path) for path in unique(journal.logs)])
+    return return_code
 
 
 if __name__ == "__main__":
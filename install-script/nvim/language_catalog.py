@@ -6,15 +6,19 @@ from __future__ import annotations
 import argparse
 import json
 import os
+import re
 import shutil
-import subprocess
 import sys
+import threading
 from collections import Counter
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 
 OWNERS = {"apt", "npm", "cargo", "github_release", "mason"}
+PROBE_CACHE_VERSION = 1
+# Owner batches run concurrently; keep their prefixed lines from interleaving.
+_output_lock = threading.Lock()
 
 
 class CatalogError(RuntimeError):
@@ -40,6 +44,20 @@ def _require_string(value: Any, label: str) -> str:
     return value
 
 
+def _env_int(name: str, default: int, *, minimum: int = 1) -> int:
+    """Read an integer HPF_* setting; a malformed or out-of-range value is a CatalogError."""
+    value = os.environ.get(name)
+    if not value:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise CatalogError(f"{name} must be an integer, got {value!r}") from None
+    if number < minimum:
+        raise CatalogError(f"{name} must be at least {minimum}, got {value!r}")
+    return number
+
+
 def _tool_index(catalog: dict[str, Any]) -> dict[str, dict[str, Any]]:
     tools: dict[str, dict[str, Any]] = {}
     for tool in catalog.get("tools", []):
@@ -51,6 +69,11 @@ def _tool_index(catalog: dict[str, Any]) -> dict[str, dict[str, Any]]:
             raise CatalogError(f"unknown install owner for {tool_id}: {tool.get('owner')}")
         if not tool.get("package"):
             raise CatalogError(f"tool package is required: {tool_id}")
+        if tool["owner"] == "github_release":
+            for field in ("version", "asset"):
+                _require_string(tool.get(field), f"github_release {field} for {tool_id}")
+            if not re.fullmatch(r"[0-9a-f]{64}", str(tool.get("sha256", ""))):
+                raise CatalogError(f"github_release sha256 must be 64 lowercase hex digits: {tool_id}")
         tools[tool_id] = tool
     return tools
 
@@ -213,34 +236,424 @@ def installation_plan(catalog: dict[str, Any]) -> dict[str, list[Any]]:
     return plan
 
 
-def _run(command: list[str], env: dict[str, str] | None = None) -> None:
+def _emit(prefix: str, line: str) -> None:
+    with _output_lock:
+        sys.stdout.write(f"{prefix} {line}\n")
+        sys.stdout.flush()
+
+
+def _run(command: list[str], env: dict[str, str] | None = None, *, label: str | None = None) -> None:
+    """Run ``command``; with a ``label`` its output is streamed with that owner prefix."""
+    import subprocess
+
     printable = " ".join(command)
-    print(f"[language-catalog] run: {printable}", flush=True)
-    subprocess.run(command, check=True, env=env)
+    prefix = f"[language-catalog:{label}]" if label else "[language-catalog]"
+    _emit(prefix, f"run: {printable}")
+    if label is None:
+        try:
+            subprocess.run(command, check=True, env=env)
+        except subprocess.CalledProcessError as error:
+            raise CatalogError(f"command failed with exit code {error.returncode}: {printable}") from error
+        return
+    process = subprocess.Popen(
+        command,
+        env=env,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        errors="replace",
+    )
+    assert process.stdout is not None
+    with process.stdout:
+        for line in process.stdout:
+            _emit(prefix, line.rstrip("\n"))
+    returncode = process.wait()
+    if returncode:
+        raise CatalogError(f"command failed with exit code {returncode}: {printable}")
 
 
-def tool_satisfied(tool: dict[str, Any]) -> bool:
-    command = shutil.which(tool["command"])
-    if not command:
-        return False
-    version = tool.get("version")
-    if not version:
-        return True
-    version_args = tool.get("version_args", ["--version"])
+def data_root() -> Path:
+    return Path.home() / ".local" / "share" / "hpf-linux-config"
+
+
+def default_probe_cache_path() -> Path:
+    configured = os.environ.get("HPF_TOOL_PROBE_CACHE")
+    if configured:
+        return Path(configured)
+    return data_root() / "cache" / "tool-probes.json"
+
+
+def _run_version_probe(command: str, version_args: list[str]) -> tuple[int, str]:
+    import subprocess
+
     result = subprocess.run(
         [command, *version_args],
         check=False,
         capture_output=True,
         text=True,
     )
-    output = result.stdout + result.stderr
-    return result.returncode == 0 and str(version) in output
+    return result.returncode, result.stdout + result.stderr
+
+
+class ProbeCache:
+    """Version probe output keyed by the binary's resolved path and stat fingerprint.
+
+    The fingerprint is mtime, size, inode and ctime, so reinstalling or
+    upgrading a tool changes it even when the new binary has the same size and
+    its mtime was preserved (``cp -p``, ``install -p``, package managers).
+    Stale entries are never served and need no explicit invalidation.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[str, Any]] = self._read()
+        self._updated: dict[str, dict[str, Any]] = {}
+
+    def _read(self) -> dict[str, dict[str, Any]]:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != PROBE_CACHE_VERSION:
+            return {}
+        return data.get("entries", {})
+
+    def probe(self, command: str, version_args: list[str]) -> tuple[int, str]:
+        resolved = os.path.realpath(command)
+        try:
+            stat = os.stat(resolved)
+        except OSError:
+            return _run_version_probe(command, version_args)
+        key = json.dumps([resolved, version_args])
+        fingerprint = [stat.st_mtime_ns, stat.st_size, stat.st_ino, stat.st_ctime_ns]
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry and entry.get("fingerprint") == fingerprint:
+            return int(entry["returncode"]), str(entry["output"])
+        returncode, output = _run_version_probe(command, version_args)
+        entry = {"fingerprint": fingerprint, "returncode": returncode, "output": output}
+        with self._lock:
+            self._entries[key] = entry
+            self._updated[key] = entry
+        return returncode, output
+
+    def save(self) -> None:
+        """Merge new probes into whatever another run has written since we loaded."""
+        with self._lock:
+            if not self._updated:
+                return
+            entries = self._read()
+            entries.update(self._updated)
+            payload = {"version": PROBE_CACHE_VERSION, "entries": entries}
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                temporary = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+                temporary.write_text(json.dumps(payload, sort_keys=True), encoding="utf-8")
+                temporary.replace(self.path)
+            except OSError as error:
+                print(f"[language-catalog] could not write probe cache {self.path}: {error}", file=sys.stderr)
+            self._updated.clear()
+
+
+def open_probe_cache() -> ProbeCache | None:
+    """Return the on-disk probe cache unless HPF_CHECK_NO_CACHE=1 disables it."""
+    if os.environ.get("HPF_CHECK_NO_CACHE") == "1":
+        return None
+    return ProbeCache(default_probe_cache_path())
+
+
+def tool_satisfied(tool: dict[str, Any], cache: ProbeCache | None = None) -> bool:
+    command = shutil.which(tool["command"])
+    if not command:
+        return False
+    version = tool.get("version")
+    if not version:
+        return True
+    version_args = list(tool.get("version_args", ["--version"]))
+    if cache is None:
+        returncode, output = _run_version_probe(command, version_args)
+    else:
+        returncode, output = cache.probe(command, version_args)
+    return returncode == 0 and str(version) in output
+
+
+def unsatisfied_tools(
+    tools: list[dict[str, Any]], *, jobs: int | None = None, cache: ProbeCache | None = None
+) -> set[str]:
+    """Return the ids of ``tools`` that are missing or at the wrong version.
+
+    Version probes fork the tool itself, which for node- or JVM-backed helpers
+    costs hundreds of milliseconds each, so they run in a thread pool.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    if jobs is None:
+        jobs = _env_int("HPF_TOOL_PROBE_JOBS", min(8, os.cpu_count() or 1))
+    if jobs <= 1 or len(tools) <= 1:
+        satisfied = [tool_satisfied(tool, cache) for tool in tools]
+    else:
+        with ThreadPoolExecutor(max_workers=min(jobs, len(tools))) as pool:
+            satisfied = list(pool.map(lambda tool: tool_satisfied(tool, cache), tools))
+    if cache is not None:
+        cache.save()
+    return {tool["id"] for tool, ok in zip(tools, satisfied) if not ok}
+
+
+def cargo_job_budget(batches: int) -> tuple[int, int]:
+    """Return (invocations run at once, ``-j`` each) within HPF_CARGO_JOBS cores."""
+    budget = _env_int("HPF_CARGO_JOBS", os.cpu_count() or 1)
+    parallel = max(1, min(_env_int("HPF_CARGO_PARALLEL", 2), budget, batches))
+    return parallel, max(1, budget // parallel)
+
+
+def cargo_batches(tools: list[dict[str, Any]]) -> dict[str, list[str]]:
+    """Group crates into one ``cargo install`` per ``--locked`` setting.
+
+    Versions travel as ``crate@version`` so a single invocation can pin each
+    crate; only ``--locked`` applies to the whole command line.
+    """
+    batches: dict[str, list[str]] = {}
+    for tool in tools:
+        spec = f"{tool['package']}@{tool['version']}" if tool.get("version") else str(tool["package"])
+        batches.setdefault("locked" if tool.get("locked") else "resolved", []).append(spec)
+    return batches
+
+
+def cargo_build_env(env: dict[str, str], batch: str) -> dict[str, str]:
+    """Point a cargo batch at its persistent target dir and, if present, sccache.
+
+    ``cargo install`` keeps artifacts when the target dir is given explicitly,
+    so shared dependencies are compiled once across crates and across runs.
+    Each batch gets its own subdirectory because cargo locks the build
+    directory for the whole invocation.
+    """
+    env = dict(env)
+    target_root = Path(env.get("CARGO_TARGET_DIR") or data_root() / "cargo" / "target")
+    env["CARGO_TARGET_DIR"] = str(target_root / batch)
+    if not env.get("RUSTC_WRAPPER") and env.get("HPF_CARGO_SCCACHE", "1") != "0":
+        sccache = shutil.which("sccache", path=env.get("PATH"))
+        if sccache:
+            env["RUSTC_WRAPPER"] = sccache
+            env.setdefault("SCCACHE_DIR", str(data_root() / "cargo" / "sccache"))
+    return env
+
+
+def _install_cargo_tools(tools: list[dict[str, Any]], env: dict[str, str]) -> None:
+    """Install crates in batched invocations; after a failure no further batch starts."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    batches = cargo_batches(tools)
+    parallel, jobs = cargo_job_budget(len(batches))
+    failed = threading.Event()
+
+    def build(batch: str, specs: list[str]) -> None:
+        if failed.is_set():
+            return
+        command = ["cargo", "install", *specs]
+        if batch == "locked":
+            command.append("--locked")
+        command.extend(["-j", str(jobs)])
+        try:
+            _run(command, env=cargo_build_env(env, batch), label=f"cargo:{batch}")
+        except CatalogError:
+            failed.set()
+            raise
+
+    with ThreadPoolExecutor(max_workers=parallel) as pool:
+        futures = [pool.submit(build, batch, specs) for batch, specs in batches.items()]
+    for future in futures:
+        future.result()
+
+
+def _run_owner_batches(batches: dict[str, tuple[bool, Callable[[], None]]]) -> None:
+    """Run each owner's install batch in its own thread.
+
+    apt, npm, cargo and release downloads keep separate locks and caches, so
+    their batches only serialize where a batch needs something apt is about
+    to provide. A batch whose prerequisite apt run failed is skipped, and the
+    first failure in owner order is raised, as the sequential installer did.
+    """
+    apt_done = threading.Event()
+    errors: dict[str, BaseException] = {}
+
+    def run(owner: str, after_apt: bool, install: Callable[[], None]) -> None:
+        try:
+            if after_apt:
+                apt_done.wait()
+                if "apt" in errors:
+                    return
+            install()
+        except BaseException as error:  # re-raised on the caller's thread
+            errors[owner] = error
+        finally:
+            if owner == "apt":
+                apt_done.set()
+
+    if "apt" not in batches:
+        apt_done.set()
+    threads = [
+        threading.Thread(target=run, args=(owner, after_apt, install), name=f"install-{owner}")
+        for owner, (after_apt, install) in batches.items()
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for owner in batches:
+        if owner in errors:
+            raise errors[owner]
+
+
+def _release_names(tool: dict[str, Any]) -> tuple[str, str]:
+    version = str(tool["version"])
+    tag = str(tool.get("tag", "v{version}")).format(version=version)
+    return tag, str(tool["asset"]).format(version=version)
+
+
+def _sha256(path: Path) -> str:
+    import hashlib
+
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fetch_release_asset(tool: dict[str, Any]) -> Path:
+    """Return a verified release asset: artifact cache, then mirror, then network.
+
+    The cache is addressed by SHA-256, so a hit never touches the network.
+    Mirror copies and downloads are verified before they enter the cache.
+    HPF_GITHUB_RELEASE_OFFLINE=1 forbids downloading.
+    """
+    tag, asset = _release_names(tool)
+    expected = str(tool["sha256"])
+    cached = data_root() / "downloads" / "github-release" / expected / asset
+    if cached.is_file():
+        if _sha256(cached) == expected:
+            return cached
+        print(f"[language-catalog] discarding corrupt cached asset: {cached}", file=sys.stderr, flush=True)
+        cached.unlink()
+    cached.parent.mkdir(parents=True, exist_ok=True)
+    # Per process and thread: install batches run in threads and may share an asset.
+    partial = cached.with_name(f".{asset}.{os.getpid()}.{threading.get_ident()}.part")
+    mirrored = None
+    if mirror := os.environ.get("HPF_GITHUB_RELEASE_MIRROR"):
+        # Either the GitHub layout (<owner>/<repo>/<tag>/<asset>) or a flat directory.
+        for path in (Path(mirror) / str(tool["package"]) / tag / asset, Path(mirror) / asset):
+            if path.is_file():
+                mirrored = path
+                break
+    if mirrored is not None:
+        print(f"[language-catalog] using mirrored asset: {mirrored}", flush=True)
+        shutil.copyfile(mirrored, partial)
+    elif os.environ.get("HPF_GITHUB_RELEASE_OFFLINE") == "1":
+        raise CatalogError(f"offline mode: no cached or mirrored {asset} for {tool['id']}")
+    else:
+        base = os.environ.get("HPF_GITHUB_RELEASE_BASE", "https://github.com").rstrip("/")
+        try:
+            _run(
+                [
+                    "curl",
+                    "--fail",
+                    "--location",
+                    "--silent",
+                    "--show-error",
+                    "--retry",
+                    "3",
+                    "--connect-timeout",
+                    "20",
+                    "--output",
+                    str(partial),
+                    f"{base}/{tool['package']}/releases/download/{tag}/{asset}",
+                ],
+                label=f"github_release:{tool['id']}",
+            )
+        except CatalogError:
+            partial.unlink(missing_ok=True)
+            raise
+    digest = _sha256(partial)
+    if digest != expected:
+        partial.unlink()
+        raise CatalogError(f"{asset} sha256 mismatch for {tool['id']}: expected {expected}, got {digest}")
+    partial.replace(cached)
+    return cached
+
+
+def _extract_release_binary(archive: Path, tool: dict[str, Any], destination: Path) -> None:
+    """Write the tool's executable from ``archive`` (tarball, zip, .gz or bare binary)."""
+    import gzip
+    import tarfile
+    import zipfile
+
+    wanted = str(tool.get("binary", tool["command"]))
+
+    def pick(names: list[str]) -> str:
+        matches = [
+            name
+            for name in names
+            if name.removeprefix("./") == wanted or ("/" not in wanted and name.rsplit("/", 1)[-1] == wanted)
+        ]
+        if len(matches) != 1:
+            raise CatalogError(f"{archive.name} must contain exactly one {wanted} for {tool['id']}, found {len(matches)}")
+        return matches[0]
+
+    name = archive.name
+    with destination.open("wb") as output:
+        if re.search(r"\.(tar\.(gz|xz|bz2)|tgz)$", name):
+            with tarfile.open(archive) as bundle:
+                members = {member.name: member for member in bundle.getmembers() if member.isfile()}
+                source = bundle.extractfile(members[pick(list(members))])
+                assert source is not None
+                shutil.copyfileobj(source, output)
+        elif name.endswith(".zip"):
+            with zipfile.ZipFile(archive) as bundle:
+                files = [info.filename for info in bundle.infolist() if not info.is_dir()]
+                with bundle.open(pick(files)) as source:
+                    shutil.copyfileobj(source, output)
+        elif name.endswith(".gz"):
+            with gzip.open(archive) as source:
+                shutil.copyfileobj(source, output)
+        else:
+            with archive.open("rb") as source:
+                shutil.copyfileobj(source, output)
+    destination.chmod(0o755)
+
+
+def install_release_binary(tool: dict[str, Any]) -> Path:
+    """Fetch, verify and atomically install a prebuilt binary into HPF_GITHUB_RELEASE_BIN."""
+    archive = fetch_release_asset(tool)
+    bin_dir = Path(os.environ.get("HPF_GITHUB_RELEASE_BIN") or Path.home() / ".local" / "bin")
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    target = bin_dir / str(tool["command"])
+    # Staged next to the target so the final rename never crosses filesystems
+    # and a running copy of the old binary keeps its inode.
+    staging = bin_dir / f".{tool['command']}.{os.getpid()}.tmp"
+    try:
+        _extract_release_binary(archive, tool, staging)
+        staging.replace(target)
+    finally:
+        staging.unlink(missing_ok=True)
+    _emit(f"[language-catalog:github_release:{tool['id']}]", f"installed {target} ({tool['version']})")
+    return target
+
+
+def _install_release_tools(tools: list[dict[str, Any]]) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=min(4, len(tools))) as pool:
+        futures = [pool.submit(install_release_binary, tool) for tool in tools]
+    for future in futures:
+        future.result()
 
 
 def install_external_tools(catalog: dict[str, Any]) -> None:
     plan = installation_plan(catalog)
     tools = catalog["tools"]
-    unsatisfied = {tool["id"] for tool in tools if tool["owner"] != "mason" and not tool_satisfied(tool)}
+    unsatisfied = unsatisfied_tools([tool for tool in tools if tool["owner"] != "mason"], cache=open_probe_cache())
     apt_packages: list[str] = []
     seen_apt: set[str] = set()
     for tool in tools:
@@ -250,35 +663,42 @@ def install_external_tools(catalog: dict[str, Any]) -> None:
                 if package not in seen_apt:
                     seen_apt.add(package)
                     apt_packages.append(package)
-    if apt_packages:
-        _run(["sudo", "apt-get", "install", "-y", *apt_packages])
-
     npm_tools = [tool for tool in plan["npm"] if tool["id"] in unsatisfied]
-    if npm_tools:
+    cargo_tools = [tool for tool in plan["cargo"] if tool["id"] in unsatisfied]
+    release_tools = [tool for tool in tools if tool["owner"] == "github_release" and tool["id"] in unsatisfied]
+
+    def install_apt() -> None:
+        _run(["sudo", "apt-get", "install", "-y", *apt_packages], label="apt")
+
+    def install_npm() -> None:
         if not shutil.which("npm"):
             raise CatalogError("npm is required but is unavailable after apt installation")
         npm_packages = [
             f"{tool['package']}@{tool['version']}" if tool.get("version") else str(tool["package"])
             for tool in npm_tools
         ]
-        _run(["npm", "install", "-g", *npm_packages])
+        _run(["npm", "install", "-g", *npm_packages], label="npm")
 
-    cargo_tools = [tool for tool in plan["cargo"] if tool["id"] in unsatisfied]
-    if cargo_tools:
+    def install_cargo() -> None:
         if not shutil.which("cargo"):
             raise CatalogError("cargo is required but is unavailable after apt installation")
         env = dict(os.environ)
         env["PATH"] = f"{Path.home() / '.cargo' / 'bin'}:{env.get('PATH', '')}"
-        for tool in cargo_tools:
-            command = ["cargo", "install", str(tool["package"])]
-            if tool.get("version"):
-                command.extend(["--version", str(tool["version"])])
-            if tool.get("locked"):
-                command.append("--locked")
-            _run(command, env=env)
+        _install_cargo_tools(cargo_tools, env)
 
-    if plan["github_release"]:
-        raise CatalogError("github_release tools are declared but no adapter is configured")
+    batches: dict[str, tuple[bool, Callable[[], None]]] = {}
+    if apt_packages:
+        batches["apt"] = (False, install_apt)
+    # Beyond npm and cargo themselves, node-gyp and crate build scripts use the
+    # compilers and libraries apt installs, so both wait whenever apt has work.
+    if npm_tools:
+        batches["npm"] = (bool(apt_packages), install_npm)
+    if cargo_tools:
+        batches["cargo"] = (bool(apt_packages), install_cargo)
+    if release_tools:
+        # Downloads need curl, unless every asset is already cached or mirrored.
+        batches["github_release"] = (not shutil.which("curl"), lambda: _install_release_tools(release_tools))
+    _run_owner_batches(batches)
 
 
 def verify_external_tools(catalog: dict[str, Any], include_mason: bool) -> None:
@@ -295,6 +715,151 @@ def verify_external_tools(catalog: dict[str, Any], include_mason: bool) -> None:
         raise CatalogError("required commands are missing: " + ", ".join(missing))
 
 
+def default_bench_probe() -> Path:
+    return Path(__file__).resolve().parents[2] / "nvim" / "scripts" / "bench_language_fixture.lua"
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of a non-empty list; nvim-release.py reuses it."""
+    import math
+
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def _bench_once(
+    fixture: dict[str, Any], nvim: str, probe: Path, timeout: float, workdir: Path
+) -> dict[str, Any]:
+    import subprocess
+    import time
+
+    path = workdir / fixture["filename"]
+    path.write_text(fixture["content"], encoding="utf-8")
+    spec = workdir / ".bench-fixture.json"
+    spec.write_text(json.dumps(fixture), encoding="utf-8")
+    output = workdir / ".bench-result.json"
+    output.unlink(missing_ok=True)
+    env = dict(os.environ)
+    env.update(
+        {
+            "HPF_BENCH_FIXTURE": str(spec),
+            "HPF_BENCH_OUTPUT": str(output),
+            "HPF_BENCH_TIMEOUT_MS": str(int(timeout * 1000)),
+        }
+    )
+    command = [
+        nvim,
+        "--headless",
+        "--cmd",
+        f"luafile {probe}",
+        str(path),
+        "+lua local ok, err = xpcall(HPFBench.finish, debug.traceback); if not ok then io.stderr:write(err .. '\\n'); vim.cmd('cquit 1') end",
+        "+qa!",
+    ]
+    env["HPF_BENCH_T0"] = f"{time.time():.6f}"
+    started = time.perf_counter()
+    try:
+        # Each wait in the probe is bounded by ``timeout``; leave room for all of them.
+        result = subprocess.run(command, cwd=workdir, env=env, capture_output=True, text=True, timeout=timeout * 4 + 30)
+    except subprocess.TimeoutExpired:
+        return {"errors": ["neovim did not exit"], "wall_ms": (time.perf_counter() - started) * 1000}
+    wall_ms = (time.perf_counter() - started) * 1000
+    if result.returncode != 0 or not output.is_file():
+        detail = (result.stderr or result.stdout).strip().splitlines()[-1:] or [f"exit {result.returncode}"]
+        return {"errors": detail, "wall_ms": wall_ms}
+    sample = json.loads(output.read_text(encoding="utf-8"))
+    sample["wall_ms"] = wall_ms
+    return sample
+
+
+def bench_fixture(fixture: dict[str, Any], nvim: str, probe: Path, runs: int, timeout: float) -> dict[str, Any]:
+    import subprocess
+    import tempfile
+
+    samples = []
+    with tempfile.TemporaryDirectory(prefix="language-bench-") as temporary:
+        workdir = Path(temporary)
+        # A repository root lets servers that look for project markers attach.
+        subprocess.run(["git", "init", "-q", str(workdir)], check=True)
+        for _ in range(runs):
+            samples.append(_bench_once(fixture, nvim, probe, timeout, workdir))
+
+    def summary(values: list[float]) -> dict[str, float] | None:
+        if not values:
+            return None
+        return {"p50": round(percentile(values, 0.5), 2), "max": round(max(values), 2)}
+
+    def metric(key: str) -> dict[str, float] | None:
+        return summary([sample[key] for sample in samples if sample.get(key) is not None])
+
+    def tools(field: str) -> dict[str, Any]:
+        names = [entry["name"] for entry in fixture[field]]
+        return {name: summary([sample[field][name] for sample in samples if name in (sample.get(field) or {})]) for name in names}
+
+    errors = sorted({error for sample in samples for error in sample.get("errors", [])})
+    return {
+        "language": fixture["language"],
+        "filename": fixture["filename"],
+        "filetype": next((sample["filetype"] for sample in samples if sample.get("filetype")), None),
+        "lsp_name": fixture.get("lsp_name"),
+        "wall_ms": metric("wall_ms"),
+        "lsp_attach_ms": metric("lsp_attach_ms"),
+        "first_diagnostic_ms": metric("first_diagnostic_ms"),
+        "formatters": tools("formatters"),
+        "linters": tools("linters"),
+        "errors": errors,
+    }
+
+
+def bench_catalog(
+    catalog: dict[str, Any],
+    *,
+    nvim: str = "nvim",
+    probe: Path | None = None,
+    runs: int = 3,
+    jobs: int = 4,
+    timeout: float = 20.0,
+    languages: list[str] | None = None,
+) -> dict[str, Any]:
+    """Drive every language fixture through Neovim and time its toolchain.
+
+    Fixtures run in parallel (``jobs`` Neovim processes at once), so absolute
+    numbers include some contention; use ``jobs=1`` for isolated timings.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    executable = shutil.which(nvim)
+    if not executable:
+        raise CatalogError(f"neovim executable not found: {nvim}")
+    probe = probe or default_bench_probe()
+    fixtures = [
+        fixture
+        for fixture in projection(catalog)["fixtures"]
+        if fixture.get("language") and (not languages or fixture["language"] in languages)
+    ]
+    if not fixtures:
+        raise CatalogError("no fixtures selected for benchmarking")
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        results = list(pool.map(lambda fixture: bench_fixture(fixture, executable, probe, runs, timeout), fixtures))
+    return {"nvim": executable, "runs": runs, "jobs": jobs, "fixtures": results}
+
+
+def print_bench_report(report: dict[str, Any]) -> None:
+    def p50(value: dict[str, float] | None) -> str:
+        return f"{value['p50']:.0f}" if value else "-"
+
+    print(f"{'fixture':32} {'wall':>7} {'attach':>7} {'diag':>7}  tools (p50 ms)")
+    ordered = sorted(report["fixtures"], key=lambda item: -(item["wall_ms"] or {"p50": 0})["p50"])
+    for item in ordered:
+        tools = [f"{name} {p50(value)}" for field in ("formatters", "linters") for name, value in item[field].items()]
+        print(
+            f"{item['language'] + '/' + item['filename']:32} {p50(item['wall_ms']):>7}"
+            f" {p50(item['lsp_attach_ms']):>7} {p50(item['first_diagnostic_ms']):>7}  {', '.join(tools) or '-'}"
+        )
+        for error in item["errors"]:
+            print(f"  error: {error}")
+
+
 def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("--catalog", type=Path, default=default_catalog_path())
@@ -305,6 +870,13 @@ def main(argv: list[str] | None = None) -> int:
     subparsers.add_parser("install")
     verify_parser = subparsers.add_parser("verify")
     verify_parser.add_argument("--include-mason", action="store_true")
+    bench_parser = subparsers.add_parser("bench", help="time LSP, diagnostics, formatters and linters per fixture")
+    bench_parser.add_argument("--nvim", default="nvim", help="Neovim executable (default: the nvim launcher on PATH)")
+    bench_parser.add_argument("--runs", type=int, default=3, help="samples per fixture (default: 3)")
+    bench_parser.add_argument("--jobs", type=int, default=4, help="fixtures benchmarked concurrently (default: 4)")
+    bench_parser.add_argument("--timeout", type=float, default=20.0, help="seconds to wait for each event (default: 20)")
+    bench_parser.add_argument("--language", action="append", default=[], help="only benchmark this language id")
+    bench_parser.add_argument("--json", type=Path, help="write the report to this JSON file")
     args = parser.parse_args(argv)
 
     try:
@@ -320,7 +892,21 @@ def main(argv: list[str] | None = None) -> int:
             verify_external_tools(catalog, include_mason=False)
         elif args.command == "verify":
             verify_external_tools(catalog, include_mason=args.include_mason)
-    except (CatalogError, subprocess.CalledProcessError) as error:
+        elif args.command == "bench":
+            if args.runs < 1:
+                parser.error("--runs must be >= 1")
+            report = bench_catalog(
+                catalog,
+                nvim=args.nvim,
+                runs=args.runs,
+                jobs=args.jobs,
+                timeout=args.timeout,
+                languages=args.language,
+            )
+            print_bench_report(report)
+            if args.json:
+                args.json.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    except CatalogError as error:
         print(f"language catalog error: {error}", file=sys.stderr)
         return 1
     return 0
@@ -5,24 +5,21 @@ from __future__ import annotations
 
 import argparse
 import contextlib
-import datetime as dt
 import fcntl
-import hashlib
 import json
 import os
 import shutil
-import subprocess
 import sys
-import tarfile
-import tempfile
-import uuid
 from pathlib import Path
-from typing import Iterator
+from typing import Callable, Iterator
 
 
 NEOVIM_VERSION = "0.12.2"
 NEOVIM_ARCHIVE = "nvim-linux-x86_64.tar.gz"
 NEOVIM_URL = f"https://github.com/neovim/neovim/releases/download/v{NEOVIM_VERSION}/{NEOVIM_ARCHIVE}"
+# Every Neovim release publishes the SHA-256 of its assets in one shasum.txt.
+NEOVIM_SHASUM = "shasum.txt"
+NEOVIM_SHASUM_URL = f"https://github.com/neovim/neovim/releases/download/v{NEOVIM_VERSION}/{NEOVIM_SHASUM}"
 MIN_FREE_BYTES = 3 * 1024 * 1024 * 1024
 PERSISTENT_LINKS = {
     "xdg/data/nvim/sessions": "sessions",
@@ -34,10 +31,50 @@ PERSISTENT_LINKS = {
 }
 
 
+FICLONE = 0x40049409
+# errnos meaning "this filesystem pair cannot do that", as opposed to real I/O errors.
+CLONE_UNSUPPORTED_ERRNOS = {"EXDEV", "EOPNOTSUPP", "ENOTSUP", "EINVAL", "ENOTTY", "EPERM", "EMLINK", "ENOSYS"}
+LAZY_SOURCE = "folke/lazy.nvim"
+# Startup benchmark: slowdowns below this many milliseconds are treated as noise.
+BENCH_MIN_REGRESSION_MS = 20
+BENCH_LSP_TIMEOUT_MS = 20000
+# Default deletion budget of the background trash reaper.
+GC_BYTES_PER_SECOND = 64 * 1024 * 1024
+BUILD_PHASE_TIMEOUTS = {"mason": 900, "parsers": 700}
+# Release store layout: store/<kind>/<name>/<commit | version | parser revision>.
+STORE_KINDS = ("plugins", "mason", "parsers")
+
+
 class ReleaseError(RuntimeError):
     pass
 
 
+def _load_language_catalog(path: Path):
+    """Import a ``language_catalog.py`` by path; it is not on ``sys.path``."""
+    import importlib.util
+
+    spec = importlib.util.spec_from_file_location("hpf_language_catalog", path)
+    if not spec or not spec.loader:
+        raise ReleaseError("cannot load the language catalog module")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _env_number(name: str, default: float, *, convert: Callable[[str], float] = int, minimum: float = 1) -> float:
+    """Read a numeric HPF_NVIM_* setting; a malformed or out-of-range value is a ReleaseError."""
+    value = os.environ.get(name)
+    if not value:
+        return default
+    try:
+        number = convert(value)
+    except ValueError:
+        raise ReleaseError(f"{name} must be a number, got {value!r}") from None
+    if not number >= minimum:
+        raise ReleaseError(f"{name} must be at least {minimum}, got {value!r}")
+    return number
+
+
 class ReleaseInstaller:
     def __init__(
         self,
@@ -48,6 +85,13 @@ class ReleaseInstaller:
         fail_stage: str | None = None,
         skip_external_tools: bool = False,
         skip_download: bool = False,
+        offline: bool = False,
+        mirror: Path | None = None,
+        archive_sha256: str | None = None,
+        reuse: bool = True,
+        build_jobs: int | None = None,
+        plugin_mirror: Path | None = None,
+        bench_runs: int | None = None,
     ) -> None:
         self.repo_root = repo_root.resolve()
         self.home = home.resolve()
@@ -61,11 +105,43 @@ class ReleaseInstaller:
         self.fail_stage = fail_stage or os.environ.get("HPF_NVIM_FAIL_STAGE")
         self.skip_external_tools = skip_external_tools
         self.skip_download = skip_download
+        self.downloads_dir = self.release_root / "downloads"
+        self.store_dir = self.release_root / "store"
+        self.build_logs_dir = self.release_root / "build-logs"
+        plugin_mirror = plugin_mirror or (
+            Path(os.environ["HPF_NVIM_PLUGIN_MIRROR"]) if os.environ.get("HPF_NVIM_PLUGIN_MIRROR") else None
+        )
+        self.plugin_mirror = (plugin_mirror or self.release_root / "plugin-mirror").resolve()
+        self.plugin_upstream = os.environ.get("HPF_NVIM_PLUGIN_UPSTREAM", "https://github.com").rstrip("/")
+        self.active_plugin_mirror: Path | None = None
+        self.proc_root = Path("/proc")
+        self.pid_registry = self.release_root / "pids"
+        self.trash_dir = self.release_root / "trash"
+        # Read up front so a bad value fails before the release is switched, not in the reaper.
+        self.gc_rate = _env_number("HPF_NVIM_GC_BYTES_PER_SEC", GC_BYTES_PER_SECOND, minimum=0)
+        self.bench_runs = _env_number("HPF_NVIM_BENCH_RUNS", 5, minimum=0) if bench_runs is None else bench_runs
+        self.bench_threshold = _env_number("HPF_NVIM_BENCH_THRESHOLD", 0.25, convert=float, minimum=0)
+        self.startup: dict | None = None
+        self.process_detection = os.environ.get("HPF_NVIM_PROCESS_DETECTION", "scan")
+        if self.process_detection not in ("scan", "registry"):
+            raise ReleaseError(f"unknown HPF_NVIM_PROCESS_DETECTION: {self.process_detection}")
+        jobs = build_jobs or _env_number("HPF_NVIM_BUILD_JOBS", len(BUILD_PHASE_TIMEOUTS))
+        self.build_jobs = max(1, jobs)
+        self.offline = offline or os.environ.get("HPF_NVIM_OFFLINE") == "1"
+        mirror = mirror or (Path(os.environ["HPF_NVIM_MIRROR"]) if os.environ.get("HPF_NVIM_MIRROR") else None)
+        self.mirror = mirror.resolve() if mirror else None
+        expected = archive_sha256 or os.environ.get("HPF_NVIM_ARCHIVE_SHA256")
+        self.expected_sha256 = expected.lower() if expected else None
+        self.archive_sha256: str | None = None
         self.candidate: Path | None = None
         self.old_current = self._read_link(self.current_link)
         self.old_previous = self._read_link(self.previous_link)
         self.legacy_binary = self._legacy_binary()
         self.imported_legacy: Path | None = None
+        self.reuse_enabled = reuse and os.environ.get("HPF_NVIM_NO_REUSE") != "1"
+        self.reuse: dict[str, object] | None = None
+        self.store_refs: set[str] = set()
+        self.reflinks: bool | None = None
         self.launcher_backup: bytes | str | None = None
         self.launcher_backup_mode: int | None = None
 
@@ -100,13 +176,95 @@ class ReleaseInstaller:
 
     @staticmethod
     def _sha256(path: Path) -> str:
+        import hashlib
+
         digest = hashlib.sha256()
         with path.open("rb") as handle:
             for chunk in iter(lambda: handle.read(1024 * 1024), b""):
                 digest.update(chunk)
         return digest.hexdigest()
 
+    @staticmethod
+    def _reflink_file(src: str, dst: str) -> None:
+        """Clone ``src`` to a new ``dst`` with FICLONE; raises OSError when unsupported."""
+        with open(src, "rb") as source_handle, open(dst, "xb") as target_handle:
+            try:
+                fcntl.ioctl(target_handle.fileno(), getattr(fcntl, "FICLONE", FICLONE), source_handle.fileno())
+            except OSError:
+                target_handle.close()
+                os.unlink(dst)
+                raise
+        shutil.copystat(src, dst)
+
+    @classmethod
+    def _clone_tree(
+        cls,
+        source: Path,
+        destination: Path,
+        *,
+        immutable: bool = False,
+        ignore: Callable[[str, list[str]], set[str]] | None = None,
+        quiet: bool = False,
+    ) -> dict[str, int]:
+        """Duplicate a tree as cheaply as the filesystem allows.
+
+        Each file is reflinked (FICLONE) when possible, hardlinked when the
+        tree is ``immutable`` and reflinks are unavailable, and copied as a
+        last resort. A method that fails with an "unsupported" errno is not
+        retried for the rest of the tree. Symlinks are recreated as symlinks.
+        Returns how many files each method handled.
+        """
+        import errno
+
+        unsupported = {getattr(errno, name) for name in CLONE_UNSUPPORTED_ERRNOS if hasattr(errno, name)}
+        methods = ["reflink", "hardlink", "copy"] if immutable else ["reflink", "copy"]
+        counts = dict.fromkeys(methods, 0)
+        operations = {
+            "reflink": cls._reflink_file,
+            "hardlink": os.link,
+            "copy": shutil.copy2,
+        }
+
+        def clone_file(src: str, dst: str) -> None:
+            for method in list(methods):
+                try:
+                    operations[method](src, dst)
+                except OSError as error:
+                    if method == "copy" or error.errno not in unsupported:
+                        raise
+                    methods.remove(method)
+                    continue
+                counts[method] += 1
+                return
+
+        def clone_dir(src: Path, dst: Path) -> None:
+            dst.mkdir(parents=True, exist_ok=True)
+            with os.scandir(src) as scan:
+                entries = list(scan)
+            ignored = ignore(str(src), [entry.name for entry in entries]) if ignore else set()
+            for entry in entries:
+                if entry.name in ignored:
+                    continue
+                target = dst / entry.name
+                if entry.is_symlink():
+                    os.symlink(os.readlink(entry.path), target)
+                elif entry.is_dir():
+                    clone_dir(Path(entry.path), target)
+                elif entry.is_file():
+                    clone_file(entry.path, str(target))
+            shutil.copystat(src, dst)
+
+        clone_dir(source, destination)
+        if quiet:
+            return counts
+        summary = ", ".join(f"{method} {count}" for method, count in counts.items() if count)
+        print(f"[nvim-release] cloned {source} -> {destination}: {summary or 'no files'}", flush=True)
+        return counts
+
     def _release_id(self) -> str:
+        import datetime as dt
+        import uuid
+
         timestamp = dt.datetime.now(dt.timezone.utc).strftime("%Y%m%d%H%M%S")
         return f"{timestamp}-{uuid.uuid4().hex[:6]}"
 
@@ -127,7 +285,7 @@ class ReleaseInstaller:
         if self.config_link.is_symlink() and self.config_link.resolve() != self.repo_root / "nvim":
             raise ReleaseError(f"config link does not point to {self.repo_root / 'nvim'}")
         usage = shutil.disk_usage(self.release_root)
-        required = int(os.environ.get("HPF_NVIM_MIN_FREE_BYTES", str(MIN_FREE_BYTES)))
+        required = _env_number("HPF_NVIM_MIN_FREE_BYTES", MIN_FREE_BYTES, minimum=0)
         if usage.free < required:
             raise ReleaseError(f"insufficient free space: need {required} bytes, have {usage.free}")
         for command in ("git", "curl", "tar", "python3"):
@@ -140,6 +298,8 @@ class ReleaseInstaller:
 
     @staticmethod
     def _run(command: list[str], *, env: dict[str, str] | None = None, timeout: int | None = None) -> None:
+        import subprocess
+
         print("[nvim-release] run:", " ".join(command), flush=True)
         subprocess.run(command, check=True, env=env, timeout=timeout)
 
@@ -147,7 +307,10 @@ class ReleaseInstaller:
         if self.skip_external_tools:
             return
         self._fail_if_injected("external_tools")
-        self._run([sys.executable, str(self.repo_root / "install-script/nvim/language_catalog.py"), "install"])
+        env = dict(os.environ)
+        if self.offline:
+            env["HPF_GITHUB_RELEASE_OFFLINE"] = "1"
+        self._run([sys.executable, str(self.repo_root / "install-script/nvim/language_catalog.py"), "install"], env=env)
 
     def prepare_persistent_data(self) -> None:
         legacy_data = self.home / ".local/share/nvim"
@@ -166,7 +329,7 @@ class ReleaseInstaller:
                 continue
             destination.parent.mkdir(parents=True, exist_ok=True)
             if source.is_dir():
-                shutil.copytree(source, destination)
+                self._clone_tree(source, destination)
             else:
                 destination.mkdir(parents=True, exist_ok=True)
 
@@ -180,6 +343,8 @@ class ReleaseInstaller:
         return True
 
     def import_legacy_release(self) -> None:
+        import datetime as dt
+
         if self.old_current or not self.legacy_binary or not self.legacy_binary.is_file():
             return
         legacy_data = self.home / ".local/share/nvim"
@@ -190,7 +355,7 @@ class ReleaseInstaller:
 
         release = self.releases_dir / f"legacy-{dt.datetime.now(dt.timezone.utc).strftime('%Y%m%dT%H%M%SZ')}"
         release.mkdir(parents=True)
-        shutil.copytree(self.legacy_binary.parent.parent, release / "nvim", symlinks=True)
+        self._clone_tree(self.legacy_binary.parent.parent, release / "nvim", immutable=True)
 
         persistent_names = {
             legacy_data: {"sessions", "bookmarks"},
@@ -203,7 +368,7 @@ class ReleaseInstaller:
         ):
             if source.is_dir():
                 ignored = persistent_names.get(source, set())
-                shutil.copytree(source, destination, symlinks=True, ignore=lambda _path, names: ignored.intersection(names))
+                self._clone_tree(source, destination, ignore=lambda _path, names: ignored.intersection(names))
             else:
                 destination.mkdir(parents=True, exist_ok=True)
         config_dir = release / "xdg/config"
@@ -231,10 +396,81 @@ class ReleaseInstaller:
             if not self.legacy_binary or not self.legacy_binary.is_file():
                 raise ReleaseError("cannot seed candidate without a legacy Neovim binary")
             source_root = self.legacy_binary.parent.parent
-            shutil.copytree(source_root, candidate / "nvim", symlinks=True)
+            self._clone_tree(source_root, candidate / "nvim", immutable=True)
         else:
-            with tempfile.TemporaryDirectory(prefix="hpf-nvim-download-") as temp_dir:
-                archive = Path(temp_dir) / NEOVIM_ARCHIVE
+            import tarfile
+            import zlib
+
+            # Cache hits are verified by the extraction pass itself, so the
+            # archive is read exactly once. A truncated cache entry fails to
+            # decompress instead of hashing wrong; both mean "refetch".
+            archive = self.fetch_archive(verify_cached=False)
+            try:
+                digest = self._extract_archive(archive, candidate / "nvim")
+            except (tarfile.TarError, EOFError, zlib.error):
+                digest = None
+            if digest != archive.parent.name:
+                print(f"[nvim-release] discarding corrupt cached archive: {archive}", file=sys.stderr, flush=True)
+                shutil.rmtree(candidate / "nvim")
+                shutil.rmtree(archive.parent)
+                archive = self.fetch_archive()
+                self._extract_archive(archive, candidate / "nvim")
+        self._fail_if_injected("binary")
+
+        provider = candidate / "xdg/data/nvim/python3-provider"
+        self._run(["python3", "-m", "venv", str(provider)])
+        self._fail_if_injected("provider")
+        self._run([str(provider / "bin/python"), "-m", "pip", "install", "--upgrade", "pip", "pynvim"])
+        return candidate
+
+    def _cached_archive(self, *, verify: bool = True) -> Path | None:
+        """Return the archive with the expected digest from the download cache, verified unless told otherwise."""
+        if not self.expected_sha256:
+            return None
+        archive = self.downloads_dir / NEOVIM_VERSION / self.expected_sha256 / NEOVIM_ARCHIVE
+        if not archive.is_file():
+            return None
+        if not verify or self._sha256(archive) == self.expected_sha256:
+            return archive
+        print(f"[nvim-release] discarding corrupt cached archive: {archive}", file=sys.stderr, flush=True)
+        shutil.rmtree(archive.parent)
+        return None
+
+    def _recorded_sha256(self) -> str | None:
+        with contextlib.suppress(OSError):
+            return (self.downloads_dir / NEOVIM_VERSION / "published.sha256").read_text(encoding="utf-8").strip() or None
+        return None
+
+    @staticmethod
+    def _parse_shasum(path: Path) -> str | None:
+        """Find NEOVIM_ARCHIVE in a ``sha256sum``-style listing."""
+        with contextlib.suppress(OSError, UnicodeDecodeError):
+            for line in path.read_text(encoding="utf-8").splitlines():
+                digest, _, name = line.strip().partition(" ")
+                if name.strip().lstrip("*") == NEOVIM_ARCHIVE and len(digest) == 64:
+                    return digest.lower()
+        return None
+
+    def _published_sha256(self, mirrored: Path | None) -> str:
+        """Return the digest Neovim published for NEOVIM_ARCHIVE.
+
+        A ``shasum.txt`` next to a mirrored archive is used as is; otherwise
+        the release's own ``shasum.txt`` is downloaded, which offline mode
+        cannot do. The digest is recorded in ``downloads/<version>/published.sha256``
+        so later installs find the cached archive without the network.
+        """
+        import uuid
+
+        digest = self._parse_shasum(mirrored.with_name(NEOVIM_SHASUM)) if mirrored else None
+        if digest is None:
+            if self.offline:
+                raise ReleaseError(
+                    f"offline mode: no published SHA-256 for {NEOVIM_ARCHIVE}; put {NEOVIM_SHASUM} next to the "
+                    "mirrored archive or pass --archive-sha256"
+                )
+            self.downloads_dir.mkdir(parents=True, exist_ok=True)
+            listing = self.downloads_dir / f".{NEOVIM_VERSION}-{NEOVIM_SHASUM}.{uuid.uuid4().hex}.part"
+            try:
                 self._run(
                     [
                         "curl",
@@ -248,25 +484,150 @@ class ReleaseInstaller:
                         "--connect-timeout",
                         "20",
                         "--max-time",
-                        "900",
-                        "--continue-at",
-                        "-",
+                        "120",
                         "--output",
-                        str(archive),
-                        NEOVIM_URL,
+                        str(listing),
+                        NEOVIM_SHASUM_URL,
                     ],
-                    timeout=930,
+                    timeout=150,
                 )
-                with tarfile.open(archive, "r:gz") as package:
-                    package.extractall(temp_dir, filter="data")
-                shutil.copytree(Path(temp_dir) / "nvim-linux-x86_64", candidate / "nvim", symlinks=True)
-        self._fail_if_injected("binary")
+                digest = self._parse_shasum(listing)
+            finally:
+                listing.unlink(missing_ok=True)
+            if digest is None:
+                raise ReleaseError(f"{NEOVIM_SHASUM_URL} does not list {NEOVIM_ARCHIVE}")
+        record = self.downloads_dir / NEOVIM_VERSION / "published.sha256"
+        record.parent.mkdir(parents=True, exist_ok=True)
+        temporary = record.with_name(f".{record.name}.{uuid.uuid4().hex}.tmp")
+        temporary.write_text(digest + "\n", encoding="utf-8")
+        temporary.replace(record)
+        return digest
 
-        provider = candidate / "xdg/data/nvim/python3-provider"
-        self._run(["python3", "-m", "venv", str(provider)])
-        self._fail_if_injected("provider")
-        self._run([str(provider / "bin/python"), "-m", "pip", "install", "--upgrade", "pip", "pynvim"])
-        return candidate
+    def _store_archive(self, source: Path, *, move: bool) -> Path:
+        """Verify ``source`` against the pinned or published digest and file it in the cache by digest."""
+        digest = self._sha256(source)
+        if digest != self.expected_sha256:
+            if move:
+                source.unlink(missing_ok=True)
+            raise ReleaseError(f"{NEOVIM_ARCHIVE} sha256 mismatch: expected {self.expected_sha256}, got {digest}")
+        destination = self.downloads_dir / NEOVIM_VERSION / digest / NEOVIM_ARCHIVE
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        if move:
+            source.replace(destination)
+        else:
+            temporary = destination.with_name(f".{NEOVIM_ARCHIVE}.tmp")
+            shutil.copyfile(source, temporary)
+            temporary.replace(destination)
+        return destination
+
+    def _mirror_archive(self) -> Path | None:
+        if not self.mirror:
+            return None
+        for directory in (self.mirror / NEOVIM_VERSION, self.mirror / f"v{NEOVIM_VERSION}", self.mirror):
+            archive = directory / NEOVIM_ARCHIVE
+            if archive.is_file():
+                return archive
+        return None
+
+    def fetch_archive(self, *, verify_cached: bool = True) -> Path:
+        """Return a Neovim archive: cache first, then the mirror, then the network.
+
+        Archives are stored under ``downloads/<version>/<sha256>/`` so a cache hit
+        needs no network at all. Nothing enters the cache unless it matches
+        the pinned digest or, without a pin, the one Neovim published. Mirrored
+        and downloaded archives are always verified; cache hits only when
+        ``verify_cached`` is set. Offline mode never downloads.
+        """
+        # Without a pin, the published digest recorded by an earlier install is
+        # expected; an archive never checked against one is not a cache hit.
+        self.expected_sha256 = self.expected_sha256 or self._recorded_sha256()
+        archive = self._cached_archive(verify=verify_cached)
+        mirrored = None if archive else self._mirror_archive()
+        if not archive and not mirrored and self.offline:
+            raise ReleaseError(f"offline mode: no cached or mirrored {NEOVIM_ARCHIVE} for Neovim {NEOVIM_VERSION}")
+        if not archive and not self.expected_sha256:
+            self.expected_sha256 = self._published_sha256(mirrored)
+            # The published digest may name an archive cached by an earlier install.
+            archive = self._cached_archive(verify=verify_cached)
+        if archive:
+            print(f"[nvim-release] using cached archive: {archive}", flush=True)
+        elif mirrored is not None:
+            print(f"[nvim-release] using mirrored archive: {mirrored}", flush=True)
+            archive = self._store_archive(mirrored, move=False)
+        else:
+            self.downloads_dir.mkdir(parents=True, exist_ok=True)
+            # The partial download lives next to the cache so --continue-at can
+            # resume it across interrupted installs.
+            partial = self.downloads_dir / f".{NEOVIM_VERSION}-{NEOVIM_ARCHIVE}.part"
+            self._run(
+                [
+                    "curl",
+                    "--fail-with-body",
+                    "--location",
+                    "--retry",
+                    "5",
+                    "--retry-all-errors",
+                    "--retry-delay",
+                    "2",
+                    "--connect-timeout",
+                    "20",
+                    "--max-time",
+                    "900",
+                    "--continue-at",
+                    "-",
+                    "--output",
+                    str(partial),
+                    NEOVIM_URL,
+                ],
+                timeout=930,
+            )
+            archive = self._store_archive(partial, move=True)
+        self.archive_sha256 = archive.parent.name
+        return archive
+
+    @staticmethod
+    def _extract_archive(archive: Path, destination: Path) -> str:
+        """Stream ``archive`` into ``destination`` in one pass and return its SHA-256.
+
+        The tarball is read in ``r|gz`` stream mode, the ``nvim-linux-x86_64/``
+        prefix is stripped member by member and the ``data`` filter applies to
+        the stripped paths, so nothing is staged in a temporary tree.
+        """
+        import hashlib
+        import tarfile
+
+        prefix = NEOVIM_ARCHIVE.removesuffix(".tar.gz") + "/"
+
+        def strip_prefix(member: tarfile.TarInfo, path: str) -> tarfile.TarInfo | None:
+            name = member.name.removeprefix("./")
+            if name.rstrip("/") == prefix.rstrip("/"):
+                return None
+            if not name.startswith(prefix):
+                raise ReleaseError(f"unexpected member outside {prefix} in {archive.name}: {member.name}")
+            changes = {"name": name[len(prefix) :]}
+            if member.islnk():
+                changes["linkname"] = member.linkname.removeprefix("./").removeprefix(prefix)
+            return tarfile.data_filter(member.replace(**changes, deep=False), path)
+
+        class HashingReader:
+            def __init__(self, handle) -> None:
+                self.handle = handle
+                self.digest = hashlib.sha256()
+
+            def read(self, size: int = -1) -> bytes:
+                data = self.handle.read(size)
+                self.digest.update(data)
+                return data
+
+        destination.mkdir(parents=True, exist_ok=True)
+        with archive.open("rb") as handle:
+            reader = HashingReader(handle)
+            with tarfile.open(fileobj=reader, mode="r|gz") as package:
+                package.extractall(destination, filter=strip_prefix)
+            # tarfile stops at the end-of-archive marker; hash any trailing padding too.
+            while reader.read(1024 * 1024):
+                pass
+        return reader.digest.hexdigest()
 
     def _link_persistent(self, release: Path) -> None:
         for release_relative, persistent_relative in PERSISTENT_LINKS.items():
@@ -295,6 +656,8 @@ class ReleaseInstaller:
                 "GIT_HTTP_LOW_SPEED_LIMIT": "1024",
                 "GIT_HTTP_LOW_SPEED_TIME": "30",
                 "GIT_TERMINAL_PROMPT": "0",
+                # Internal to the build; HPF_NVIM_PLUGIN_MIRROR stays the operator's setting.
+                "HPF_NVIM_LAZY_URL_FORMAT": f"{self.active_plugin_mirror}/%s.git" if self.active_plugin_mirror else "",
                 "PATH": f"{release / 'support/bin'}:{release / 'nvim/bin'}:{release / 'xdg/data/nvim/mason/bin'}:{self.home / '.local/bin'}:{self.home / '.cargo/bin'}:{env.get('PATH', '')}",
             }
         )
@@ -324,7 +687,121 @@ class ReleaseInstaller:
         )
         wget_wrapper.chmod(0o755)
 
+    def plugin_sources(self) -> dict[str, str]:
+        """Map each plugin in lazy-lock.json to its ``owner/repo`` source.
+
+        Sources come from the string literals in the plugin specs: a plugin is
+        matched by repository basename, or by a ``name = "..."`` override that
+        follows its source in the same spec.
+        """
+        import re
+
+        names = set(self._read_lock(self.repo_root / "nvim/lazy-lock.json")) | {"lazy.nvim"}
+        sources = {"lazy.nvim": LAZY_SOURCE}
+        source_re = re.compile(r"""["']([\w.-]+/([\w.-]+))["']""")
+        name_re = re.compile(r"""\bname\s*=\s*["']([^"']+)["']""")
+        for spec_file in sorted((self.repo_root / "nvim/lua/plugins").rglob("*.lua")):
+            text = spec_file.read_text(encoding="utf-8")
+            matches = list(source_re.finditer(text))
+            for index, match in enumerate(matches):
+                window_end = matches[index + 1].start() if index + 1 < len(matches) else len(text)
+                override = name_re.search(text, match.end(), window_end)
+                for name in (override.group(1) if override else None, match.group(2)):
+                    if name in names:
+                        sources.setdefault(name, match.group(1))
+                        break
+        return sources
+
+    def _mirror_repo(self, source: str) -> Path:
+        return self.plugin_mirror / f"{source}.git"
+
+    def mirror_status(self) -> dict[str, str]:
+        """Classify every locked plugin as ok, missing, stale or unknown in the mirror."""
+        import subprocess
+
+        sources = self.plugin_sources()
+        lock = self._read_lock(self.repo_root / "nvim/lazy-lock.json")
+        lock.setdefault("lazy.nvim", "")
+        status: dict[str, str] = {}
+        for name, commit in sorted(lock.items()):
+            source = sources.get(name)
+            if not source:
+                status[name] = "unknown source"
+            elif not self._mirror_repo(source).is_dir():
+                status[name] = "missing"
+            elif commit and subprocess.run(
+                ["git", "-C", str(self._mirror_repo(source)), "cat-file", "-e", f"{commit}^{{commit}}"],
+                capture_output=True,
+                check=False,
+            ).returncode:
+                status[name] = "stale"
+            else:
+                status[name] = "ok"
+        return status
+
+    def refresh_mirror(self, jobs: int = 4) -> list[str]:
+        """Clone missing mirror repositories and fetch deltas into existing ones."""
+        import concurrent.futures
+        import subprocess
+        import uuid
+
+        if self.offline:
+            raise ReleaseError("cannot refresh the plugin mirror in offline mode")
+        sources = self.plugin_sources()
+        lock = set(self._read_lock(self.repo_root / "nvim/lazy-lock.json")) | {"lazy.nvim"}
+        unknown = sorted(lock - set(sources))
+        env = dict(os.environ, GIT_TERMINAL_PROMPT="0", GIT_HTTP_LOW_SPEED_LIMIT="1024", GIT_HTTP_LOW_SPEED_TIME="30")
+
+        def refresh(source: str) -> str | None:
+            repository = self._mirror_repo(source)
+            staging: Path | None = None
+            if repository.is_dir():
+                command = ["git", "-C", str(repository), "fetch", "--prune", "--quiet"]
+            else:
+                repository.parent.mkdir(parents=True, exist_ok=True)
+                staging = repository.with_name(f".{repository.name}.{uuid.uuid4().hex}.tmp")
+                command = ["git", "clone", "--mirror", "--quiet", f"{self.plugin_upstream}/{source}.git", str(staging)]
+            result = subprocess.run(command, env=env, capture_output=True, text=True, timeout=600, check=False)
+            if result.returncode:
+                if staging:
+                    shutil.rmtree(staging, ignore_errors=True)
+                return f"{source}: {result.stderr.strip() or f'exit {result.returncode}'}"
+            if staging:
+                staging.rename(repository)
+            return None
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            results = list(pool.map(refresh, sorted({sources[name] for name in lock if name in sources})))
+        failures = [result for result in results if result]
+        print(
+            f"[nvim-release] plugin mirror {self.plugin_mirror}: {len(results) - len(failures)}/{len(results)} repositories refreshed",
+            flush=True,
+        )
+        return failures + [f"{name}: no owner/repo source found in nvim/lua/plugins" for name in unknown]
+
+    def select_plugin_mirror(self) -> None:
+        """Use the plugin mirror for this build when it covers every locked commit."""
+        self.active_plugin_mirror = None
+        if not self.plugin_mirror.is_dir():
+            if self.offline:
+                raise ReleaseError(f"offline mode needs a plugin mirror at {self.plugin_mirror}")
+            return
+        incomplete = {name: state for name, state in self.mirror_status().items() if state != "ok"}
+        if incomplete:
+            detail = ", ".join(f"{name} ({state})" for name, state in sorted(incomplete.items()))
+            if self.offline:
+                raise ReleaseError(f"plugin mirror is incomplete: {detail}")
+            print(
+                f"[nvim-release] not using plugin mirror, run 'mirror refresh' to fix: {detail}",
+                file=sys.stderr,
+                flush=True,
+            )
+            return
+        self.active_plugin_mirror = self.plugin_mirror
+
     def install_lazy_bootstrap(self, candidate: Path) -> None:
+        import subprocess
+
         destination = candidate / "xdg/data/nvim/lazy/lazy.nvim"
         lazy_entrypoint = destination / "lua/lazy/init.lua"
         if lazy_entrypoint.is_file():
@@ -335,7 +812,7 @@ class ReleaseInstaller:
             "clone",
             "--filter=blob:none",
             "--branch=stable",
-            "https://github.com/folke/lazy.nvim.git",
+            str(self._mirror_repo(LAZY_SOURCE)) if self.active_plugin_mirror else f"{self.plugin_upstream}/{LAZY_SOURCE}.git",
             str(destination),
         ]
         last_error: Exception | None = None
@@ -353,49 +830,701 @@ class ReleaseInstaller:
             print(f"[nvim-release] lazy.nvim bootstrap attempt {attempt}/5 failed", file=sys.stderr, flush=True)
         raise ReleaseError("unable to bootstrap lazy.nvim after 5 attempts") from last_error
 
+    @staticmethod
+    def _read_lock(path: Path) -> dict[str, str]:
+        try:
+            lock = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return {}
+        return {name: entry.get("commit", "") for name, entry in lock.items() if isinstance(entry, dict)}
+
+    def restore_plugin_origins(self, candidate: Path) -> None:
+        """Point plugin checkouts cloned from the mirror back at their upstream.
+
+        Otherwise ``origin`` stays the local bare repository, and a later
+        ``:Lazy update`` in the release would fetch from the mirror.
+        """
+        import subprocess
+
+        if not self.active_plugin_mirror:
+            return
+        lazy = candidate / "xdg/data/nvim/lazy"
+        restored = 0
+        for name, source in sorted(self.plugin_sources().items()):
+            checkout = lazy / name
+            if not (checkout / ".git").exists():
+                continue
+            result = subprocess.run(
+                ["git", "-C", str(checkout), "remote", "set-url", "origin", f"{self.plugin_upstream}/{source}.git"],
+                capture_output=True,
+                text=True,
+                check=False,
+            )
+            if result.returncode:
+                raise ReleaseError(f"cannot reset origin of {name}: {result.stderr.strip() or f'exit {result.returncode}'}")
+            restored += 1
+        print(f"[nvim-release] plugin origins reset to {self.plugin_upstream}: {restored}", flush=True)
+
+    @staticmethod
+    def _git_head(repository: Path) -> str | None:
+        git_dir = repository / ".git"
+        try:
+            if git_dir.is_file():
+                git_dir = (repository / git_dir.read_text(encoding="utf-8").removeprefix("gitdir:").strip()).resolve()
+            head = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+            if not head.startswith("ref: "):
+                return head
+            ref = head[5:]
+            ref_file = git_dir / ref
+            if ref_file.is_file():
+                return ref_file.read_text(encoding="utf-8").strip()
+            for line in (git_dir / "packed-refs").read_text(encoding="utf-8").splitlines():
+                commit, _, name = line.partition(" ")
+                if name == ref:
+                    return commit
+        except OSError:
+            return None
+        return None
+
+    @staticmethod
+    def _read_receipt(package: Path) -> dict:
+        try:
+            receipt = json.loads((package / "mason-receipt.json").read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return {}
+        return receipt if isinstance(receipt, dict) else {}
+
+    @staticmethod
+    def _receipt_version(receipt: dict) -> str | None:
+        # Registry receipts identify the install by purl, e.g. pkg:npm/pyright@1.1.404.
+        source_id = str(receipt.get("source", {}).get("id", ""))
+        _, _, version = source_id.partition("@")
+        return version.split("?", 1)[0].split("#", 1)[0] or None
+
+    @staticmethod
+    def _parser_revisions(treesitter: Path) -> dict[str, str]:
+        """Read the parser revisions pinned by an nvim-treesitter checkout."""
+        import re
+
+        try:
+            source = (treesitter / "lua/nvim-treesitter/parsers.lua").read_text(encoding="utf-8")
+        except OSError:
+            return {}
+        revisions: dict[str, str] = {}
+        for match in re.finditer(r"^  (\w+) = \{$(.*?)^  \},?$", source, re.M | re.S):
+            if revision := re.search(r"\brevision = ['\"]([^'\"]+)['\"]", match.group(2)):
+                revisions[match.group(1)] = revision.group(1)
+        return revisions
+
+    def _language_runtime(self) -> tuple[dict, dict]:
+        """Load the language catalog and its runtime projection."""
+        catalog_module = _load_language_catalog(self.repo_root / "install-script/nvim/language_catalog.py")
+        catalog = catalog_module.load_catalog(self.repo_root / "nvim/languages.json")
+        return catalog, catalog_module.projection(catalog)
+
+    def _catalog_targets(self) -> tuple[dict[str, str | None], list[str]]:
+        """Return the wanted Mason packages (with pinned versions) and parsers."""
+        catalog, runtime = self._language_runtime()
+        versions = {tool["package"]: tool.get("version") for tool in catalog["tools"] if tool["owner"] == "mason"}
+        return {name: versions.get(name) for name in runtime["mason_packages"]}, runtime["parsers"]
+
+    @staticmethod
+    def _rebase_paths(tree: Path, old_prefix: Path, new_prefix: Path) -> None:
+        """Point absolute symlinks and script paths under ``old_prefix`` at ``new_prefix``.
+
+        Rewritten files are replaced, not edited in place, so a tree that
+        shares extents with the store never changes the stored object.
+        """
+        old, new = str(old_prefix), str(new_prefix)
+        old_bytes, new_bytes = os.fsencode(old), os.fsencode(new)
+        for directory, dirs, files in os.walk(tree):
+            for name in dirs + files:
+                path = os.path.join(directory, name)
+                if not os.path.islink(path):
+                    continue
+                target = os.readlink(path)
+                if target == old or target.startswith(old + os.sep):
+                    os.unlink(path)
+                    os.symlink(new + target[len(old) :], path)
+            for name in files:
+                path = os.path.join(directory, name)
+                if os.path.islink(path):
+                    continue
+                # Mason writes exec wrappers and venv scripts with absolute
+                # paths; other files are left untouched.
+                with open(path, "rb") as handle:
+                    head = handle.read(2)
+                    if head != b"#!" and name != "pyvenv.cfg":
+                        continue
+                    content = head + handle.read()
+                if old_bytes in content:
+                    temporary = f"{path}.rebase.tmp"
+                    with open(temporary, "wb") as handle:
+                        handle.write(content.replace(old_bytes, new_bytes))
+                    shutil.copymode(path, temporary)
+                    os.replace(temporary, path)
+
+    @classmethod
+    def _copy_file(cls, source: Path, destination: Path) -> None:
+        """Reflink one file, copying it when the filesystem cannot share extents."""
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            cls._reflink_file(str(source), str(destination))
+        except OSError:
+            shutil.copy2(source, destination)
+
+    def _store_enabled(self) -> bool:
+        """Whether the release root can reflink, probed once per run.
+
+        The store only pays off when releases share its extents; with plain
+        copies every object would be written twice and kept a third time.
+        """
+        if self.reflinks is None:
+            import uuid
+
+            self.release_root.mkdir(parents=True, exist_ok=True)
+            probe = self.release_root / f".reflink-probe.{uuid.uuid4().hex}"
+            clone = probe.with_name(f"{probe.name}.clone")
+            try:
+                probe.write_bytes(b"probe")
+                self._reflink_file(str(probe), str(clone))
+                self.reflinks = True
+            except OSError:
+                self.reflinks = False
+                print("[nvim-release] no reflink support; seeding from current without the store", flush=True)
+            finally:
+                probe.unlink(missing_ok=True)
+                clone.unlink(missing_ok=True)
+        return self.reflinks
+
+    def _store_entry(self, kind: str, name: str, key: str | None) -> Path | None:
+        if not all(part and part not in (".", "..") and "/" not in part for part in (name, key)):
+            return None
+        return self.store_dir / kind / name / key
+
+    def _store_put(self, entry: Path, populate: Callable[[Path], None]) -> None:
+        """Publish a store object atomically; ``populate`` fills a staging directory."""
+        import uuid
+
+        if entry.is_dir():
+            return
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        staging = entry.with_name(f".{entry.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            populate(staging)
+            staging.rename(entry)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+    def _store_plugin(self, plugin: Path, entry: Path) -> None:
+        self._store_put(entry, lambda staging: self._clone_tree(plugin, staging, quiet=True))
+
+    def _store_mason(self, package: Path, entry: Path) -> None:
+        def populate(staging: Path) -> None:
+            self._clone_tree(package, staging, quiet=True)
+            self._rebase_paths(staging, package, entry)
+
+        self._store_put(entry, populate)
+
+    def _store_parser(self, site: Path, language: str, entry: Path) -> None:
+        def populate(staging: Path) -> None:
+            for relative in (f"parser/{language}.so", f"parser-info/{language}.revision"):
+                self._copy_file(site / relative, staging / relative)
+
+        self._store_put(entry, populate)
+
+    def _seed(
+        self, kind: str, name: str, entry: Path | None, reason: str | None, materialize: Callable[[list[Path]], None]
+    ) -> None:
+        """Run ``materialize`` and record the outcome in the reuse report.
+
+        ``materialize`` appends every path to the list it is given before
+        creating it, so a copy that fails partway can be removed again and
+        leave the candidate for Lazy, Mason or nvim-treesitter to fill.
+        """
+        report = self.reuse.setdefault(kind, {"reused": [], "rebuilt": {}})
+        if reason is None and entry is not None:
+            created: list[Path] = []
+            try:
+                materialize(created)
+            except OSError as error:
+                reason = f"copy failed: {error}"
+                for path in reversed(created):
+                    if path.is_dir() and not path.is_symlink():
+                        shutil.rmtree(path, ignore_errors=True)
+                    else:
+                        path.unlink(missing_ok=True)
+            else:
+                report["reused"].append(name)
+                if self._store_enabled():
+                    self.store_refs.add(entry.relative_to(self.store_dir).as_posix())
+                return
+        report["rebuilt"][name] = reason
+
+    def seed_plugins(self, candidate: Path) -> None:
+        """Copy plugin checkouts at their locked commit into the candidate.
+
+        Checkouts come from the release store, or from ``current`` when it is
+        already at the locked commit (which also adds them to the store).
+        Anything else is left for ``Lazy! install``. Store objects are only
+        reflinked, never hardlinked: git, Lazy builds and Mason all write into
+        release trees, and those writes must not reach the shared object.
+        Without reflinks the store is skipped and ``current`` is copied.
+        """
+        self.reuse = {"source": self.old_current.name if self.old_current else None}
+        if not self.reuse_enabled:
+            self.reuse["source"] = None
+            return
+        old_lazy = self.old_current / "xdg/data/nvim/lazy" if self.old_current else None
+        new_lazy = candidate / "xdg/data/nvim/lazy"
+        use_store = self._store_enabled()
+        for name, commit in sorted(self._read_lock(candidate / "lazy-lock.json").items()):
+            entry = self._store_entry("plugins", name, commit)
+            plugin = old_lazy / name if old_lazy else None
+            if entry is None:
+                reason = "no locked commit"
+            elif use_store and entry.is_dir():
+                reason = None
+            elif not plugin or not plugin.is_dir():
+                reason = "not installed in current"
+            elif self._git_head(plugin) != commit:
+                reason = "lock commit changed"
+            else:
+                reason = None
+
+            def materialize(created: list[Path], name: str = name, entry: Path = entry, plugin: Path | None = plugin) -> None:
+                source = plugin
+                if use_store:
+                    if not entry.is_dir():
+                        self._store_plugin(plugin, entry)
+                    source = entry
+                destination = new_lazy / name
+                created.append(destination)
+                self._clone_tree(source, destination, quiet=True)
+
+            self._seed("plugins", name, entry, reason, materialize)
+        self._report_reuse("plugins")
+
+    def seed_runtime(self, candidate: Path) -> None:
+        """Copy Mason packages and parsers whose version and revision still match.
+
+        Runs after Lazy so the candidate's nvim-treesitter checkout can say
+        which parser revisions it wants.
+        """
+        if not self.reuse_enabled:
+            return
+        if self.reuse is None:
+            self.reuse = {"source": self.old_current.name if self.old_current else None}
+        try:
+            mason_packages, parsers = self._catalog_targets()
+        except (RuntimeError, OSError, KeyError, AttributeError) as error:
+            print(f"[nvim-release] not reusing Mason packages or parsers: {error}", file=sys.stderr, flush=True)
+            return
+        old_data = self.old_current / "xdg/data/nvim" if self.old_current else None
+        new_data = candidate / "xdg/data/nvim"
+        new_mason = new_data / "mason"
+        use_store = self._store_enabled()
+
+        for name, pinned in mason_packages.items():
+            package = old_data / "mason/packages" / name if old_data else None
+            installed = self._receipt_version(self._read_receipt(package)) if package else None
+            version = pinned or installed
+            entry = self._store_entry("mason", name, version)
+            if entry is None:
+                reason = "not installed in current"
+            elif use_store and entry.is_dir():
+                reason = None
+            elif installed != version:
+                reason = f"current has {installed or 'no install'}, catalog pins {pinned}"
+            else:
+                reason = None
+
+            def materialize(created: list[Path], name: str = name, entry: Path = entry, package: Path | None = package) -> None:
+                source = package
+                if use_store:
+                    if not entry.is_dir():
+                        self._store_mason(package, entry)
+                    source = entry
+                destination = new_mason / "packages" / name
+                created.append(destination)
+                self._clone_tree(source, destination, quiet=True)
+                self._rebase_paths(destination, source, destination)
+                self._link_mason_package(new_mason, name, self._read_receipt(destination), created)
+
+            self._seed("mason", name, entry, reason, materialize)
+            if name in self.reuse["mason"]["reused"]:
+                self.reuse["mason"].setdefault("versions", {})[name] = version
+        self._report_reuse("mason")
+
+        old_site = old_data / "site" if old_data else None
+        new_site = new_data / "site"
+        new_treesitter = new_data / "lazy/nvim-treesitter"
+        wanted = self._parser_revisions(new_treesitter)
+        # Without a readable parsers.lua the current revisions are only
+        # trusted when nvim-treesitter itself did not move.
+        same_treesitter = bool(old_data) and self._git_head(old_data / "lazy/nvim-treesitter") == self._read_lock(
+            candidate / "lazy-lock.json"
+        ).get("nvim-treesitter")
+        for language in dict.fromkeys(parsers):
+            current = None
+            if old_site and (old_site / "parser" / f"{language}.so").is_file():
+                with contextlib.suppress(OSError):
+                    current = (old_site / "parser-info" / f"{language}.revision").read_text(encoding="utf-8").strip()
+            revision = wanted.get(language) or (current if same_treesitter else None)
+            entry = self._store_entry("parsers", language, revision)
+            if entry is None:
+                reason = "nvim-treesitter commit changed" if current else "not installed in current"
+            elif use_store and entry.is_dir():
+                reason = None
+            elif current != revision:
+                reason = "parser revision changed" if current else "not installed in current"
+            else:
+                reason = None
+
+            def materialize(created: list[Path], language: str = language, entry: Path = entry) -> None:
+                source = old_site
+                if use_store:
+                    if not entry.is_dir():
+                        self._store_parser(old_site, language, entry)
+                    source = entry
+                for relative in (f"parser/{language}.so", f"parser-info/{language}.revision"):
+                    created.append(new_site / relative)
+                    self._copy_file(source / relative, new_site / relative)
+                queries = new_site / "queries" / language
+                if (new_treesitter / "runtime/queries" / language).is_dir() and not os.path.lexists(queries):
+                    queries.parent.mkdir(parents=True, exist_ok=True)
+                    created.append(queries)
+                    # Relative, so the link survives the candidate rename.
+                    queries.symlink_to(Path("../../lazy/nvim-treesitter/runtime/queries") / language)
+
+            self._seed("parsers", language, entry, reason, materialize)
+        self._report_reuse("parsers")
+
+    def _report_reuse(self, kind: str) -> None:
+        report = self.reuse.get(kind)
+        if report:
+            total = len(report["reused"]) + len(report["rebuilt"])
+            print(f"[nvim-release] reused {kind}: {len(report['reused'])}/{total}", flush=True)
+
+    @staticmethod
+    def _link_mason_package(mason: Path, name: str, receipt: dict, created: list[Path]) -> None:
+        """Recreate the bin/share/opt links Mason records in a package receipt.
+
+        Each link is appended to ``created`` before it is made.
+        """
+        links = receipt.get("links", {})
+        for kind in ("bin", "share", "opt"):
+            for link_name, relative in (links.get(kind) or {}).items():
+                link = mason / kind / link_name
+                if os.path.lexists(link):
+                    continue
+                link.parent.mkdir(parents=True, exist_ok=True)
+                created.append(link)
+                link.symlink_to(os.path.relpath(mason / "packages" / name / relative, link.parent))
+
+    def store_candidate(self, candidate: Path) -> None:
+        """Add the candidate's plugins, Mason packages and parsers to the store."""
+        if not self._store_enabled():
+            return
+        data = candidate / "xdg/data/nvim"
+        stored = 0
+        items: list[tuple[Path | None, Callable[[Path], None]]] = []
+        for name, commit in self._read_lock(candidate / "lazy-lock.json").items():
+            plugin = data / "lazy" / name
+            if plugin.is_dir() and self._git_head(plugin) == commit:
+                items.append(
+                    (self._store_entry("plugins", name, commit), lambda entry, plugin=plugin: self._store_plugin(plugin, entry))
+                )
+        packages = data / "mason/packages"
+        for package in sorted(packages.iterdir()) if packages.is_dir() else []:
+            version = self._receipt_version(self._read_receipt(package))
+            items.append(
+                (self._store_entry("mason", package.name, version), lambda entry, package=package: self._store_mason(package, entry))
+            )
+        site = data / "site"
+        for revision_file in sorted((site / "parser-info").glob("*.revision")):
+            language = revision_file.name.removesuffix(".revision")
+            if not (site / "parser" / f"{language}.so").is_file():
+                continue
+            entry = self._store_entry("parsers", language, revision_file.read_text(encoding="utf-8").strip())
+            items.append((entry, lambda entry, language=language: self._store_parser(site, language, entry)))
+        for entry, put in items:
+            if entry is None:
+                continue
+            try:
+                if not entry.is_dir():
+                    put(entry)
+                    stored += 1
+            except OSError as error:
+                print(f"[nvim-release] cannot store {entry}: {error}", file=sys.stderr, flush=True)
+                continue
+            self.store_refs.add(entry.relative_to(self.store_dir).as_posix())
+        print(f"[nvim-release] store: {stored} new objects, {len(self.store_refs)} referenced", flush=True)
+
+    def collect_store(self, releases: set[Path]) -> None:
+        """Drop store objects that no kept release references."""
+        referenced: set[str] = set()
+        for release in releases:
+            try:
+                manifest = json.loads((release / "manifest.json").read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError):
+                continue
+            referenced.update(manifest.get("store_refs", []))
+        removed = 0
+        for kind in STORE_KINDS:
+            kind_dir = self.store_dir / kind
+            for name_dir in sorted(kind_dir.iterdir()) if kind_dir.is_dir() else []:
+                for entry in list(name_dir.iterdir()):
+                    if f"{kind}/{name_dir.name}/{entry.name}" not in referenced:
+                        self._trash(entry)
+                        removed += 1
+                if not any(name_dir.iterdir()):
+                    name_dir.rmdir()
+        if removed:
+            print(f"[nvim-release] store: removed {removed} unreferenced objects", flush=True)
+
     def build_candidate(self, candidate: Path) -> None:
         binary = candidate / "nvim/bin/nvim"
         self.install_network_wrappers(candidate)
+        self.seed_plugins(candidate)
+        self.select_plugin_mirror()
         env = self._release_env(candidate)
         self._fail_if_injected("lazy")
         self.install_lazy_bootstrap(candidate)
         startup_guard = "+lua if vim.v.errmsg ~= '' then io.stderr:write(vim.v.errmsg .. '\\n'); vim.cmd('cquit 1') end"
         self._run([str(binary), "--headless", "+Lazy! install", startup_guard, "+qa"], env=env, timeout=900)
-        self._fail_if_injected("mason")
-        self._run(
+        self.restore_plugin_origins(candidate)
+        self.seed_runtime(candidate)
+        # Mason packages and parser compiles do not depend on each other once
+        # Lazy has installed both plugins, so they run side by side. -i NONE
+        # keeps the concurrent instances off the shared ShaDa file.
+        guarded = "local ok,err=xpcall(function() {} end, debug.traceback); if not ok then io.stderr:write(err .. '\\n'); vim.cmd('cquit 1') end"
+        mason = "dofile([[" + str(self.repo_root / "nvim/scripts/install_mason.lua") + "]])"
+        parsers = "require('nvim-treesitter').install(require('config.languages').runtime().parsers):wait(600000)"
+        self._run_phases(
             [
-                str(binary),
-                "--headless",
-                "+lua local ok,err=xpcall(function() dofile([["
-                + str(self.repo_root / "nvim/scripts/install_mason.lua")
-                + "]]) end, debug.traceback); if not ok then io.stderr:write(err .. '\\n'); vim.cmd('cquit 1') end",
-                startup_guard,
-                "+qa",
+                (name, [str(binary), "--headless", "-i", "NONE", "+lua " + guarded.format(code), startup_guard, "+qa"])
+                for name, code in (("mason", mason), ("parsers", parsers))
             ],
             env=env,
-            timeout=900,
-        )
-        self._fail_if_injected("parsers")
-        self._run(
-            [
-                str(binary),
-                "--headless",
-                "+lua local ok,err=xpcall(function() require('nvim-treesitter').install(require('config.languages').runtime().parsers):wait(600000) end, debug.traceback); if not ok then io.stderr:write(err .. '\\n'); vim.cmd('cquit 1') end",
-                startup_guard,
-                "+qa",
-            ],
-            env=env,
-            timeout=700,
+            log_dir=self.build_log_dir(candidate),
         )
+        self.store_candidate(candidate)
+
+    def build_log_dir(self, release: Path) -> Path:
+        return self.build_logs_dir / release.name.removesuffix(".candidate")
+
+    def _phase_timeout(self, name: str) -> int:
+        return _env_number(f"HPF_NVIM_{name.upper()}_TIMEOUT", BUILD_PHASE_TIMEOUTS[name])
+
+    def _run_phases(self, phases: list[tuple[str, list[str]]], *, env: dict[str, str], log_dir: Path) -> None:
+        """Run independent build phases, at most ``build_jobs`` at a time.
+
+        Each phase writes its own log under ``log_dir`` and has its own
+        timeout. Injected failures are checked for every phase before any
+        starts, and when phases fail the first one in ``phases`` order is
+        reported, so the outcome never depends on which process ends first.
+        """
+        import signal
+        import subprocess
+        import time
+
+        for name, _command in phases:
+            self._fail_if_injected(name)
+        log_dir.mkdir(parents=True, exist_ok=True)
+        pending = list(phases)
+        running: dict[str, tuple[subprocess.Popen, float, float]] = {}
+        failures: dict[str, str] = {}
+
+        def stop(process: subprocess.Popen) -> None:
+            with contextlib.suppress(ProcessLookupError):
+                os.killpg(process.pid, signal.SIGTERM)
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                with contextlib.suppress(ProcessLookupError):
+                    os.killpg(process.pid, signal.SIGKILL)
+                process.wait()
+
+        try:
+            while pending or running:
+                while pending and len(running) < self.build_jobs and not failures:
+                    name, command = pending.pop(0)
+                    log = log_dir / f"{name}.log"
+                    print(f"[nvim-release] run {name} (log: {log}):", " ".join(command), flush=True)
+                    with log.open("wb") as handle:
+                        process = subprocess.Popen(
+                            command,
+                            env=env,
+                            stdin=subprocess.DEVNULL,
+                            stdout=handle,
+                            stderr=subprocess.STDOUT,
+                            start_new_session=True,
+                        )
+                    started = time.monotonic()
+                    running[name] = (process, started, started + self._phase_timeout(name))
+                for name, (process, started, deadline) in list(running.items()):
+                    if process.poll() is None and time.monotonic() < deadline:
+                        continue
+                    if process.returncode is None:
+                        stop(process)
+                        failures[name] = f"timed out after {self._phase_timeout(name)}s"
+                    elif process.returncode != 0:
+                        failures[name] = f"exited with {process.returncode}"
+                    del running[name]
+                    print(
+                        f"[nvim-release] {name} {failures.get(name, 'finished')} in {time.monotonic() - started:.1f}s",
+                        flush=True,
+                    )
+                if failures:
+                    pending.clear()
+                    for name, (process, _started, _deadline) in list(running.items()):
+                        stop(process)
+                        print(f"[nvim-release] {name} cancelled", file=sys.stderr, flush=True)
+                        del running[name]
+                elif running:
+                    time.sleep(0.1)
+        finally:
+            for process, _started, _deadline in running.values():
+                stop(process)
+
+        for name, _command in phases:
+            if name in failures:
+                log = log_dir / f"{name}.log"
+                with contextlib.suppress(OSError):
+                    tail = log.read_text(encoding="utf-8", errors="replace").splitlines()[-20:]
+                    print("\n".join(f"[{name}] {line}" for line in tail), file=sys.stderr, flush=True)
+                raise ReleaseError(f"build phase {name} {failures[name]} (log: {log})")
 
     def verify_candidate(self, candidate: Path) -> None:
         self._fail_if_injected("verify")
         env = self._release_env(candidate)
         verify = self.repo_root / "install-script/nvim/nvim-verify.sh"
         self._run(["bash", str(verify)], env=env, timeout=900)
+        if self.bench_runs:
+            self._fail_if_injected("benchmark")
+            self.startup = self.benchmark_release(candidate, self.bench_runs)
+            regressions = self.startup_regressions(self.startup, self._release_startup(self.old_current))
+            if regressions:
+                raise ReleaseError("startup regression against current release: " + "; ".join(regressions))
         self._write_manifest(candidate, verified=True, activated=False)
 
+    @staticmethod
+    def _summarize(samples: list[float]) -> dict[str, float]:
+        # The helper shipped next to this script, not the target repo's copy.
+        percentile = _load_language_catalog(Path(__file__).with_name("language_catalog.py")).percentile
+        return {"p50": round(percentile(samples, 0.5), 2), "p95": round(percentile(samples, 0.95), 2)}
+
+    @staticmethod
+    def _startuptime_total(log: Path) -> float:
+        """Elapsed milliseconds at the ``NVIM STARTED`` line of a --startuptime log."""
+        for line in reversed(log.read_text(encoding="utf-8", errors="replace").splitlines()):
+            if "--- NVIM STARTED ---" in line:
+                return float(line.split()[0])
+        raise ReleaseError(f"no NVIM STARTED line in {log}")
+
+    def benchmark_release(self, release: Path, runs: int) -> dict:
+        """Time ``runs`` warm starts of a release, bare and with every catalog fixture.
+
+        Startup comes from ``--startuptime``; fixtures with an LSP also record
+        the wall time from spawning Neovim until the server attaches. A server
+        that does not attach within BENCH_LSP_TIMEOUT_MS on the first sample
+        will not on the next ones either, so that fixture stops after one run.
+        """
+        import subprocess
+        import tempfile
+        import time
+
+        try:
+            fixtures = self._language_runtime()[1]["fixtures"]
+        except (RuntimeError, OSError, KeyError, AttributeError) as error:
+            print(f"[nvim-release] benchmarking without catalog fixtures: {error}", file=sys.stderr, flush=True)
+            fixtures = []
+        binary = release / "nvim/bin/nvim"
+        env = self._release_env(release)
+        cases: dict[str, dict | None] = {"startup": None}
+        cases.update({f"{fixture['language']}/{fixture['filename']}": fixture for fixture in fixtures})
+        results: dict[str, dict] = {}
+        with tempfile.TemporaryDirectory(prefix="nvim-bench-") as temporary:
+            root = Path(temporary)
+            workdir = root / "work"
+            workdir.mkdir()
+            # Root markers make LSP servers attach the way they do in a project.
+            subprocess.run(["git", "init", "-q", str(workdir)], check=True)
+            log = root / "startuptime.log"
+            marker = root / "attached"
+            # One untimed start fills the loader cache so every sample is warm.
+            subprocess.run([str(binary), "--headless", "+qa"], env=env, cwd=workdir, capture_output=True, timeout=120, check=True)
+            for name, fixture in cases.items():
+                command = [str(binary), "--headless", "--startuptime", str(log)]
+                lsp_name = fixture.get("lsp_name") if fixture else None
+                if fixture:
+                    path = workdir / fixture["language"] / fixture["filename"]
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    path.write_text(fixture["content"], encoding="utf-8")
+                    command.append(str(path))
+                if lsp_name:
+                    command.append(
+                        f"+lua local ok = vim.wait({BENCH_LSP_TIMEOUT_MS}, function() return #vim.lsp.get_clients {{ bufnr = 0, name = [[{lsp_name}]] }} > 0 end, 5);"
+                        f" if ok then local s, us = vim.uv.gettimeofday(); vim.fn.writefile({{ string.format('%d.%06d', s, us) }}, [[{marker}]]) end"
+                    )
+                command.append("+qa")
+                startup: list[float] = []
+                attach: list[float] = []
+                for sample in range(runs):
+                    log.unlink(missing_ok=True)
+                    marker.unlink(missing_ok=True)
+                    started = time.time()
+                    subprocess.run(command, env=env, cwd=workdir, capture_output=True, timeout=120, check=True)
+                    startup.append(self._startuptime_total(log))
+                    if marker.is_file():
+                        attach.append((float(marker.read_text(encoding="utf-8")) - started) * 1000)
+                    elif lsp_name and sample == 0:
+                        print(
+                            f"[nvim-release] {lsp_name} did not attach for {name} within {BENCH_LSP_TIMEOUT_MS} ms; skipping its remaining runs",
+                            file=sys.stderr,
+                            flush=True,
+                        )
+                        break
+                results[name] = {"startup_ms": self._summarize(startup)}
+                if lsp_name:
+                    results[name]["lsp_attach_ms"] = self._summarize(attach) if attach else None
+                    results[name]["lsp_attach_timeouts"] = len(startup) - len(attach)
+                print(f"[nvim-release] bench {name}: {results[name]}", flush=True)
+        return {"runs": runs, "cases": results}
+
+    @staticmethod
+    def _release_startup(release: Path | None) -> dict | None:
+        if release is None:
+            return None
+        try:
+            return json.loads((release / "manifest.json").read_text(encoding="utf-8")).get("startup")
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def startup_regressions(self, candidate: dict, current: dict | None) -> list[str]:
+        """Compare p50 timings case by case; small absolute changes are noise."""
+        if not current:
+            return []
+        regressions = []
+        for name, result in candidate["cases"].items():
+            baseline = current.get("cases", {}).get(name)
+            if not baseline:
+                continue
+            for metric in ("startup_ms", "lsp_attach_ms"):
+                before = (baseline.get(metric) or {}).get("p50")
+                after = (result.get(metric) or {}).get("p50")
+                if before is None or after is None:
+                    continue
+                if after > before * (1 + self.bench_threshold) and after - before >= BENCH_MIN_REGRESSION_MS:
+                    regressions.append(f"{name} {metric} p50 {before:.1f} -> {after:.1f}")
+        return regressions
+
     def _write_manifest(self, release: Path, *, verified: bool, activated: bool, imported: bool = False) -> None:
+        import datetime as dt
+        import subprocess
+
         commit = subprocess.run(
             ["git", "-C", str(self.repo_root), "rev-parse", "HEAD"],
             check=True,
@@ -412,33 +1541,85 @@ class ReleaseInstaller:
             "verification": {"candidate": verified, "activation_smoke": activated},
             "imported_legacy": imported,
         }
+        if self.archive_sha256 and not imported:
+            manifest["archive_sha256"] = self.archive_sha256
+        if self.startup is not None and not imported:
+            manifest["startup"] = self.startup
+        if self.reuse is not None and not imported:
+            manifest["reuse"] = self.reuse
+            manifest["store_refs"] = sorted(self.store_refs)
         temp = release / "manifest.json.tmp"
         temp.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8")
         temp.replace(release / "manifest.json")
 
+    def _release_binaries(self) -> dict[tuple[int, int], str]:
+        binaries: dict[tuple[int, int], str] = {}
+        for binary in (self.old_current / "nvim/bin/nvim" if self.old_current else None, self.legacy_binary):
+            if binary is None:
+                continue
+            with contextlib.suppress(OSError):
+                info = os.stat(binary)
+                binaries[(info.st_dev, info.st_ino)] = binary.name
+        return binaries
+
+    def _registered_pids(self) -> list[int]:
+        """Return launcher-registered PIDs that are still alive, pruning the rest."""
+        pids: list[int] = []
+        with contextlib.suppress(FileNotFoundError), os.scandir(self.pid_registry) as scan:
+            for entry in scan:
+                if not entry.name.isdigit():
+                    continue
+                if os.path.exists(os.path.join(self.proc_root, entry.name)):
+                    pids.append(int(entry.name))
+                else:
+                    with contextlib.suppress(OSError):
+                        os.unlink(entry.path)
+        return pids
+
     def _active_release_processes(self) -> list[int]:
-        needles = set()
-        if self.old_current:
-            needles.add(str((self.old_current / "nvim/bin/nvim").resolve()))
-        if self.legacy_binary:
-            needles.add(str(self.legacy_binary.resolve()))
-        if not needles:
+        """Find processes running the current (or legacy) Neovim binary.
+
+        Only processes whose ``comm`` names the binary are looked at, and
+        their ``exe`` is compared by device and inode instead of resolved
+        path, so a /proc with tens of thousands of entries costs one small
+        read per process. In ``registry`` mode only the PIDs recorded by the
+        launcher are checked.
+        """
+        binaries = self._release_binaries()
+        registered = self._registered_pids()
+        if not binaries:
             return []
+        if self.process_detection == "registry":
+            candidates = registered
+        else:
+            with os.scandir(self.proc_root) as scan:
+                candidates = [int(entry.name) for entry in scan if entry.name.isdigit()]
+        # comm is the executable name truncated to 15 bytes.
+        names = {b"nvim"} | {os.fsencode(name)[:15] for name in binaries.values()}
         processes: list[int] = []
-        proc_root = Path("/proc")
-        for entry in proc_root.iterdir():
-            if not entry.name.isdigit() or int(entry.name) == os.getpid():
+        for pid in candidates:
+            if pid == os.getpid():
                 continue
+            base = f"{self.proc_root}/{pid}"
             try:
-                executable = (entry / "exe").resolve()
+                descriptor = os.open(base + "/comm", os.O_RDONLY)
+                try:
+                    comm = os.read(descriptor, 64).rstrip(b"\n")
+                finally:
+                    os.close(descriptor)
+                if comm not in names:
+                    continue
+                info = os.stat(base + "/exe")
             except OSError:
                 continue
-            if str(executable) in needles:
-                processes.append(int(entry.name))
-        return processes
+            if (info.st_dev, info.st_ino) in binaries:
+                processes.append(pid)
+        return sorted(processes)
 
     @staticmethod
     def _atomic_link(link: Path, target: Path | None) -> None:
+        import uuid
+
         if target is None:
             link.unlink(missing_ok=True)
             return
@@ -448,6 +1629,8 @@ class ReleaseInstaller:
         temporary.replace(link)
 
     def _install_launcher(self) -> None:
+        import uuid
+
         source = self.repo_root / "install-script/nvim/nvim-launcher"
         self.launcher.parent.mkdir(parents=True, exist_ok=True)
         if self.launcher.is_symlink():
@@ -508,11 +1691,106 @@ class ReleaseInstaller:
         previous = self._read_link(self.previous_link)
         if previous:
             keep.add(previous)
+        # Renaming into trash/ is instant; the reaper deletes after the lock is gone.
         for release in self.releases_dir.iterdir():
-            if release not in keep and release.name.endswith(".candidate"):
-                shutil.rmtree(release)
-            elif release not in keep and release.is_dir():
-                shutil.rmtree(release)
+            if release not in keep and release.is_dir():
+                self._trash(release)
+        self.collect_store(keep)
+        kept_logs = {self.build_log_dir(release).name for release in keep}
+        for log_dir in self.build_logs_dir.iterdir() if self.build_logs_dir.is_dir() else []:
+            if log_dir.name not in kept_logs:
+                shutil.rmtree(log_dir)
+
+    def _trash(self, path: Path) -> None:
+        import uuid
+
+        self.trash_dir.mkdir(parents=True, exist_ok=True)
+        path.rename(self.trash_dir / f"{path.name}.{uuid.uuid4().hex[:8]}")
+
+    def reap_trash(self, *, bytes_per_second: int = 0, quiet: bool = False) -> int:
+        """Delete everything in trash/, freeing at most ``bytes_per_second`` when set.
+
+        Only one reaper works at a time; a second one returns immediately.
+        Returns the number of bytes freed.
+        """
+        import time
+
+        if not self.trash_dir.is_dir():
+            return 0
+        with (self.trash_dir / ".reaper.lock").open("a+", encoding="utf-8") as handle:
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                if not quiet:
+                    print("[nvim-release] another reaper is already emptying the trash", flush=True)
+                return 0
+            freed = 0
+            started = time.monotonic()
+
+            def remove(path: str, *, directory: bool = False) -> None:
+                nonlocal freed
+                if directory:
+                    os.rmdir(path)
+                    return
+                freed += os.lstat(path).st_blocks * 512
+                os.unlink(path)
+                if bytes_per_second:
+                    ahead = freed / bytes_per_second - (time.monotonic() - started)
+                    if ahead > 0:
+                        time.sleep(ahead)
+
+            # Loop until empty: installs may add entries while we work.
+            while entries := [entry for entry in os.scandir(self.trash_dir) if not entry.name.startswith(".")]:
+                for entry in entries:
+                    if entry.is_symlink() or not entry.is_dir():
+                        remove(entry.path)
+                        continue
+                    for directory, dirs, files in os.walk(entry.path, topdown=False):
+                        # Read-only trees (Go module caches in Mason packages) need write permission first.
+                        os.chmod(directory, 0o700)
+                        for name in files:
+                            remove(os.path.join(directory, name))
+                        for name in dirs:
+                            path = os.path.join(directory, name)
+                            remove(path, directory=not os.path.islink(path))
+                    remove(entry.path, directory=True)
+        if not quiet:
+            print(f"[nvim-release] trash emptied: {freed / 1024 / 1024:.1f} MiB freed", flush=True)
+        return freed
+
+    def schedule_reaper(self) -> None:
+        """Empty the trash in a detached, low-priority, rate-limited child process."""
+        import subprocess
+
+        if os.environ.get("HPF_NVIM_GC") == "0" or not self.trash_dir.is_dir():
+            return
+        if not any(not name.startswith(".") for name in os.listdir(self.trash_dir)):
+            return
+        command = ["nice", "-n", "19"] if shutil.which("nice") else []
+        if shutil.which("ionice"):
+            command += ["ionice", "-c", "3"]
+        command += [
+            sys.executable,
+            str(Path(__file__).resolve()),
+            "gc",
+            "--release-root",
+            str(self.release_root),
+            "--home",
+            str(self.home),
+            "--rate",
+            str(self.gc_rate),
+            "--quiet",
+        ]
+        try:
+            subprocess.Popen(
+                command,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True,
+            )
+        except OSError as error:
+            print(f"[nvim-release] could not start the trash reaper: {error}", file=sys.stderr, flush=True)
 
     def install(self) -> Path:
         with self.lock():
@@ -528,35 +1806,146 @@ class ReleaseInstaller:
                 self.verify_candidate(candidate)
                 active = self.activate(candidate)
                 self.cleanup_old_releases(active)
-                return active
             except Exception:
                 if self.candidate and self.candidate.exists() and self.candidate.name.endswith(".candidate"):
                     shutil.rmtree(self.candidate)
                 if created_config_link and self.config_link.is_symlink():
                     self.config_link.unlink()
                 raise
+        self.schedule_reaper()
+        return active
+
+
+def bench_process_detection(processes: int, sessions: int, rounds: int = 3) -> dict[str, float]:
+    """Time active-process detection against a synthetic /proc with ``processes`` entries."""
+    import tempfile
+    import time
+
+    with tempfile.TemporaryDirectory(prefix="nvim-proc-bench-") as temporary:
+        root = Path(temporary)
+        binary = root / "release/nvim/bin/nvim"
+        other = root / "usr/bin/bash"
+        for executable in (binary, other):
+            executable.parent.mkdir(parents=True)
+            executable.write_text("", encoding="utf-8")
+        installer = ReleaseInstaller(root, root, release_root=root / "nvim")
+        installer.old_current = root / "release"
+        installer.legacy_binary = None
+        installer.proc_root = root / "proc"
+        installer.pid_registry.mkdir(parents=True)
+        for pid in range(1000, 1000 + processes):
+            entry = installer.proc_root / str(pid)
+            entry.mkdir(parents=True)
+            session = pid < 1000 + sessions
+            (entry / "comm").write_text("nvim\n" if session else "bash\n", encoding="utf-8")
+            (entry / "exe").symlink_to(binary if session else other)
+            if session:
+                (installer.pid_registry / str(pid)).touch()
+
+        def resolve_every_exe() -> list[int]:
+            # The previous detector: resolve every exe link and compare paths.
+            needle = str(binary.resolve())
+            found = []
+            for entry in installer.proc_root.iterdir():
+                if entry.name.isdigit() and str((entry / "exe").resolve()) == needle:
+                    found.append(int(entry.name))
+            return found
+
+        def detect(mode: str) -> Callable[[], list[int]]:
+            def run() -> list[int]:
+                installer.process_detection = mode
+                return installer._active_release_processes()
+
+            return run
+
+        results: dict[str, float] = {}
+        for name, function in (("resolve", resolve_every_exe), ("scan", detect("scan")), ("registry", detect("registry"))):
+            best = float("inf")
+            for _ in range(rounds):
+                started = time.perf_counter()
+                found = function()
+                best = min(best, time.perf_counter() - started)
+            if len(found) != sessions:
+                raise ReleaseError(f"{name} detector found {len(found)} of {sessions} sessions")
+            results[name] = round(best * 1000, 2)
+        return results
 
 
 def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser()
-    parser.add_argument("command", choices=("install", "preflight"), nargs="?", default="install")
+    parser.add_argument(
+        "command",
+        choices=("install", "preflight", "mirror", "gc", "bench", "bench-processes"),
+        nargs="?",
+        default="install",
+    )
+    parser.add_argument("action", choices=("status", "refresh"), nargs="?", help="mirror action (default: status)")
     parser.add_argument("--repo-root", type=Path, default=Path(__file__).resolve().parents[2])
     parser.add_argument("--home", type=Path, default=Path.home())
     parser.add_argument("--release-root", type=Path)
     parser.add_argument("--skip-external-tools", action="store_true")
     parser.add_argument("--skip-download", action="store_true")
+    parser.add_argument("--offline", action="store_true", help="never download; use the archive cache or --mirror")
+    parser.add_argument("--mirror", type=Path, help=f"directory holding {NEOVIM_ARCHIVE} (optionally under <version>/)")
+    parser.add_argument("--archive-sha256", help="expected SHA-256 of the Neovim archive")
+    parser.add_argument("--no-reuse", action="store_true", help="build plugins, Mason packages and parsers from scratch")
+    parser.add_argument("--build-jobs", type=int, help="Mason/parser build phases to run at once (default: 2)")
+    parser.add_argument("--plugin-mirror", type=Path, help="bare-repo plugin mirror (default: <release-root>/plugin-mirror)")
+    parser.add_argument("--processes", type=int, default=20000, help="bench-processes: synthetic /proc size")
+    parser.add_argument("--bench-runs", type=int, help="startup benchmark iterations per case (default: 5, 0 disables)")
+    parser.add_argument("--release", type=Path, help="bench: release directory to measure (default: current)")
+    parser.add_argument("--rate", type=int, default=0, help="gc: bytes per second to delete (default: unlimited)")
+    parser.add_argument("--quiet", action="store_true", help="gc: print nothing")
     args = parser.parse_args(argv)
-    installer = ReleaseInstaller(
-        args.repo_root,
-        args.home,
-        release_root=args.release_root,
-        skip_external_tools=args.skip_external_tools,
-        skip_download=args.skip_download,
-    )
+    if args.action and args.command != "mirror":
+        parser.error(f"unexpected argument for {args.command}: {args.action}")
+    import subprocess
+
+    if args.command == "bench-processes":
+        results = bench_process_detection(args.processes, sessions=3)
+        for name, milliseconds in results.items():
+            print(f"{name:10} {milliseconds:>10.2f} ms  ({args.processes} processes)")
+        return 0
+
     try:
+        installer = ReleaseInstaller(
+            args.repo_root,
+            args.home,
+            release_root=args.release_root,
+            skip_external_tools=args.skip_external_tools,
+            skip_download=args.skip_download,
+            offline=args.offline,
+            mirror=args.mirror,
+            archive_sha256=args.archive_sha256,
+            reuse=not args.no_reuse,
+            build_jobs=args.build_jobs,
+            plugin_mirror=args.plugin_mirror,
+            bench_runs=args.bench_runs,
+        )
         if args.command == "preflight":
             with installer.lock():
                 installer.preflight()
+        elif args.command == "bench":
+            release = (args.release or installer.current_link).resolve()
+            report = installer.benchmark_release(release, installer.bench_runs or 5)
+            print(json.dumps(report, indent=2, sort_keys=True))
+            regressions = installer.startup_regressions(report, installer._release_startup(release))
+            for regression in regressions:
+                print(f"[nvim-release] slower than recorded: {regression}", file=sys.stderr)
+            return 1 if regressions else 0
+        elif args.command == "gc":
+            installer.reap_trash(bytes_per_second=max(0, args.rate), quiet=args.quiet)
+        elif args.command == "mirror" and args.action == "refresh":
+            with installer.lock():
+                failures = installer.refresh_mirror()
+            for failure in failures:
+                print(f"nvim release error: {failure}", file=sys.stderr)
+            return 1 if failures else 0
+        elif args.command == "mirror":
+            status = installer.mirror_status()
+            for name, state in status.items():
+                print(f"{state:15} {name}")
+            return 0 if all(state == "ok" for state in status.values()) else 1
         else:
             active = installer.install()
             print(f"Neovim {NEOVIM_VERSION} release activated: {active}")
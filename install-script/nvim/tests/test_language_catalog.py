@@ -2,7 +2,11 @@ from __future__ import annotations
 
 import copy
 import importlib.util
+import io
 import json
+import os
+import shutil
+import tempfile
 import unittest
 from pathlib import Path
 from unittest import mock
@@ -72,19 +76,382 @@ class LanguageCatalogTest(unittest.TestCase):
 
     def test_versioned_tool_is_only_satisfied_by_requested_version(self) -> None:
         tool = {"command": "stylua", "version": "2.5.2", "version_args": ["--version"]}
-        with mock.patch.object(language_catalog.shutil, "which", return_value="/bin/stylua"), mock.patch.object(
-            language_catalog.subprocess,
-            "run",
+        with mock.patch.object(language_catalog.shutil, "which", return_value="/bin/stylua"), mock.patch(
+            "subprocess.run",
             return_value=mock.Mock(returncode=0, stdout="stylua 2.5.2\n", stderr=""),
         ):
             self.assertTrue(language_catalog.tool_satisfied(tool))
-        with mock.patch.object(language_catalog.shutil, "which", return_value="/bin/stylua"), mock.patch.object(
-            language_catalog.subprocess,
-            "run",
+        with mock.patch.object(language_catalog.shutil, "which", return_value="/bin/stylua"), mock.patch(
+            "subprocess.run",
             return_value=mock.Mock(returncode=0, stdout="stylua 2.4.0\n", stderr=""),
         ):
             self.assertFalse(language_catalog.tool_satisfied(tool))
 
+    def test_version_probe_is_cached_by_binary_fingerprint(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary:
+            root = Path(temporary)
+            binary = root / "fmt"
+            calls = root / "calls"
+            binary.write_text(f"#!/bin/sh\necho x >> {calls}\necho 'fmt 1.2.0'\n", encoding="utf-8")
+            binary.chmod(0o755)
+            tool = {"id": "fmt", "command": str(binary), "version": "1.2.0"}
+            cache_path = root / "probes.json"
+            for _ in range(2):
+                cache = language_catalog.ProbeCache(cache_path)
+                self.assertEqual(language_catalog.unsatisfied_tools([tool], cache=cache), set())
+            self.assertEqual(len(calls.read_text().splitlines()), 1)
+
+            binary.write_text(f"#!/bin/sh\necho x >> {calls}\necho 'fmt 1.3.0 (upgraded)'\n", encoding="utf-8")
+            cache = language_catalog.ProbeCache(cache_path)
+            self.assertEqual(language_catalog.unsatisfied_tools([tool], cache=cache), {"fmt"})
+            self.assertEqual(len(calls.read_text().splitlines()), 2)
+            cache.save()
+
+            # Same size, mtime restored: only the inode or ctime can tell.
+            for swap in (False, True):
+                stat = binary.stat()
+                content = f"#!/bin/sh\necho x >> {calls}\necho 'fmt 1.{2 if swap else 4}.0 (upgraded)'\n"
+                target = root / "fmt.new" if swap else binary
+                target.write_text(content, encoding="utf-8")
+                target.chmod(0o755)
+                if swap:
+                    target.replace(binary)
+                os.utime(binary, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+                self.assertEqual(binary.stat().st_size, stat.st_size)
+                cache = language_catalog.ProbeCache(cache_path)
+                expected = set() if swap else {"fmt"}
+                self.assertEqual(language_catalog.unsatisfied_tools([tool], cache=cache), expected)
+                cache.save()
+            self.assertEqual(len(calls.read_text().splitlines()), 4)
+
+    def test_satisfaction_pass_runs_probes_concurrently(self) -> None:
+        import threading
+
+        barrier = threading.Barrier(3, timeout=5)
+
+        def probe(command: str, version_args: list[str]) -> tuple[int, str]:
+            barrier.wait()
+            return 0, "tool 1.0" if command.endswith("good") else "tool 0.9"
+
+        tools = [
+            {"id": name, "command": name, "version": "1.0"} for name in ("a-good", "b-good", "c-bad")
+        ]
+        with mock.patch.object(language_catalog.shutil, "which", side_effect=lambda name: f"/bin/{name}"), mock.patch.object(
+            language_catalog, "_run_version_probe", side_effect=probe
+        ):
+            self.assertEqual(language_catalog.unsatisfied_tools(tools, jobs=3), {"c-bad"})
+
+    def test_bad_probe_jobs_names_the_variable(self) -> None:
+        tools = [{"id": "fmt", "command": "fmt", "version": "1.0"}]
+        for value in ("many", "0"):
+            with self.subTest(value=value), mock.patch.dict("os.environ", {"HPF_TOOL_PROBE_JOBS": value}):
+                with self.assertRaisesRegex(language_catalog.CatalogError, "HPF_TOOL_PROBE_JOBS must be"):
+                    language_catalog.unsatisfied_tools(tools)
+
+    def run_install(self, run, which) -> None:
+        with mock.patch.object(language_catalog, "_run", side_effect=run), mock.patch.object(
+            language_catalog.shutil, "which", side_effect=which
+        ), mock.patch.object(
+            language_catalog, "unsatisfied_tools", side_effect=lambda tools, **_: {tool["id"] for tool in tools}
+        ), mock.patch.dict("os.environ", {"HPF_CARGO_JOBS": "8", "HPF_CARGO_PARALLEL": "2"}):
+            language_catalog.install_external_tools(self.catalog)
+
+    def test_owner_batches_run_concurrently_after_apt(self) -> None:
+        import threading
+
+        barrier = threading.Barrier(2, timeout=5)
+        commands: list[tuple[str, list[str]]] = []
+
+        def run(command: list[str], env=None, *, label=None) -> None:
+            commands.append((label, command))
+            if label != "apt":
+                barrier.wait()
+
+        self.run_install(run, lambda name, path=None: None if name == "sccache" else f"/usr/bin/{name}")
+        self.assertEqual(commands[0][0], "apt")
+        self.assertEqual(sorted(label for label, _ in commands[1:]), ["cargo:locked", "npm"])
+        cargo = next(command for label, command in commands if label == "cargo:locked")
+        # One invocation for both locked crates, so it gets the whole -j budget.
+        self.assertEqual(
+            cargo, ["cargo", "install", "tree-sitter-cli@0.26.9", "stylua@2.5.2", "--locked", "-j", "8"]
+        )
+
+    def test_npm_and_cargo_wait_for_apt_even_when_installed(self) -> None:
+        order: list[str] = []
+
+        def run(command: list[str], env=None, *, label=None) -> None:
+            order.append(label)
+
+        self.run_install(run, lambda name, path=None: f"/usr/bin/{name}")
+        self.assertLess(order.index("apt"), order.index("npm"))
+        self.assertLess(order.index("apt"), order.index("cargo:locked"))
+
+    def test_failed_apt_batch_skips_dependent_owners(self) -> None:
+        for missing in (("npm", "cargo"), ()):
+            order: list[str] = []
+
+            def run(command: list[str], env=None, *, label=None) -> None:
+                order.append(label)
+                if label == "apt":
+                    raise language_catalog.CatalogError("command failed with exit code 100: sudo apt-get")
+
+            with self.subTest(missing=missing), self.assertRaisesRegex(language_catalog.CatalogError, "exit code 100"):
+                self.run_install(run, lambda name, path=None: None if name in missing else f"/usr/bin/{name}")
+            self.assertEqual(order, ["apt"])
+
+    def test_cargo_job_budget_validates_its_settings(self) -> None:
+        with mock.patch.dict("os.environ", {"HPF_CARGO_JOBS": "8", "HPF_CARGO_PARALLEL": "3"}):
+            self.assertEqual(language_catalog.cargo_job_budget(2), (2, 4))
+        for name, value in (("HPF_CARGO_JOBS", "eight"), ("HPF_CARGO_JOBS", "0"), ("HPF_CARGO_PARALLEL", "2.5")):
+            with self.subTest(name=name, value=value), mock.patch.dict("os.environ", {name: value}):
+                with self.assertRaisesRegex(language_catalog.CatalogError, f"{name} must be"):
+                    language_catalog.cargo_job_budget(2)
+
+    def test_cargo_failure_stops_remaining_batches(self) -> None:
+        started: list[str] = []
+
+        def run(command: list[str], env=None, *, label=None) -> None:
+            started.append(label)
+            if label == "cargo:locked":
+                raise language_catalog.CatalogError("command failed with exit code 101: cargo install")
+
+        with mock.patch.dict("os.environ", {"HPF_CARGO_PARALLEL": "1"}), self.assertRaisesRegex(
+            language_catalog.CatalogError, "exit code 101"
+        ), mock.patch.object(language_catalog, "_run", side_effect=run):
+            language_catalog._install_cargo_tools(
+                [
+                    {"id": "tree-sitter", "package": "tree-sitter-cli", "locked": True},
+                    {"id": "stylua", "package": "stylua"},
+                ],
+                {},
+            )
+        self.assertEqual(started, ["cargo:locked"])
+
+    def test_cargo_batches_group_by_locked_and_pin_versions(self) -> None:
+        batches = language_catalog.cargo_batches(
+            [
+                {"package": "tree-sitter-cli", "version": "0.26.9", "locked": True},
+                {"package": "taplo-cli"},
+                {"package": "stylua", "version": "2.5.2", "locked": True},
+            ]
+        )
+        self.assertEqual(batches, {"locked": ["tree-sitter-cli@0.26.9", "stylua@2.5.2"], "resolved": ["taplo-cli"]})
+
+    def test_cargo_builds_share_persistent_target_dir_and_sccache(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary:
+            root = Path(temporary)
+            (root / "bin").mkdir()
+            sccache = root / "bin/sccache"
+            sccache.write_text("#!/bin/sh\n", encoding="utf-8")
+            sccache.chmod(0o755)
+            with mock.patch.object(language_catalog.Path, "home", return_value=root):
+                env = language_catalog.cargo_build_env({"PATH": str(root / "bin")}, "locked")
+                data = root / ".local/share/hpf-linux-config/cargo"
+                self.assertEqual(env["CARGO_TARGET_DIR"], str(data / "target/locked"))
+                self.assertEqual(env["RUSTC_WRAPPER"], str(sccache))
+                self.assertEqual(env["SCCACHE_DIR"], str(data / "sccache"))
+                disabled = language_catalog.cargo_build_env(
+                    {"PATH": str(root / "bin"), "HPF_CARGO_SCCACHE": "0", "CARGO_TARGET_DIR": "/srv/target"}, "resolved"
+                )
+        self.assertNotIn("RUSTC_WRAPPER", disabled)
+        self.assertEqual(disabled["CARGO_TARGET_DIR"], "/srv/target/resolved")
+
+    def release_fixture(self, root: Path, asset: str, payload: bytes) -> dict:
+        import hashlib
+
+        served = root / "www/JohnnyMorganz/StyLua/releases/download/v2.5.2"
+        served.mkdir(parents=True)
+        (served / asset).write_bytes(payload)
+        return {
+            "id": "stylua",
+            "command": "stylua",
+            "owner": "github_release",
+            "package": "JohnnyMorganz/StyLua",
+            "version": "2.5.2",
+            "asset": asset,
+            "sha256": hashlib.sha256(payload).hexdigest(),
+        }
+
+    def serve(self, directory: Path) -> tuple[str, list[str]]:
+        import functools
+        import http.server
+        import threading
+
+        requests: list[str] = []
+
+        class Handler(http.server.SimpleHTTPRequestHandler):
+            def log_message(self, *args) -> None:
+                requests.append(self.path)
+
+        server = http.server.ThreadingHTTPServer(
+            ("127.0.0.1", 0), functools.partial(Handler, directory=str(directory))
+        )
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return f"http://127.0.0.1:{server.server_port}", requests
+
+    @staticmethod
+    def zip_payload(members: dict[str, bytes]) -> bytes:
+        import zipfile
+
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as bundle:
+            for name, data in members.items():
+                bundle.writestr(name, data)
+        return buffer.getvalue()
+
+    def test_github_release_binary_is_downloaded_verified_and_cached(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary:
+            root = Path(temporary)
+            payload = self.zip_payload({"stylua-linux/stylua": b"#!/bin/sh\necho 'stylua 2.5.2'\n", "README": b"docs"})
+            tool = self.release_fixture(root, "stylua-linux-x86_64.zip", payload)
+            base, requests = self.serve(root / "www")
+            environment = {"HPF_GITHUB_RELEASE_BASE": base, "HPF_GITHUB_RELEASE_BIN": str(root / "bin")}
+            with mock.patch.object(language_catalog.Path, "home", return_value=root), mock.patch.dict(
+                "os.environ", environment
+            ):
+                target = language_catalog.install_release_binary(tool)
+                self.assertEqual(target, root / "bin/stylua")
+                self.assertTrue(os.access(target, os.X_OK))
+                self.assertEqual(target.read_bytes(), b"#!/bin/sh\necho 'stylua 2.5.2'\n")
+                self.assertEqual(requests, ["/JohnnyMorganz/StyLua/releases/download/v2.5.2/stylua-linux-x86_64.zip"])
+
+                target.unlink()
+                language_catalog.install_release_binary(tool)
+                self.assertTrue(target.is_file())
+                self.assertEqual(len(requests), 1)
+            self.assertEqual(sorted(path.name for path in (root / "bin").iterdir()), ["stylua"])
+
+    def test_github_release_checksum_mismatch_installs_nothing(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary:
+            root = Path(temporary)
+            tool = self.release_fixture(root, "stylua", b"tampered")
+            tool["sha256"] = "0" * 64
+            base, _ = self.serve(root / "www")
+            environment = {"HPF_GITHUB_RELEASE_BASE": base, "HPF_GITHUB_RELEASE_BIN": str(root / "bin")}
+            with mock.patch.object(language_catalog.Path, "home", return_value=root), mock.patch.dict(
+                "os.environ", environment
+            ), self.assertRaisesRegex(language_catalog.CatalogError, "sha256 mismatch"):
+                language_catalog.install_release_binary(tool)
+            self.assertFalse((root / "bin/stylua").exists())
+            cache = root / ".local/share/hpf-linux-config/downloads/github-release"
+            self.assertEqual(list(cache.rglob("*.*")), [])
+
+    def test_github_release_offline_uses_mirror(self) -> None:
+        import gzip
+
+        with tempfile.TemporaryDirectory() as temporary:
+            root = Path(temporary)
+            tool = self.release_fixture(root, "stylua-{version}.gz", gzip.compress(b"binary"))
+            mirror = root / "mirror/JohnnyMorganz/StyLua/v2.5.2"
+            mirror.mkdir(parents=True)
+            shutil.copyfile(root / "www/JohnnyMorganz/StyLua/releases/download/v2.5.2/stylua-{version}.gz", mirror / "stylua-2.5.2.gz")
+            environment = {"HPF_GITHUB_RELEASE_OFFLINE": "1", "HPF_GITHUB_RELEASE_BIN": str(root / "bin")}
+            with mock.patch.object(language_catalog.Path, "home", return_value=root), mock.patch.dict(
+                "os.environ", environment
+            ):
+                with self.assertRaisesRegex(language_catalog.CatalogError, "offline mode"):
+                    language_catalog.install_release_binary(tool)
+                with mock.patch.dict("os.environ", {"HPF_GITHUB_RELEASE_MIRROR": str(root / "mirror")}):
+                    language_catalog.install_release_binary(tool)
+            self.assertEqual((root / "bin/stylua").read_bytes(), b"binary")
+
+    def test_github_release_concurrent_fetches_use_separate_partials(self) -> None:
+        import threading
+
+        with tempfile.TemporaryDirectory() as temporary:
+            root = Path(temporary)
+            tool = self.release_fixture(root, "stylua", b"binary")
+            mirror = root / "mirror"
+            mirror.mkdir()
+            shutil.copyfile(root / "www/JohnnyMorganz/StyLua/releases/download/v2.5.2/stylua", mirror / "stylua")
+            barrier = threading.Barrier(2, timeout=5)
+            partials: list[str] = []
+            copyfile = shutil.copyfile
+
+            def overlapping_copy(source, destination):
+                # Both threads are mid-copy before either one publishes.
+                partials.append(Path(destination).name)
+                copyfile(source, destination)
+                barrier.wait()
+                return destination
+
+            results: list[Path] = []
+            environment = {"HPF_GITHUB_RELEASE_MIRROR": str(mirror)}
+            with mock.patch.object(language_catalog.Path, "home", return_value=root), mock.patch.dict(
+                "os.environ", environment
+            ), mock.patch.object(language_catalog.shutil, "copyfile", side_effect=overlapping_copy):
+                threads = [
+                    threading.Thread(target=lambda: results.append(language_catalog.fetch_release_asset(tool)))
+                    for _ in range(2)
+                ]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+            self.assertEqual(len(set(partials)), 2)
+            self.assertEqual(len(results), 2)
+            self.assertEqual({path.read_bytes() for path in results}, {b"binary"})
+
+    def test_github_release_tool_requires_checksum(self) -> None:
+        catalog = copy.deepcopy(self.catalog)
+        catalog["tools"].append(
+            {"id": "taplo", "command": "taplo", "owner": "github_release", "package": "tamasfe/taplo", "version": "0.9.3", "asset": "taplo.gz"}
+        )
+        with self.assertRaisesRegex(language_catalog.CatalogError, "github_release sha256"):
+            language_catalog.validate_catalog(catalog)
+
+    def test_failed_command_is_reported_as_catalog_error(self) -> None:
+        with self.assertRaisesRegex(language_catalog.CatalogError, "exit code 3"):
+            language_catalog._run(["sh", "-c", "exit 3"])
+
+    def test_labelled_command_output_is_prefixed_with_owner(self) -> None:
+        with mock.patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            with self.assertRaisesRegex(language_catalog.CatalogError, "exit code 4"):
+                language_catalog._run(["sh", "-c", "echo fetching; echo broken >&2; exit 4"], label="npm")
+        self.assertIn("[language-catalog:npm] fetching\n", stdout.getvalue())
+        self.assertIn("[language-catalog:npm] broken\n", stdout.getvalue())
+
+    FAKE_NVIM = """#!/usr/bin/env python3
+import json, os, sys
+fixture = json.load(open(os.environ["HPF_BENCH_FIXTURE"]))
+if fixture["filename"].endswith(".sh"):
+    sys.stderr.write("E5108: probe failed\\n")
+    sys.exit(1)
+result = {
+    "filetype": fixture["language"],
+    "lsp_attach_ms": 120.0 if fixture["lsp_name"] else None,
+    "first_diagnostic_ms": 150.0,
+    "formatters": {entry["name"]: 8.0 for entry in fixture["formatters"]} or [],
+    "linters": [],
+    "errors": [],
+}
+json.dump({key: value for key, value in result.items() if value is not None}, open(os.environ["HPF_BENCH_OUTPUT"], "w"))
+"""
+
+    def test_bench_reports_toolchain_latency_per_fixture(self) -> None:
+        with tempfile.TemporaryDirectory() as temporary:
+            nvim = Path(temporary) / "nvim"
+            nvim.write_text(self.FAKE_NVIM, encoding="utf-8")
+            nvim.chmod(0o755)
+            report = language_catalog.bench_catalog(
+                self.catalog, nvim=str(nvim), runs=2, jobs=3, languages=["lua", "shell", "json"]
+            )
+        fixtures = {item["language"]: item for item in report["fixtures"]}
+        self.assertEqual(set(fixtures), {"lua", "shell", "json"})
+        self.assertEqual(fixtures["lua"]["lsp_attach_ms"], {"p50": 120.0, "max": 120.0})
+        self.assertEqual(fixtures["lua"]["formatters"], {"stylua": {"p50": 8.0, "max": 8.0}})
+        self.assertEqual(fixtures["lua"]["first_diagnostic_ms"]["p50"], 150.0)
+        self.assertEqual(fixtures["lua"]["errors"], [])
+        self.assertEqual(fixtures["shell"]["errors"], ["E5108: probe failed"])
+        self.assertEqual(fixtures["shell"]["linters"], {"shellcheck": None})
+        self.assertIsNone(fixtures["shell"]["lsp_attach_ms"])
+
+    def test_bench_requires_neovim(self) -> None:
+        with self.assertRaisesRegex(language_catalog.CatalogError, "neovim executable not found"):
+            language_catalog.bench_catalog(self.catalog, nvim="/nonexistent/nvim")
+
 
 if __name__ == "__main__":
     unittest.main()
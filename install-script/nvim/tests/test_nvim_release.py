@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import errno
 import importlib.util
+import io
 import json
 import os
 import shutil
@@ -136,6 +138,52 @@ class NvimReleaseTest(unittest.TestCase):
             installer.activate(candidate)
         self.assertTrue(candidate.is_dir())
 
+    def make_proc(self, processes: dict[int, tuple[str, Path]]) -> Path:
+        proc = self.root / "proc"
+        for pid, (comm, exe) in processes.items():
+            (proc / str(pid)).mkdir(parents=True)
+            (proc / str(pid) / "comm").write_text(comm + "\n", encoding="utf-8")
+            (proc / str(pid) / "exe").symlink_to(exe)
+        return proc
+
+    def test_active_processes_are_matched_by_comm_and_inode(self) -> None:
+        old = self.make_release("old")
+        other = self.make_release("other")
+        installer = self.installer()
+        installer.old_current = old
+        installer.legacy_binary = None
+        installer.proc_root = self.make_proc(
+            {
+                10: ("nvim", old / "nvim/bin/nvim"),
+                11: ("nvim", other / "nvim/bin/nvim"),
+                12: ("bash", old / "nvim/bin/nvim"),
+                13: ("nvim", self.root / "gone"),
+            }
+        )
+        hardlink = self.root / "nvim-hardlink"
+        os.link(old / "nvim/bin/nvim", hardlink)
+        (installer.proc_root / "14").mkdir()
+        (installer.proc_root / "14/comm").write_text("nvim\n", encoding="utf-8")
+        (installer.proc_root / "14/exe").symlink_to(hardlink)
+        self.assertEqual(installer._active_release_processes(), [10, 14])
+
+    def test_registry_mode_checks_only_registered_sessions(self) -> None:
+        old = self.make_release("old")
+        installer = self.installer()
+        installer.old_current = old
+        installer.legacy_binary = None
+        installer.proc_root = self.make_proc({20: ("nvim", old / "nvim/bin/nvim"), 21: ("nvim", old / "nvim/bin/nvim")})
+        installer.pid_registry.mkdir(parents=True)
+        for pid in ("21", "99"):
+            (installer.pid_registry / pid).touch()
+        installer.process_detection = "registry"
+        self.assertEqual(installer._active_release_processes(), [21])
+        self.assertEqual(sorted(path.name for path in installer.pid_registry.iterdir()), ["21"])
+
+    def test_process_detection_benchmark_uses_a_synthetic_proc(self) -> None:
+        results = nvim_release.bench_process_detection(50, sessions=2, rounds=1)
+        self.assertEqual(set(results), {"resolve", "scan", "registry"})
+
     def test_activation_rebinds_existing_persistent_links(self) -> None:
         candidate = self.make_release("new.candidate")
         installer = self.installer()
@@ -169,17 +217,18 @@ class NvimReleaseTest(unittest.TestCase):
             package.add(archive_root / "nvim-linux-x86_64", arcname="nvim-linux-x86_64")
 
         commands: list[tuple[list[str], int | None]] = []
+        serve = self.serve(archive)
 
         def fake_run(command: list[str], *, env=None, timeout=None) -> None:
             commands.append((command, timeout))
-            if command[0] == "curl":
-                shutil.copy2(archive, Path(command[command.index("--output") + 1]))
+            serve(command)
 
         installer._run = fake_run
         installer._release_id = lambda: "download-test"
         candidate = installer.prepare_candidate()
 
-        curl, timeout = commands[0]
+        self.assertEqual([command[-1] for command, _timeout in commands[:2]], [nvim_release.NEOVIM_SHASUM_URL, nvim_release.NEOVIM_URL])
+        curl, timeout = commands[1]
         self.assertEqual(curl[0], "curl")
         self.assertIn("--retry-all-errors", curl)
         self.assertEqual(curl[curl.index("--retry") + 1], "5")
@@ -188,6 +237,234 @@ class NvimReleaseTest(unittest.TestCase):
         self.assertTrue((candidate / "nvim/bin/nvim").is_file())
         self.assertEqual((candidate / "lazy-lock.json").read_text(encoding="utf-8"), "{}")
 
+    def download_installer(self, **kwargs) -> nvim_release.ReleaseInstaller:
+        return nvim_release.ReleaseInstaller(
+            self.repo,
+            self.home,
+            release_root=self.release_root,
+            skip_external_tools=True,
+            **kwargs,
+        )
+
+    def make_archive(self, content: str = "binary") -> Path:
+        archive_root = self.root / f"archive-{content}"
+        binary = archive_root / "nvim-linux-x86_64/bin/nvim"
+        binary.parent.mkdir(parents=True)
+        binary.write_text(content, encoding="utf-8")
+        archive = self.root / f"{content}.tar.gz"
+        with tarfile.open(archive, "w:gz") as package:
+            package.add(archive_root / "nvim-linux-x86_64", arcname="nvim-linux-x86_64")
+        return archive
+
+    @staticmethod
+    def shasum_listing(digest: str) -> str:
+        return f"{'1' * 64}  nvim-linux-arm64.tar.gz\n{digest}  {nvim_release.NEOVIM_ARCHIVE}\n"
+
+    def serve(self, archive: Path, downloads: list[list[str]] | None = None, published: str | None = None):
+        """A fake ``_run`` answering the release's shasum.txt and archive downloads."""
+
+        def run(command: list[str], **kwargs) -> None:
+            if command[0] != "curl":
+                return
+            output = Path(command[command.index("--output") + 1])
+            if command[-1] == nvim_release.NEOVIM_SHASUM_URL:
+                output.write_text(self.shasum_listing(published or nvim_release.ReleaseInstaller._sha256(archive)), encoding="utf-8")
+                return
+            if downloads is not None:
+                downloads.append(command)
+            shutil.copy2(archive, output)
+
+        return run
+
+    def test_cached_archive_skips_the_network(self) -> None:
+        archive = self.make_archive()
+        downloads: list[list[str]] = []
+
+        first = self.download_installer()
+        first._run = self.serve(archive, downloads)
+        cached = first.fetch_archive()
+        digest = first._sha256(archive)
+        self.assertEqual(cached, self.release_root / "downloads" / nvim_release.NEOVIM_VERSION / digest / nvim_release.NEOVIM_ARCHIVE)
+        self.assertEqual(first.archive_sha256, digest)
+
+        # The published digest was recorded, so neither shasum.txt nor the archive is fetched again.
+        for second in (self.download_installer(archive_sha256=digest), self.download_installer()):
+            second._run = lambda command, **kwargs: self.fail(f"unexpected command: {command}")
+            self.assertEqual(second.fetch_archive(), cached)
+        self.assertEqual(len(downloads), 1)
+
+    def test_download_must_match_the_published_digest(self) -> None:
+        archive = self.make_archive()
+        installer = self.download_installer()
+        installer._run = self.serve(archive, published="0" * 64)
+        with self.assertRaisesRegex(nvim_release.ReleaseError, "sha256 mismatch: expected 0000"):
+            installer.fetch_archive()
+        version_dir = self.release_root / "downloads" / nvim_release.NEOVIM_VERSION
+        self.assertEqual([path.name for path in version_dir.iterdir()], ["published.sha256"])
+
+        # The recorded digest is reused, so a later run rejects the same archive without refetching shasum.txt.
+        refetched: list[list[str]] = []
+        retry = self.download_installer()
+        retry._run = self.serve(archive, refetched, published="f" * 64)
+        with self.assertRaisesRegex(nvim_release.ReleaseError, "sha256 mismatch: expected 0000"):
+            retry.fetch_archive()
+        self.assertEqual([command[-1] for command in refetched], [nvim_release.NEOVIM_URL])
+
+        unlisted = self.download_installer()
+        unlisted._run = lambda command, **kwargs: Path(command[command.index("--output") + 1]).write_text("", encoding="utf-8")
+        shutil.rmtree(version_dir)
+        with self.assertRaisesRegex(nvim_release.ReleaseError, "does not list"):
+            unlisted.fetch_archive()
+
+    def test_pinned_digest_mismatch_rejects_download(self) -> None:
+        archive = self.make_archive()
+        installer = self.download_installer(archive_sha256="0" * 64)
+        installer._run = lambda command, **kwargs: shutil.copy2(archive, Path(command[command.index("--output") + 1]))
+        with self.assertRaisesRegex(nvim_release.ReleaseError, "sha256 mismatch"):
+            installer.fetch_archive()
+        self.assertEqual([path.name for path in (self.release_root / "downloads").iterdir()], [])
+
+    def test_corrupt_cache_entry_is_discarded(self) -> None:
+        archive = self.make_archive()
+        installer = self.download_installer()
+        digest = installer._sha256(archive)
+        corrupt = self.release_root / "downloads" / nvim_release.NEOVIM_VERSION / digest / nvim_release.NEOVIM_ARCHIVE
+        corrupt.parent.mkdir(parents=True)
+        corrupt.write_bytes(b"truncated")
+        downloads: list[list[str]] = []
+        installer._run = self.serve(archive, downloads)
+        self.assertEqual(installer.fetch_archive(), corrupt)
+        self.assertEqual(len(downloads), 1)
+        self.assertEqual(installer._sha256(corrupt), digest)
+
+    def test_offline_mode_uses_mirror_and_never_downloads(self) -> None:
+        archive = self.make_archive()
+        mirror = self.root / "mirror" / nvim_release.NEOVIM_VERSION
+        mirror.mkdir(parents=True)
+        shutil.copy2(archive, mirror / nvim_release.NEOVIM_ARCHIVE)
+
+        def no_network(command: list[str], **kwargs) -> None:
+            self.fail(f"unexpected command: {command}")
+
+        installer = self.download_installer(offline=True, mirror=self.root / "mirror")
+        installer._run = no_network
+        with self.assertRaisesRegex(nvim_release.ReleaseError, "no published SHA-256"):
+            installer.fetch_archive()
+        (mirror / nvim_release.NEOVIM_SHASUM).write_text(self.shasum_listing(installer._sha256(archive)), encoding="utf-8")
+        cached = installer.fetch_archive()
+        self.assertEqual(installer._sha256(cached), installer._sha256(archive))
+
+        shutil.rmtree(self.release_root / "downloads")
+        offline = self.download_installer(offline=True)
+        offline._run = no_network
+        with self.assertRaisesRegex(nvim_release.ReleaseError, "offline mode"):
+            offline.fetch_archive()
+
+    def test_archive_streams_into_destination_with_prefix_stripped(self) -> None:
+        archive_root = self.root / "archive-links/nvim-linux-x86_64"
+        (archive_root / "bin").mkdir(parents=True)
+        (archive_root / "bin/nvim").write_text("binary", encoding="utf-8")
+        (archive_root / "share").mkdir()
+        (archive_root / "share/nvim-link").symlink_to("../bin/nvim")
+        os.link(archive_root / "bin/nvim", archive_root / "share/nvim-hard")
+        archive = self.root / "links.tar.gz"
+        with tarfile.open(archive, "w:gz") as package:
+            package.add(archive_root, arcname="nvim-linux-x86_64")
+        destination = self.root / "candidate/nvim"
+
+        digest = self.installer()._extract_archive(archive, destination)
+
+        self.assertEqual(digest, self.installer()._sha256(archive))
+        self.assertEqual((destination / "bin/nvim").read_text(encoding="utf-8"), "binary")
+        self.assertEqual(os.readlink(destination / "share/nvim-link"), "../bin/nvim")
+        self.assertEqual((destination / "share/nvim-hard").read_text(encoding="utf-8"), "binary")
+        self.assertFalse((self.root / "candidate/nvim-linux-x86_64").exists())
+
+    def test_archive_member_outside_prefix_is_rejected(self) -> None:
+        stray = self.root / "stray.txt"
+        stray.write_text("x", encoding="utf-8")
+        archive = self.root / "stray.tar.gz"
+        with tarfile.open(archive, "w:gz") as package:
+            package.add(stray, arcname="elsewhere/stray.txt")
+        with self.assertRaisesRegex(nvim_release.ReleaseError, "unexpected member"):
+            self.installer()._extract_archive(archive, self.root / "out")
+
+    def test_corrupt_cache_hit_is_detected_while_extracting(self) -> None:
+        archive = self.make_archive()
+        installer = self.download_installer()
+        digest = installer._sha256(archive)
+        cached = self.release_root / "downloads" / nvim_release.NEOVIM_VERSION / digest / nvim_release.NEOVIM_ARCHIVE
+        cached.parent.mkdir(parents=True)
+        shutil.copy2(self.make_archive("tampered"), cached)
+        installer.expected_sha256 = digest
+        downloads: list[list[str]] = []
+        installer._run = self.serve(archive, downloads)
+        installer._release_id = lambda: "corrupt-cache"
+        candidate = installer.prepare_candidate()
+
+        self.assertEqual(len(downloads), 1)
+        self.assertEqual((candidate / "nvim/bin/nvim").read_text(encoding="utf-8"), "binary")
+        self.assertEqual(installer._sha256(cached), digest)
+
+    def test_truncated_cache_hit_is_refetched(self) -> None:
+        archive = self.make_archive()
+        installer = self.download_installer()
+        digest = installer._sha256(archive)
+        cached = self.release_root / "downloads" / nvim_release.NEOVIM_VERSION / digest / nvim_release.NEOVIM_ARCHIVE
+        cached.parent.mkdir(parents=True)
+        cached.write_bytes(archive.read_bytes()[: archive.stat().st_size // 2])
+        installer.expected_sha256 = digest
+        downloads: list[list[str]] = []
+        installer._run = self.serve(archive, downloads)
+        installer._release_id = lambda: "truncated-cache"
+        candidate = installer.prepare_candidate()
+
+        self.assertEqual(len(downloads), 1)
+        self.assertEqual((candidate / "nvim/bin/nvim").read_text(encoding="utf-8"), "binary")
+        self.assertEqual(installer._sha256(cached), digest)
+
+    def make_tree(self) -> Path:
+        source = self.root / "tree"
+        (source / "bin").mkdir(parents=True)
+        (source / "bin/nvim").write_text("binary", encoding="utf-8")
+        (source / "bin/nvim").chmod(0o755)
+        (source / "share/skip").mkdir(parents=True)
+        (source / "share/runtime.vim").write_text("runtime", encoding="utf-8")
+        (source / "share/link").symlink_to("runtime.vim")
+        return source
+
+    def test_clone_tree_hardlinks_immutable_files_and_keeps_symlinks(self) -> None:
+        source = self.make_tree()
+        destination = self.root / "clone"
+        with mock.patch.object(nvim_release.fcntl, "ioctl", side_effect=OSError(errno.EOPNOTSUPP, "no reflink")):
+            counts = self.installer()._clone_tree(
+                source, destination, immutable=True, ignore=lambda _path, names: {"skip"} & set(names)
+            )
+        self.assertEqual(counts, {"reflink": 0, "hardlink": 2, "copy": 0})
+        self.assertEqual((destination / "bin/nvim").stat().st_ino, (source / "bin/nvim").stat().st_ino)
+        self.assertEqual(os.readlink(destination / "share/link"), "runtime.vim")
+        self.assertFalse((destination / "share/skip").exists())
+
+    def test_clone_tree_never_hardlinks_mutable_files(self) -> None:
+        source = self.make_tree()
+        destination = self.root / "clone"
+        with mock.patch.object(nvim_release.fcntl, "ioctl", side_effect=OSError(errno.EXDEV, "cross device")):
+            counts = self.installer()._clone_tree(source, destination)
+        self.assertEqual(counts, {"reflink": 0, "copy": 2})
+        self.assertNotEqual((destination / "bin/nvim").stat().st_ino, (source / "bin/nvim").stat().st_ino)
+        self.assertTrue(os.access(destination / "bin/nvim", os.X_OK))
+
+    def test_clone_tree_falls_back_to_copy_when_links_fail(self) -> None:
+        source = self.make_tree()
+        destination = self.root / "clone"
+        with mock.patch.object(nvim_release.fcntl, "ioctl", side_effect=OSError(errno.ENOTTY, "no ioctl")), mock.patch.object(
+            nvim_release.os, "link", side_effect=OSError(errno.EXDEV, "cross device")
+        ) as link:
+            counts = self.installer()._clone_tree(source, destination, immutable=True)
+        self.assertEqual(counts, {"reflink": 0, "hardlink": 0, "copy": 2})
+        self.assertEqual(link.call_count, 1)
+        self.assertEqual((destination / "share/runtime.vim").read_text(encoding="utf-8"), "runtime")
+
     def test_candidate_build_installs_from_plugin_lock_without_updating_it(self) -> None:
         candidate = self.make_release("new.candidate")
         installer = self.installer()
@@ -210,6 +487,408 @@ class NvimReleaseTest(unittest.TestCase):
         self.assertNotIn("+Lazy! restore", commands[1])
         self.assertEqual(installer._release_env(candidate)["HPF_NVIM_LOCKFILE"], str(candidate / "lazy-lock.json"))
 
+    def make_reusable_release(self, lock: dict[str, str], name: str = "old", *, current: bool = True) -> Path:
+        old = self.make_release(name)
+        (old / "lazy-lock.json").write_text(
+            json.dumps({plugin: {"branch": "main", "commit": commit} for plugin, commit in lock.items()}),
+            encoding="utf-8",
+        )
+        data = old / "xdg/data/nvim"
+        for plugin, commit in lock.items():
+            git_dir = data / "lazy" / plugin / ".git"
+            (git_dir / "refs/heads").mkdir(parents=True)
+            (git_dir / "HEAD").write_text("ref: refs/heads/main\n", encoding="utf-8")
+            (git_dir / "refs/heads/main").write_text(commit + "\n", encoding="utf-8")
+            (data / "lazy" / plugin / "init.lua").write_text(f"-- {plugin}\n", encoding="utf-8")
+        for package_name, version in (("pyright", "1.1.400"), ("clangd", "19.1.0")):
+            package = data / "mason/packages" / package_name
+            package.mkdir(parents=True)
+            receipt = {
+                "name": package_name,
+                "source": {"id": f"pkg:generic/{package_name}@{version}"},
+                "links": {"bin": {package_name: package_name}},
+            }
+            (package / "mason-receipt.json").write_text(json.dumps(receipt), encoding="utf-8")
+            (package / package_name).write_text(f'#!/usr/bin/env bash\nexec "{package}/real" "$@"\n', encoding="utf-8")
+            (package / "real").write_text("binary", encoding="utf-8")
+        (data / "mason/packages/pyright/venv").symlink_to(data / "mason/packages/pyright")
+        for language in ("lua", "python"):
+            for relative in (f"parser/{language}.so", f"parser-info/{language}.revision"):
+                (data / "site" / relative).parent.mkdir(parents=True, exist_ok=True)
+                (data / "site" / relative).write_text(language, encoding="utf-8")
+        if current:
+            self.link(self.release_root / "current", old)
+        return old
+
+    def reuse_candidate(self, lock: dict[str, str]) -> tuple[Path, nvim_release.ReleaseInstaller]:
+        (self.repo / "nvim/lazy-lock.json").write_text(
+            json.dumps({plugin: {"branch": "main", "commit": commit} for plugin, commit in lock.items()}),
+            encoding="utf-8",
+        )
+        candidate = self.make_release("new.candidate")
+        shutil.copy2(self.repo / "nvim/lazy-lock.json", candidate / "lazy-lock.json")
+        installer = self.installer()
+        installer._catalog_targets = lambda: ({"pyright": None, "clangd": "20.0.0", "marksman": None}, ["lua", "python", "c"])
+        # The store is only used on filesystems that reflink; copies stand in for clones here.
+        installer.reflinks = True
+        return candidate, installer
+
+    def test_candidate_is_seeded_from_store_only_with_unchanged_artifacts(self) -> None:
+        old = self.make_reusable_release({"blink.cmp": "a" * 40, "nvim-treesitter": "b" * 40, "mason.nvim": "c" * 40})
+        candidate, installer = self.reuse_candidate(
+            {"blink.cmp": "a" * 40, "nvim-treesitter": "b" * 40, "mason.nvim": "d" * 40, "aerial.nvim": "e" * 40}
+        )
+
+        installer.seed_plugins(candidate)
+        installer.seed_runtime(candidate)
+
+        data = candidate / "xdg/data/nvim"
+        store = self.release_root / "store"
+        reuse = installer.reuse
+        self.assertEqual(reuse["source"], "old")
+        self.assertEqual(reuse["plugins"]["reused"], ["blink.cmp", "nvim-treesitter"])
+        self.assertEqual(reuse["plugins"]["rebuilt"], {"aerial.nvim": "not installed in current", "mason.nvim": "lock commit changed"})
+        stored_plugin = store / "plugins/blink.cmp" / ("a" * 40) / "init.lua"
+        self.assertEqual((data / "lazy/blink.cmp/init.lua").read_text(encoding="utf-8"), stored_plugin.read_text(encoding="utf-8"))
+        self.assertFalse((data / "lazy/mason.nvim").exists())
+
+        self.assertEqual(reuse["mason"]["reused"], ["pyright"])
+        self.assertEqual(reuse["mason"]["versions"], {"pyright": "1.1.400"})
+        self.assertEqual(reuse["mason"]["rebuilt"]["clangd"], "current has 19.1.0, catalog pins 20.0.0")
+        self.assertEqual(reuse["mason"]["rebuilt"]["marksman"], "not installed in current")
+        package = data / "mason/packages/pyright"
+        self.assertIn(f'"{package}/real"', (package / "pyright").read_text(encoding="utf-8"))
+        self.assertIn(str(store / "mason/pyright/1.1.400/real"), (store / "mason/pyright/1.1.400/pyright").read_text(encoding="utf-8"))
+        self.assertNotIn(str(old), (package / "pyright").read_text(encoding="utf-8"))
+        self.assertEqual(os.readlink(package / "venv"), str(package))
+        self.assertEqual(os.readlink(data / "mason/bin/pyright"), "../packages/pyright/pyright")
+        self.assertFalse((data / "mason/bin/clangd").is_symlink())
+
+        self.assertEqual(reuse["parsers"]["reused"], ["lua", "python"])
+        self.assertEqual(reuse["parsers"]["rebuilt"], {"c": "not installed in current"})
+        self.assertEqual((data / "site/parser-info/python.revision").read_text(encoding="utf-8"), "python")
+        self.assertIn("parsers/lua/lua", installer.store_refs)
+        self.assertIn("plugins/blink.cmp/" + "a" * 40, installer.store_refs)
+
+    def test_writes_into_a_seeded_release_never_reach_the_store(self) -> None:
+        self.make_reusable_release({"blink.cmp": "a" * 40})
+        candidate, installer = self.reuse_candidate({"blink.cmp": "a" * 40})
+        installer.seed_plugins(candidate)
+        installer.seed_runtime(candidate)
+
+        data = candidate / "xdg/data/nvim"
+        store = self.release_root / "store"
+        pairs = {
+            data / "lazy/blink.cmp/init.lua": store / "plugins/blink.cmp" / ("a" * 40) / "init.lua",
+            data / "lazy/blink.cmp/.git/refs/heads/main": store / "plugins/blink.cmp" / ("a" * 40) / ".git/refs/heads/main",
+            data / "mason/packages/pyright/real": store / "mason/pyright/1.1.400/real",
+            data / "site/parser/lua.so": store / "parsers/lua/lua/parser/lua.so",
+        }
+        before = {stored: stored.read_bytes() for stored in pairs.values()}
+        for released, stored in pairs.items():
+            self.assertFalse(os.path.samefile(released, stored), released)
+            with released.open("ab") as handle:
+                handle.write(b"local edit\n")
+        self.assertEqual({stored: stored.read_bytes() for stored in pairs.values()}, before)
+
+    def test_store_is_skipped_without_reflinks(self) -> None:
+        old = self.make_reusable_release({"blink.cmp": "a" * 40})
+        candidate, installer = self.reuse_candidate({"blink.cmp": "a" * 40})
+        installer.reflinks = None
+        with mock.patch.object(nvim_release.fcntl, "ioctl", side_effect=OSError(errno.EOPNOTSUPP, "no reflink")):
+            installer.seed_plugins(candidate)
+            installer.seed_runtime(candidate)
+            installer.store_candidate(candidate)
+        self.assertFalse(installer.reflinks)
+        self.assertEqual([path.name for path in self.release_root.iterdir() if path.name.startswith(".reflink-probe")], [])
+
+        data = candidate / "xdg/data/nvim"
+        self.assertEqual(installer.reuse["plugins"]["reused"], ["blink.cmp"])
+        self.assertEqual(installer.reuse["mason"]["reused"], ["pyright"])
+        self.assertEqual(installer.reuse["parsers"]["reused"], ["lua", "python"])
+        self.assertEqual((data / "lazy/blink.cmp/init.lua").read_text(encoding="utf-8"), "-- blink.cmp\n")
+        package = data / "mason/packages/pyright"
+        self.assertIn(f'"{package}/real"', (package / "pyright").read_text(encoding="utf-8"))
+        self.assertIn(str(old), (old / "xdg/data/nvim/mason/packages/pyright/pyright").read_text(encoding="utf-8"))
+        self.assertEqual((data / "site/parser/lua.so").read_text(encoding="utf-8"), "lua")
+        self.assertFalse((self.release_root / "store").exists())
+        self.assertEqual(installer.store_refs, set())
+
+    def test_failed_copy_removes_everything_it_created(self) -> None:
+        self.make_reusable_release({"blink.cmp": "a" * 40})
+        candidate, installer = self.reuse_candidate({"blink.cmp": "a" * 40})
+        installer._catalog_targets = lambda: ({"pyright": None}, ["lua"])
+        data = candidate / "xdg/data/nvim"
+        disk_full = OSError(errno.ENOSPC, "disk full")
+        clone_tree, copy_file, link_package = installer._clone_tree, installer._copy_file, installer._link_mason_package
+
+        def clone_then_fail(source: Path, destination: Path, **kwargs) -> dict[str, int]:
+            counts = clone_tree(source, destination, **kwargs)
+            if destination.is_relative_to(candidate):
+                raise disk_full
+            return counts
+
+        def copy_then_fail(source: Path, destination: Path) -> None:
+            copy_file(source, destination)
+            if destination.suffix == ".revision" and destination.is_relative_to(candidate):
+                raise disk_full
+
+        def link_then_fail(*args) -> None:
+            link_package(*args)
+            raise disk_full
+
+        with mock.patch.object(installer, "_clone_tree", clone_then_fail):
+            installer.seed_plugins(candidate)
+        with mock.patch.object(installer, "_copy_file", copy_then_fail), mock.patch.object(
+            installer, "_link_mason_package", link_then_fail
+        ):
+            installer.seed_runtime(candidate)
+
+        for kind, name in (("plugins", "blink.cmp"), ("mason", "pyright"), ("parsers", "lua")):
+            self.assertEqual(installer.reuse[kind]["reused"], [])
+            self.assertTrue(installer.reuse[kind]["rebuilt"][name].startswith("copy failed: "), kind)
+        leftovers = ("lazy/blink.cmp", "mason/packages/pyright", "mason/bin/pyright", "site/parser/lua.so", "site/parser-info/lua.revision")
+        for leftover in leftovers:
+            self.assertFalse(os.path.lexists(data / leftover), leftover)
+        self.assertEqual(installer.store_refs, set())
+
+    def test_parser_revisions_come_from_the_candidate_treesitter(self) -> None:
+        self.make_reusable_release({"nvim-treesitter": "b" * 40})
+        candidate, installer = self.reuse_candidate({"nvim-treesitter": "f" * 40})
+        parsers_lua = candidate / "xdg/data/nvim/lazy/nvim-treesitter/lua/nvim-treesitter/parsers.lua"
+        parsers_lua.parent.mkdir(parents=True)
+        parsers_lua.write_text(
+            "return {\n"
+            "  lua = {\n    install_info = {\n      revision = 'lua',\n      url = 'x',\n    },\n  },\n"
+            "  python = {\n    install_info = {\n      revision = 'newer',\n    },\n  },\n"
+            "}\n",
+            encoding="utf-8",
+        )
+        (candidate / "xdg/data/nvim/lazy/nvim-treesitter/runtime/queries/lua").mkdir(parents=True)
+
+        installer.seed_runtime(candidate)
+
+        site = candidate / "xdg/data/nvim/site"
+        self.assertEqual(installer.reuse["parsers"]["reused"], ["lua"])
+        self.assertEqual(installer.reuse["parsers"]["rebuilt"]["python"], "parser revision changed")
+        self.assertFalse((site / "parser/python.so").exists())
+        self.assertEqual(os.readlink(site / "queries/lua"), "../../lazy/nvim-treesitter/runtime/queries/lua")
+        self.assertTrue((site / "queries/lua").is_dir())
+
+    def test_parsers_are_rebuilt_when_treesitter_moves_without_revisions(self) -> None:
+        self.make_reusable_release({"nvim-treesitter": "b" * 40})
+        candidate, installer = self.reuse_candidate({"nvim-treesitter": "f" * 40})
+        installer.seed_runtime(candidate)
+        self.assertEqual(installer.reuse["parsers"]["rebuilt"]["lua"], "nvim-treesitter commit changed")
+
+    def test_reuse_can_be_disabled(self) -> None:
+        self.make_reusable_release({"blink.cmp": "a" * 40})
+        candidate = self.make_release("new.candidate")
+        installer = nvim_release.ReleaseInstaller(
+            self.repo, self.home, release_root=self.release_root, skip_external_tools=True, skip_download=True, reuse=False
+        )
+        installer.seed_plugins(candidate)
+        installer.seed_runtime(candidate)
+        self.assertEqual(installer.reuse, {"source": None})
+        self.assertFalse((candidate / "xdg/data/nvim/lazy").exists())
+
+    def test_store_keeps_only_objects_referenced_by_kept_releases(self) -> None:
+        stale = self.make_reusable_release({"blink.cmp": "9" * 40}, name="stale", current=False)
+        old = self.make_reusable_release({"blink.cmp": "a" * 40})
+        installer = self.installer()
+        installer.reflinks = True
+        installer.store_candidate(stale)
+        stale_refs = set(installer.store_refs)
+        installer.store_refs = set()
+        installer.store_candidate(old)
+        self.assertIn("mason/clangd/19.1.0", installer.store_refs)
+        (old / "manifest.json").write_text(json.dumps({"store_refs": sorted(installer.store_refs)}), encoding="utf-8")
+        (stale / "manifest.json").write_text(json.dumps({"store_refs": sorted(stale_refs)}), encoding="utf-8")
+
+        installer.cleanup_old_releases(old)
+
+        store = self.release_root / "store"
+        self.assertFalse(stale.exists())
+        self.assertTrue((store / "plugins/blink.cmp" / ("a" * 40)).is_dir())
+        self.assertFalse((store / "plugins/blink.cmp" / ("9" * 40)).exists())
+        self.assertTrue((store / "parsers/lua/lua/parser/lua.so").is_file())
+        self.assertEqual((old / "xdg/data/nvim/lazy/blink.cmp/init.lua").read_text(encoding="utf-8"), "-- blink.cmp\n")
+
+    def test_build_phases_run_concurrently_with_separate_logs(self) -> None:
+        installer = self.installer()
+        log_dir = self.root / "logs"
+        marker = self.root / "mason-started"
+        phases = [
+            ("mason", ["bash", "-c", f"touch {marker}; sleep 0.5; echo mason done"]),
+            # Only passes when the mason phase is already running next to it.
+            ("parsers", ["bash", "-c", f"sleep 0.2; test -e {marker} && echo parsers done"]),
+        ]
+        installer._run_phases(phases, env=dict(os.environ), log_dir=log_dir)
+        self.assertEqual((log_dir / "mason.log").read_text(encoding="utf-8"), "mason done\n")
+        self.assertEqual((log_dir / "parsers.log").read_text(encoding="utf-8"), "parsers done\n")
+
+    def test_build_phases_respect_the_job_limit(self) -> None:
+        installer = nvim_release.ReleaseInstaller(self.repo, self.home, release_root=self.release_root, build_jobs=1)
+        marker = self.root / "mason-finished"
+        phases = [
+            ("mason", ["bash", "-c", f"sleep 0.2; touch {marker}"]),
+            ("parsers", ["bash", "-c", f"test -e {marker}"]),
+        ]
+        installer._run_phases(phases, env=dict(os.environ), log_dir=self.root / "logs")
+
+    def test_failed_build_phase_cancels_the_other_and_is_reported(self) -> None:
+        installer = self.installer()
+        phases = [
+            ("mason", ["bash", "-c", "sleep 30"]),
+            ("parsers", ["bash", "-c", "echo broken parser; exit 3"]),
+        ]
+        with self.assertRaisesRegex(nvim_release.ReleaseError, "build phase parsers exited with 3"):
+            installer._run_phases(phases, env=dict(os.environ), log_dir=self.root / "logs")
+        self.assertIn("broken parser", (self.root / "logs/parsers.log").read_text(encoding="utf-8"))
+
+    def test_build_phase_timeout_is_per_phase(self) -> None:
+        installer = self.installer()
+        phases = [("mason", ["bash", "-c", "true"]), ("parsers", ["bash", "-c", "sleep 30"])]
+        with mock.patch.dict(os.environ, {"HPF_NVIM_PARSERS_TIMEOUT": "1"}):
+            with self.assertRaisesRegex(nvim_release.ReleaseError, "build phase parsers timed out after 1s"):
+                installer._run_phases(phases, env=dict(os.environ), log_dir=self.root / "logs")
+
+    def test_malformed_numeric_settings_are_release_errors(self) -> None:
+        for name, value in (
+            ("HPF_NVIM_BUILD_JOBS", "two"),
+            ("HPF_NVIM_BENCH_RUNS", "-1"),
+            ("HPF_NVIM_BENCH_THRESHOLD", "nan"),
+        ):
+            with self.subTest(name=name), mock.patch.dict(os.environ, {name: value}):
+                with self.assertRaisesRegex(nvim_release.ReleaseError, name):
+                    self.installer()
+        with mock.patch.dict(os.environ, {"HPF_NVIM_BUILD_JOBS": "3", "HPF_NVIM_BENCH_THRESHOLD": "0.5"}):
+            installer = self.installer()
+        self.assertEqual((installer.build_jobs, installer.bench_threshold), (3, 0.5))
+
+        stderr = io.StringIO()
+        with mock.patch.dict(os.environ, {"HPF_NVIM_BUILD_JOBS": "-1"}), mock.patch("sys.stderr", stderr):
+            self.assertEqual(
+                nvim_release.main(["preflight", "--repo-root", str(self.repo), "--home", str(self.home)]), 1
+            )
+        self.assertIn("HPF_NVIM_BUILD_JOBS must be at least 1", stderr.getvalue())
+
+    def test_injected_build_phase_failure_is_raised_before_any_phase_starts(self) -> None:
+        marker = self.root / "started"
+        phases = [("mason", ["touch", str(marker)]), ("parsers", ["touch", str(marker)])]
+        for stage in ("mason", "parsers"):
+            with self.assertRaisesRegex(nvim_release.ReleaseError, f"injected failure at stage: {stage}"):
+                self.installer(fail_stage=stage)._run_phases(phases, env=dict(os.environ), log_dir=self.root / "logs")
+        self.assertFalse(marker.exists())
+
+    def git(self, *args: str) -> str:
+        return subprocess.run(
+            ["git", "-c", "user.name=t", "-c", "user.email=t@example.com", *args],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+
+    def make_upstream(self, source: str) -> Path:
+        repository = self.root / "upstream" / f"{source}.git"
+        repository.mkdir(parents=True)
+        self.git("init", "-q", "-b", "main", str(repository))
+        self.commit_upstream(repository)
+        return repository
+
+    def commit_upstream(self, repository: Path) -> str:
+        self.git("-C", str(repository), "commit", "-q", "--allow-empty", "-m", "change")
+        return self.git("-C", str(repository), "rev-parse", "HEAD")
+
+    def mirror_installer(self, **kwargs) -> nvim_release.ReleaseInstaller:
+        plugins = self.repo / "nvim/lua/plugins"
+        plugins.mkdir(parents=True, exist_ok=True)
+        (plugins / "ui.lua").write_text(
+            'return {\n  { "catppuccin/nvim", name = "catppuccin" },\n  { "tpope/vim-repeat", opts = { name = "other" } },\n}\n',
+            encoding="utf-8",
+        )
+        with mock.patch.dict(os.environ, {"HPF_NVIM_PLUGIN_UPSTREAM": str(self.root / "upstream")}):
+            return nvim_release.ReleaseInstaller(self.repo, self.home, release_root=self.release_root, **kwargs)
+
+    def write_lock(self, lock: dict[str, str]) -> None:
+        (self.repo / "nvim/lazy-lock.json").write_text(
+            json.dumps({name: {"branch": "main", "commit": commit} for name, commit in lock.items()}), encoding="utf-8"
+        )
+
+    def test_plugin_sources_follow_spec_names(self) -> None:
+        self.write_lock({"catppuccin": "a" * 40, "vim-repeat": "b" * 40})
+        self.assertEqual(
+            self.mirror_installer().plugin_sources(),
+            {"lazy.nvim": "folke/lazy.nvim", "catppuccin": "catppuccin/nvim", "vim-repeat": "tpope/vim-repeat"},
+        )
+
+    def test_mirror_refresh_clones_then_fetches_deltas(self) -> None:
+        lazy = self.make_upstream("folke/lazy.nvim")
+        theme = self.make_upstream("catppuccin/nvim")
+        self.write_lock({"catppuccin": self.git("-C", str(theme), "rev-parse", "HEAD")})
+        installer = self.mirror_installer()
+        self.assertEqual(installer.mirror_status(), {"catppuccin": "missing", "lazy.nvim": "missing"})
+
+        self.assertEqual(installer.refresh_mirror(), [])
+        self.assertEqual(installer.mirror_status(), {"catppuccin": "ok", "lazy.nvim": "ok"})
+        self.assertEqual(self.git("-C", str(self.release_root / "plugin-mirror/catppuccin/nvim.git"), "rev-parse", "--is-bare-repository"), "true")
+
+        self.write_lock({"catppuccin": self.commit_upstream(theme)})
+        self.assertEqual(installer.mirror_status()["catppuccin"], "stale")
+        installer.refresh_mirror()
+        self.assertEqual(installer.mirror_status()["catppuccin"], "ok")
+
+        installer.select_plugin_mirror()
+        self.assertEqual(installer.active_plugin_mirror, self.release_root / "plugin-mirror")
+        candidate = self.make_release("new.candidate")
+        with mock.patch.dict(os.environ, {"HPF_NVIM_PLUGIN_MIRROR": "/operator/mirror"}):
+            env = installer._release_env(candidate)
+        self.assertEqual(env["HPF_NVIM_LAZY_URL_FORMAT"], f"{self.release_root / 'plugin-mirror'}/%s.git")
+        self.assertEqual(env["HPF_NVIM_PLUGIN_MIRROR"], "/operator/mirror")
+        clone = self.release_root / "plugin-mirror/folke/lazy.nvim.git"
+        self.assertEqual(self.git("-C", str(clone), "rev-parse", "HEAD"), self.git("-C", str(lazy), "rev-parse", "HEAD"))
+        commands: list[list[str]] = []
+
+        def record(command: list[str], **kwargs) -> None:
+            commands.append(command)
+            entrypoint = Path(command[-1]) / "lua/lazy/init.lua"
+            entrypoint.parent.mkdir(parents=True)
+            entrypoint.write_text("return {}", encoding="utf-8")
+
+        installer._run = record
+        installer.install_lazy_bootstrap(candidate)
+        self.assertEqual(commands[0][-2], str(clone))
+
+        lazy_dir = candidate / "xdg/data/nvim/lazy"
+        shutil.rmtree(lazy_dir)
+        for name, source in (("lazy.nvim", "folke/lazy.nvim"), ("catppuccin", "catppuccin/nvim")):
+            self.git("clone", "-q", str(self.release_root / "plugin-mirror" / f"{source}.git"), str(lazy_dir / name))
+        installer.restore_plugin_origins(candidate)
+        for name, source in (("lazy.nvim", "folke/lazy.nvim"), ("catppuccin", "catppuccin/nvim")):
+            origin = self.git("-C", str(lazy_dir / name), "remote", "get-url", "origin")
+            self.assertEqual(origin, str(self.root / "upstream" / f"{source}.git"))
+
+    def test_offline_build_requires_a_complete_plugin_mirror(self) -> None:
+        self.make_upstream("folke/lazy.nvim")
+        self.write_lock({"catppuccin": "a" * 40})
+        installer = self.mirror_installer(offline=True)
+        with self.assertRaisesRegex(nvim_release.ReleaseError, "offline mode needs a plugin mirror"):
+            installer.select_plugin_mirror()
+        with self.assertRaisesRegex(nvim_release.ReleaseError, "offline mode"):
+            installer.refresh_mirror()
+        (self.release_root / "plugin-mirror").mkdir(parents=True)
+        with self.assertRaisesRegex(nvim_release.ReleaseError, r"catppuccin \(missing\)"):
+            installer.select_plugin_mirror()
+
+    def test_incomplete_mirror_falls_back_to_the_network(self) -> None:
+        self.write_lock({"catppuccin": "a" * 40})
+        (self.release_root / "plugin-mirror").mkdir(parents=True)
+        installer = self.mirror_installer()
+        installer.select_plugin_mirror()
+        self.assertIsNone(installer.active_plugin_mirror)
+        with mock.patch.dict(os.environ, {"HPF_NVIM_LAZY_URL_FORMAT": "/stale/%s.git"}):
+            self.assertEqual(installer._release_env(self.make_release("new.candidate"))["HPF_NVIM_LAZY_URL_FORMAT"], "")
+
     def test_lazy_bootstrap_retries_after_a_stalled_clone(self) -> None:
         candidate = self.make_release("new.candidate")
         installer = self.installer()
@@ -279,7 +958,9 @@ class NvimReleaseTest(unittest.TestCase):
         self.link(current, first)
         launcher = self.repo / "install-script/nvim/nvim-launcher"
         env = dict(os.environ, HOME=str(self.home), HPF_NVIM_RELEASE_ROOT=str(self.release_root))
+        env.pop("HPF_NVIM_PROCESS_DETECTION", None)
         subprocess.run([str(launcher)], check=True, env=env)
+        self.assertFalse((self.release_root / "pids").exists())
         current.unlink()
         current.symlink_to(second)
         observed = json.loads(output.read_text(encoding="utf-8"))
@@ -287,6 +968,9 @@ class NvimReleaseTest(unittest.TestCase):
         self.assertEqual(observed["data"], str(first / "xdg/data"))
         self.assertEqual(observed["config"], str(first / "xdg/config"))
 
+        subprocess.run([str(launcher)], check=True, env=dict(env, HPF_NVIM_PROCESS_DETECTION="registry"))
+        self.assertEqual(len(list((self.release_root / "pids").iterdir())), 1)
+
     def test_candidate_curl_wrapper_bounds_nested_downloads(self) -> None:
         candidate = self.make_release("new.candidate")
         installer = self.installer()
@@ -311,10 +995,157 @@ class NvimReleaseTest(unittest.TestCase):
         new = self.make_release("new")
         self.link(self.release_root / "current", new)
         self.link(self.release_root / "previous", old)
-        self.installer().cleanup_old_releases(new)
+        installer = self.installer()
+        installer.cleanup_old_releases(new)
         self.assertTrue(new.is_dir())
         self.assertTrue(old.is_dir())
         self.assertFalse(stale.exists())
+        trashed = [path.name for path in (self.release_root / "trash").iterdir()]
+        self.assertEqual(len(trashed), 1)
+        self.assertTrue(trashed[0].startswith("stale."))
+
+    def test_reaper_empties_trash_including_read_only_trees(self) -> None:
+        installer = self.installer()
+        release = self.make_release("stale")
+        readonly = release / "xdg/data/nvim/mason/packages/gopls/pkg/mod"
+        readonly.mkdir(parents=True)
+        (readonly / "go.mod").write_bytes(b"x" * 8192)
+        (release / "xdg/data/nvim/link").symlink_to(release / "xdg")
+        readonly.chmod(0o555)
+        installer._trash(release)
+        (self.release_root / "trash/loose-file").write_text("x", encoding="utf-8")
+
+        with mock.patch("time.sleep") as sleep:
+            freed = installer.reap_trash(bytes_per_second=1024, quiet=True)
+
+        self.assertGreater(freed, 0)
+        self.assertTrue(sleep.called)
+        self.assertEqual([path.name for path in (self.release_root / "trash").iterdir()], [".reaper.lock"])
+
+    def test_only_one_reaper_runs_at_a_time(self) -> None:
+        import fcntl
+
+        installer = self.installer()
+        installer._trash(self.make_release("stale"))
+        with (self.release_root / "trash/.reaper.lock").open("a+") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            self.assertEqual(installer.reap_trash(quiet=True), 0)
+        self.assertEqual(len(list((self.release_root / "trash").glob("stale.*"))), 1)
+
+    def test_reaper_is_detached_and_throttled(self) -> None:
+        installer = self.installer()
+        with mock.patch("subprocess.Popen") as popen:
+            installer.schedule_reaper()
+            popen.assert_not_called()
+            installer._trash(self.make_release("stale"))
+            installer.schedule_reaper()
+            default = popen.call_args.args[0]
+            self.assertEqual(default[default.index("--rate") + 1], str(nvim_release.GC_BYTES_PER_SECOND))
+            with mock.patch.dict(os.environ, {"HPF_NVIM_GC_BYTES_PER_SEC": "1000"}):
+                self.installer().schedule_reaper()
+        command = popen.call_args.args[0]
+        self.assertEqual(command[command.index("--rate") + 1], "1000")
+        self.assertIn("gc", command)
+        self.assertTrue(popen.call_args.kwargs["start_new_session"])
+
+    def test_bad_reaper_rate_is_rejected_before_installing(self) -> None:
+        for value in ("fast", "1.5", "-1"):
+            with self.subTest(value=value), mock.patch.dict(os.environ, {"HPF_NVIM_GC_BYTES_PER_SEC": value}):
+                with self.assertRaisesRegex(nvim_release.ReleaseError, "HPF_NVIM_GC_BYTES_PER_SEC must be"):
+                    self.installer()
+        with mock.patch.dict(os.environ, {"HPF_NVIM_GC_BYTES_PER_SEC": "0"}):
+            self.assertEqual(self.installer().gc_rate, 0)
+
+    FAKE_NVIM = """#!/usr/bin/env python3
+import re, sys, time
+from pathlib import Path
+timing = Path(__file__).with_name("timing").read_text().split()
+args = sys.argv[1:]
+with Path(__file__).with_name("calls").open("a") as calls:
+    calls.write(" ".join(args) + "\\n")
+if "--startuptime" in args:
+    log = Path(args[args.index("--startuptime") + 1])
+    log.write_text("times in msec\\n000.010  000.010: --- NVIM STARTING ---\\n%s  000.100: --- NVIM STARTED ---\\n" % timing[0])
+for arg in args:
+    match = re.search(r"writefile\\(.*\\[\\[(.+?)\\]\\]\\)", arg)
+    if match and timing[1] != "never":
+        Path(match.group(1)).write_text("%.6f" % (time.time() + float(timing[1]) / 1000))
+"""
+
+    def make_bench_release(self, name: str, startup_ms: float, attach_ms: float | str) -> Path:
+        release = self.make_release(name)
+        binary = release / "nvim/bin/nvim"
+        binary.write_text(self.FAKE_NVIM, encoding="utf-8")
+        (binary.parent / "timing").write_text(f"{startup_ms} {attach_ms}", encoding="utf-8")
+        (self.repo / "install-script/nvim/language_catalog.py").write_text(
+            "def load_catalog(path):\n    return {}\n\n"
+            "def projection(catalog):\n"
+            "    return {'fixtures': [{'language': 'python', 'filename': 'main.py', 'content': 'x = 1\\n', 'lsp_name': 'pyright'}]}\n",
+            encoding="utf-8",
+        )
+        if not (self.repo / ".git").exists():
+            self.git("init", "-q", str(self.repo))
+            self.git("-C", str(self.repo), "commit", "-q", "--allow-empty", "-m", "init")
+        return release
+
+    def test_benchmark_records_startup_and_lsp_attach(self) -> None:
+        candidate = self.make_bench_release("new.candidate", 42.5, 300)
+        installer = self.installer()
+        report = installer.benchmark_release(candidate, 3)
+        self.assertEqual(report["runs"], 3)
+        self.assertEqual(report["cases"]["startup"]["startup_ms"], {"p50": 42.5, "p95": 42.5})
+        python = report["cases"]["python/main.py"]
+        self.assertEqual(python["lsp_attach_timeouts"], 0)
+        self.assertGreaterEqual(python["lsp_attach_ms"]["p50"], 299)
+        self.assertNotIn("lsp_attach_ms", report["cases"]["startup"])
+
+    def test_benchmark_stops_sampling_a_fixture_whose_lsp_never_attaches(self) -> None:
+        candidate = self.make_bench_release("new.candidate", 40, "never")
+        report = self.installer().benchmark_release(candidate, 5)
+        python = report["cases"]["python/main.py"]
+        self.assertIsNone(python["lsp_attach_ms"])
+        self.assertEqual(python["lsp_attach_timeouts"], 1)
+        calls = (candidate / "nvim/bin/calls").read_text(encoding="utf-8").splitlines()
+        self.assertEqual(len([call for call in calls if "main.py" in call]), 1)
+        self.assertEqual(len([call for call in calls if "--startuptime" in call and "main.py" not in call]), 5)
+
+    def test_bench_command_fails_on_regression(self) -> None:
+        current = self.make_bench_release("old", 40, 200)
+        self.link(self.release_root / "current", current)
+        baseline = self.installer().benchmark_release(current, 2)
+        (current / "manifest.json").write_text(json.dumps({"startup": baseline}), encoding="utf-8")
+        argv = ["bench", "--repo-root", str(self.repo), "--home", str(self.home), "--release-root", str(self.release_root), "--bench-runs", "2"]
+        with mock.patch("sys.stdout", new_callable=io.StringIO), mock.patch("sys.stderr", new_callable=io.StringIO) as stderr:
+            self.assertEqual(nvim_release.main(argv), 0)
+            (current / "nvim/bin/timing").write_text("80 200", encoding="utf-8")
+            self.assertEqual(nvim_release.main(argv), 1)
+        self.assertIn("slower than recorded: startup startup_ms p50 40.0 -> 80.0", stderr.getvalue())
+
+    def test_verify_refuses_startup_regression_against_current(self) -> None:
+        current = self.make_bench_release("old", 40, 200)
+        self.link(self.release_root / "current", current)
+        installer = nvim_release.ReleaseInstaller(self.repo, self.home, release_root=self.release_root, bench_runs=2)
+        baseline = installer.benchmark_release(current, 2)
+        (current / "manifest.json").write_text(json.dumps({"startup": baseline}), encoding="utf-8")
+        installer.old_current = current
+        installer._run = lambda *args, **kwargs: None
+        candidate = self.make_bench_release("new.candidate", 80, 200)
+        with self.assertRaisesRegex(nvim_release.ReleaseError, r"startup regression.*startup_ms p50 40.0 -> 80.0"):
+            installer.verify_candidate(candidate)
+        (candidate / "nvim/bin/timing").write_text("45 210", encoding="utf-8")
+        installer.verify_candidate(candidate)
+        manifest = json.loads((candidate / "manifest.json").read_text(encoding="utf-8"))
+        self.assertEqual(manifest["startup"]["cases"]["startup"]["startup_ms"]["p50"], 45)
+
+    def test_benchmark_can_be_disabled(self) -> None:
+        candidate = self.make_bench_release("new.candidate", 40, 200)
+        with mock.patch.dict(os.environ, {"HPF_NVIM_BENCH_RUNS": "0"}):
+            installer = self.installer()
+        installer._run = lambda *args, **kwargs: None
+        installer.benchmark_release = mock.Mock()
+        installer.verify_candidate(candidate)
+        installer.benchmark_release.assert_not_called()
+        self.assertNotIn("startup", json.loads((candidate / "manifest.json").read_text(encoding="utf-8")))
 
     def test_created_config_link_is_removed_when_candidate_fails(self) -> None:
         (self.home / ".config/nvim").unlink()
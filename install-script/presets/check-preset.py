@@ -2,127 +2,41 @@
 """Validate the tools promised by a preset.
 
 This is intentionally read-only: it runs catalog check_cmd values and reports
-the missing member tools without invoking any installer.
+the missing member tools without invoking any installer. By default all shell
+checks run in a single generated bash script; ``--no-batch`` runs them one by
+one.
 """
 
 from __future__ import annotations
 
-import json
-import subprocess
+import importlib.util
 import sys
 from pathlib import Path
-from typing import Dict, Iterable, List
+from types import ModuleType
+from typing import Any, List
 
 
 INSTALL_ROOT = Path(__file__).resolve().parents[1]
-CATALOG_PATH = INSTALL_ROOT / "agent-tools.json"
-
-MINIMAL_MEMBERS = [
-    "git",
-    "gh",
-    "tmux",
-    "htop",
-    "bat",
-    "fzf",
-    "zoxide",
-]
-
-DEV_CLI_EXTRA_MEMBERS = [
-    "ranger",
-    "ncdu",
-    "tldr",
-    "yq",
-    "duf",
-    "gdu",
-    "xclip",
-    "ag",
-    "lazygit",
-    "nvm",
-    "eza",
-    "broot",
-    "sd",
-    "ouch",
-    "just",
-    "delta",
-    "doggo",
-    "tre",
-    "btm",
-    "fd",
-    "glow",
-    "tealdeer",
-    "fkill",
-    "btop",
-    "dust",
-    "procs",
-]
-
-DEV_FULL_EXTRA_MEMBERS = [
-    "build-essential",
-    "xmake",
-    "yazi",
-    "mprocs",
-    "pysocks",
-    "gdbgui",
-    "gdbfrontend",
-    "zellij",
-    "lnav",
-    "bandwhich",
-]
-
-BOOTSTRAP_MEMBERS = [
-    "folder-create",
-    "bashrc",
-    "git",
-    "gh",
-    "github-ssh",
-]
-
-PRESET_MEMBERS = {
-    "bootstrap": BOOTSTRAP_MEMBERS,
-    "minimal": MINIMAL_MEMBERS,
-    "dev-cli": MINIMAL_MEMBERS + DEV_CLI_EXTRA_MEMBERS,
-    "dev-full": MINIMAL_MEMBERS + DEV_CLI_EXTRA_MEMBERS + DEV_FULL_EXTRA_MEMBERS,
-    "all-tools": BOOTSTRAP_MEMBERS
-    + MINIMAL_MEMBERS
-    + DEV_CLI_EXTRA_MEMBERS
-    + DEV_FULL_EXTRA_MEMBERS,
-}
-
-
-def unique(items: Iterable[str]) -> List[str]:
-    seen = set()
-    result: List[str] = []
-    for item in items:
-        if item not in seen:
-            seen.add(item)
-            result.append(item)
-    return result
+RUNNER_PATH = INSTALL_ROOT / "agent-runner.py"
 
 
-def normalize_preset_name(name: str) -> str:
-    return name[7:] if name.startswith("preset-") else name
+def load_runner() -> ModuleType:
+    """Import agent-runner.py so preset membership has a single source of truth."""
+    spec = importlib.util.spec_from_file_location("agent_runner", RUNNER_PATH)
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
 
 
-def load_tool_map() -> Dict[str, dict]:
-    with CATALOG_PATH.open("r", encoding="utf-8") as handle:
-        data = json.load(handle)
-
-    tool_map: Dict[str, dict] = {}
-    for category in data.get("categories", []):
-        for tool in category.get("tools", []):
-            tool_map[tool["id"]] = tool
-    return tool_map
+def normalize_preset_name(name: str) -> str:
+    return name[7:] if name.startswith("preset-") else name
 
 
-def run_check(tool_id: str, tool: dict) -> bool:
-    completed = subprocess.run(
-        ["bash", "-lc", tool["check_cmd"]],
-        cwd=str(INSTALL_ROOT),
-        text=True,
-        capture_output=True,
-    )
+def report_check(spec: Any, completed: Any) -> bool:
     status = "ok" if completed.returncode == 0 else "missing"
-    print("{:<8} {} - {}".format(status, tool_id, tool["name"]))
+    print("{:<8} {} - {}".format(status, spec.tool_id, spec.name))
     if completed.returncode == 0:
         return True
 
@@ -134,26 +48,37 @@ def run_check(tool_id: str, tool: dict) -> bool:
 
 
 def main(argv: List[str]) -> int:
+    flags = {arg for arg in argv[1:] if arg in ("--no-cache", "--no-batch")}
+    argv = [argv[0]] + [arg for arg in argv[1:] if arg not in flags]
     if len(argv) != 2:
-        print("usage: check-preset.py <preset-name>", file=sys.stderr)
+        print("usage: check-preset.py [--no-cache] [--no-batch] <preset-name>", file=sys.stderr)
+        return 2
+
+    runner = load_runner()
+    try:
+        _catalog, tool_map, presets = runner.load_catalog()
+    except (OSError, ValueError) as exc:
+        print("failed to load catalog: {}".format(exc), file=sys.stderr)
         return 2
 
     preset_name = normalize_preset_name(argv[1])
-    members = PRESET_MEMBERS.get(preset_name)
-    if members is None:
+    if preset_name not in presets:
         print("unknown preset: {}".format(argv[1]), file=sys.stderr)
         return 2
 
-    tool_map = load_tool_map()
+    cache = runner.open_check_cache("--no-cache" not in flags)
+    specs = [tool_map[tool_id] for tool_id in runner.preset_members(preset_name, presets)]
     failed = False
-    for tool_id in unique(members):
-        tool = tool_map.get(tool_id)
-        if tool is None:
-            print("missing catalog entry: {}".format(tool_id), file=sys.stderr)
-            failed = True
-            continue
-        failed = not run_check(tool_id, tool) or failed
-
+    if "--no-batch" in flags:
+        # One shell per check: slower, but isolates a check that misbehaves.
+        for spec in specs:
+            failed = not report_check(spec, runner.run_cached_check(spec, cache)) or failed
+    else:
+        for spec, completed in zip(specs, runner.run_check_batch(specs, cache)):
+            failed = not report_check(spec, completed) or failed
+
+    if cache is not None:
+        cache.save()
     return 1 if failed else 0
 
 
@@ -0,0 +1,548 @@
+from __future__ import annotations
+
+import importlib.util
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+MODULE_PATH = Path(__file__).resolve().parents[1] / "agent-runner.py"
+SPEC = importlib.util.spec_from_file_location("agent_runner", MODULE_PATH)
+assert SPEC and SPEC.loader
+agent_runner = importlib.util.module_from_spec(SPEC)
+# dataclasses resolve annotations through sys.modules while the module executes.
+sys.modules[SPEC.name] = agent_runner
+SPEC.loader.exec_module(agent_runner)
+
+
+class AgentRunnerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory(prefix="agent-runner-test-")
+        self.root = Path(self.tempdir.name)
+        self.log_root = self.root / "logs"
+        patcher = mock.patch.object(agent_runner, "LOG_ROOT", self.log_root)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.events = self.root / "events"
+
+    def tearDown(self) -> None:
+        self.tempdir.cleanup()
+
+    def tool(self, tool_id: str, body: str = "", **fields) -> agent_runner.ToolSpec:
+        script = self.root / "scripts" / "{}.sh".format(tool_id)
+        script.parent.mkdir(exist_ok=True)
+        script.write_text(body or "exit 0\n", encoding="utf-8")
+        values = dict(
+            category_id="tools",
+            category_name="Tools",
+            tool_id=tool_id,
+            name=tool_id,
+            description=tool_id,
+            script=str(script),
+            requires_sudo=False,
+            requires_ssh=False,
+            check_cmd="true",
+            timeout=30,
+        )
+        values.update(fields)
+        return agent_runner.ToolSpec(**values)
+
+    def traced(self, tool_id: str, exit_code: int = 0, **fields) -> agent_runner.ToolSpec:
+        """A script that records when it starts and ends in the shared events file."""
+        body = "echo start {0} >> {1}\nsleep 0.3\necho end {0} >> {1}\nexit {2}\n".format(
+            tool_id, self.events, exit_code
+        )
+        return self.tool(tool_id, body, **fields)
+
+    @staticmethod
+    def node(spec: agent_runner.ToolSpec, *depends_on: str) -> agent_runner.PresetNode:
+        return agent_runner.PresetNode(spec.tool_id, spec, tuple(depends_on), spec.locks)
+
+    def run_plan(self, nodes, jobs: int):
+        with mock.patch("sys.stdout", new_callable=io.StringIO), mock.patch(
+            "sys.stderr", new_callable=io.StringIO
+        ):
+            return agent_runner.execute_preset_plan(nodes, jobs)
+
+    def event_lines(self) -> list:
+        return self.events.read_text(encoding="utf-8").splitlines()
+
+    def test_real_catalog_plans_every_preset(self) -> None:
+        data = json.loads(agent_runner.CONFIG_PATH.read_text(encoding="utf-8"))
+        _catalog, tool_map, presets = agent_runner.parse_catalog(data)
+        for name in presets:
+            labels = [node.label for node in agent_runner.plan_preset(name, presets, tool_map)]
+            self.assertEqual(len(labels), len(set(labels)), name)
+            for index, node in enumerate(agent_runner.plan_preset(name, presets, tool_map)):
+                self.assertTrue(set(node.depends_on) <= set(labels[:index]), node.label)
+
+    def test_dependency_runs_after_its_prerequisite(self) -> None:
+        base = self.traced("base")
+        child = self.traced("child")
+        results = self.run_plan([self.node(child, "base"), self.node(base)], jobs=4)
+        self.assertEqual(results, {"base": 0, "child": 0})
+        self.assertEqual(self.event_lines(), ["start base", "end base", "start child", "end child"])
+
+    def test_independent_nodes_run_in_parallel_up_to_jobs(self) -> None:
+        nodes = [self.node(self.traced(name)) for name in ("a", "b", "c")]
+        self.run_plan(nodes, jobs=2)
+        lines = self.event_lines()
+        self.assertEqual(sorted(lines[:2]), ["start a", "start b"])
+        self.assertLess(min(lines.index("end a"), lines.index("end b")), lines.index("start c"))
+
+    def test_shared_lock_is_exclusive(self) -> None:
+        first = self.traced("first", locks=("apt",))
+        second = self.traced("second", locks=("apt",))
+        free = self.traced("free")
+        self.run_plan([self.node(first), self.node(second), self.node(free)], jobs=3)
+        lines = self.event_lines()
+        self.assertLess(lines.index("end first"), lines.index("start second"))
+        self.assertLess(lines.index("start free"), lines.index("end first"))
+
+    def test_failed_dependency_skips_dependents(self) -> None:
+        broken = self.traced("broken", exit_code=3)
+        dependent = self.traced("dependent")
+        transitive = self.traced("transitive")
+        other = self.traced("other")
+        results = self.run_plan(
+            [
+                self.node(broken),
+                self.node(dependent, "broken"),
+                self.node(transitive, "dependent"),
+                self.node(other),
+            ],
+            jobs=2,
+        )
+        self.assertEqual(results, {"broken": 3, "dependent": None, "transitive": None, "other": 0})
+        self.assertNotIn("start dependent", self.event_lines())
+
+    def test_check_jobs_bound_concurrency_and_keep_catalog_order(self) -> None:
+        check = "echo start {0} >> {1}; sleep {2}; echo end {0} >> {1}; exit {3}"
+        specs = [
+            self.tool(name, check_cmd=check.format(name, self.events, delay, status))
+            for name, delay, status in (("a", 0.6, 0), ("b", 0.1, 0), ("c", 0.1, 1), ("d", 0.1, 0))
+        ]
+        catalog = [("tools", "Tools", specs)]
+        tool_map = {spec.tool_id: spec for spec in specs}
+        with mock.patch.dict(os.environ), mock.patch.object(
+            agent_runner, "_login_path", os.environ.get("PATH", "")
+        ), mock.patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            return_code = agent_runner.command_check("all", catalog, tool_map, jobs=2, use_cache=False)
+        self.assertEqual(return_code, 1)
+        self.assertEqual(
+            [line.split()[:2] for line in stdout.getvalue().splitlines()],
+            [["ok", "a"], ["ok", "b"], ["missing", "c"], ["ok", "d"]],
+        )
+        running = peak = 0
+        for line in self.event_lines():
+            running += 1 if line.startswith("start") else -1
+            peak = max(peak, running)
+        self.assertEqual(peak, 2)
+        # b, c and d finish on the second worker while a is still running.
+        self.assertLess(self.event_lines().index("end d"), self.event_lines().index("end a"))
+
+    def test_dependency_cycle_is_rejected(self) -> None:
+        tool_map = {
+            "a": self.tool("a", depends_on=("b",)),
+            "b": self.tool("b", depends_on=("a",)),
+        }
+        with self.assertRaisesRegex(ValueError, "dependency cycle"):
+            agent_runner.validate_dependencies(tool_map)
+
+    def test_catalog_snapshot_is_invalidated_by_same_size_edits(self) -> None:
+        config = self.root / "agent-tools.json"
+        config.write_bytes(agent_runner.CONFIG_PATH.read_bytes())
+        with mock.patch.object(agent_runner, "CONFIG_PATH", config), mock.patch.object(
+            agent_runner, "CATALOG_SNAPSHOT_PATH", self.root / "cache/agent-tools.marshal"
+        ):
+            self.assertEqual(agent_runner.load_catalog()[1]["yq"].name, "Yq")
+            with mock.patch.object(agent_runner, "parse_catalog") as parse:
+                self.assertEqual(agent_runner.load_catalog()[1]["yq"].name, "Yq")
+            parse.assert_not_called()
+
+            # Same size, mtime restored: only the inode or ctime can tell.
+            previous = "Yq"
+            for name, swap in (("YQ", False), ("yQ", True)):
+                stat = config.stat()
+                text = config.read_text(encoding="utf-8")
+                text = text.replace('"name": "{}"'.format(previous), '"name": "{}"'.format(name))
+                target = self.root / "agent-tools.json.new" if swap else config
+                target.write_text(text, encoding="utf-8")
+                previous = name
+                if swap:
+                    target.replace(config)
+                os.utime(str(config), ns=(stat.st_atime_ns, stat.st_mtime_ns))
+                self.assertEqual(config.stat().st_size, stat.st_size)
+                self.assertEqual(agent_runner.load_catalog()[1]["yq"].name, name)
+
+    def test_classify_check_only_accepts_shell_free_commands(self) -> None:
+        cases = {
+            "command -v git": ("which", "git"),
+            "which fd": ("which", "fd"),
+            "  command -v g++ >/dev/null 2>&1  ": ("which", "g++"),
+            "lnav --version": ("version", "lnav"),
+            "bat --version > /dev/null": ("version", "bat"),
+            "command -v yq >/dev/null 2>&1 && yq --version": None,
+            "command -v node || command -v npm": None,
+            "which a b": None,
+            "fd --version | grep -q 10": None,
+            "FOO=1 fd --version": None,
+            "python3 -m gdbfrontend --version": None,
+            "test -d ~/project": None,
+            "command -v $TOOL": None,
+        }
+        for command, expected in cases.items():
+            with self.subTest(command=command):
+                self.assertEqual(agent_runner.classify_check(command), expected)
+
+    def test_fast_path_uses_login_path_and_falls_back_to_bash(self) -> None:
+        bin_dir = self.root / "bin"
+        bin_dir.mkdir()
+        binary = bin_dir / "fakebin"
+        binary.write_text("#!/bin/sh\n", encoding="utf-8")
+        binary.chmod(0o755)
+        login = "{}:/usr/bin:/bin".format(bin_dir)
+        cases = [
+            # (check_cmd, check_login_shell, argv of the spawned process or None, returncode)
+            ("command -v fakebin", False, None, 0),
+            ("command -v missingbin", False, None, 1),
+            ("missingbin --version", False, None, 127),
+            ("fakebin --version", False, [str(binary), "--version"], 0),
+            ("fakebin --version | grep -q 1", False, ["bash", "-c", "fakebin --version | grep -q 1"], 0),
+            ("command -v fakebin", True, ["bash", "-lc", "command -v fakebin"], 0),
+        ]
+        for command, login_shell, argv, returncode in cases:
+            spec = self.tool("fast", check_cmd=command, check_login_shell=login_shell)
+            spawned = mock.Mock(returncode=0)
+            with self.subTest(command=command, login_shell=login_shell), mock.patch.object(
+                agent_runner, "_login_path", login
+            ), mock.patch.object(agent_runner, "_run_check_process", return_value=spawned) as run:
+                completed = agent_runner.run_check_command(spec)
+                if argv is None:
+                    run.assert_not_called()
+                    self.assertEqual(completed.returncode, returncode)
+                    if returncode == 0:
+                        self.assertEqual(completed.stdout, "{}\n".format(binary))
+                    continue
+                self.assertIs(completed, spawned)
+                _command, spawned_argv, env, timeout = run.call_args.args
+                self.assertEqual((spawned_argv, timeout), (argv, agent_runner.CHECK_TIMEOUT))
+                # Login shells read their own PATH; everything else gets the cached one.
+                self.assertEqual(None if env is None else env["PATH"], None if login_shell else login)
+
+    def test_check_cache_is_invalidated_by_binary_fingerprint(self) -> None:
+        bin_dir = self.root / "bin"
+        bin_dir.mkdir()
+        binary = bin_dir / "fakebin"
+        binary.write_text("#!/bin/sh\n", encoding="utf-8")
+        binary.chmod(0o755)
+        spec = self.tool("fakebin", check_cmd="command -v fakebin")
+        cache_path = self.root / "check-cache.json"
+        with mock.patch.object(agent_runner, "_login_path", str(bin_dir)):
+            cache = agent_runner.CheckCache(cache_path, ttl=3600)
+            self.assertIsNone(cache.get(spec))
+            completed = agent_runner.run_cached_check(spec, cache)
+            self.assertEqual(completed.returncode, 0)
+            cache.save()
+
+            reloaded = agent_runner.CheckCache(cache_path, ttl=3600)
+            self.assertEqual(reloaded.get(spec).stdout, completed.stdout)
+            binary.write_text("#!/bin/sh\n# upgraded\n", encoding="utf-8")
+            self.assertIsNone(reloaded.get(spec))
+
+            agent_runner.run_cached_check(spec, reloaded)
+            self.assertIsNotNone(reloaded.get(spec))
+            reloaded.invalidate([spec.tool_id])
+            reloaded.save()
+            self.assertIsNone(agent_runner.CheckCache(cache_path, ttl=3600).get(spec))
+            self.assertIsNone(agent_runner.CheckCache(cache_path, ttl=0).get(spec))
+
+    def test_shell_checks_are_cached_only_when_the_catalog_opts_in(self) -> None:
+        guarded = "command -v fakebin >/dev/null && test -f ~/.fakebinrc"
+        self.assertEqual(agent_runner.check_binary(self.tool("plain", check_cmd="command -v fakebin")), "fakebin")
+        self.assertIsNone(agent_runner.check_binary(self.tool("guarded", check_cmd=guarded)))
+        opted_in = self.tool("opted", check_cmd=guarded, check_cache_binary="fakebin")
+        self.assertEqual(agent_runner.check_binary(opted_in), "fakebin")
+        login = self.tool("login", check_cmd=guarded, check_cache_binary="fakebin", check_login_shell=True)
+        self.assertIsNone(agent_runner.check_binary(login))
+
+        data = json.loads(agent_runner.CONFIG_PATH.read_text(encoding="utf-8"))
+        _catalog, tool_map, _presets = agent_runner.parse_catalog(data)
+        self.assertEqual(agent_runner.check_binary(tool_map["yq"]), "yq")
+        self.assertIsNone(agent_runner.check_binary(tool_map["nvm"]))
+        data["categories"][-1]["tools"][0]["check_cache_binary"] = ""
+        with self.assertRaisesRegex(ValueError, "check_cache_binary"):
+            agent_runner.parse_catalog(data)
+
+    def test_bad_check_cache_ttl_falls_back_to_default(self) -> None:
+        cache_path = self.root / "check-cache.json"
+        for value, expected, warned in (("1h", 3600, True), ("-5", 3600, True), ("0", 0, False), ("60", 60, False)):
+            with self.subTest(value=value), mock.patch.dict(
+                os.environ, {"HPF_CHECK_CACHE_TTL": value}
+            ), mock.patch("sys.stderr", new_callable=io.StringIO) as stderr:
+                self.assertEqual(agent_runner.CheckCache(cache_path).ttl, expected)
+                self.assertEqual("ignoring HPF_CHECK_CACHE_TTL" in stderr.getvalue(), warned)
+
+    def run_batch(self, *check_cmds: str) -> list:
+        specs = [
+            self.tool("check{}".format(index), check_cmd=command)
+            for index, command in enumerate(check_cmds)
+        ]
+        with mock.patch.object(agent_runner, "_login_path", os.environ.get("PATH", "")):
+            return agent_runner.run_check_batch(specs)
+
+    def test_check_batch_survives_a_check_that_exits(self) -> None:
+        results = self.run_batch("echo before; exit 7; echo after", "echo next")
+        self.assertEqual([completed.returncode for completed in results], [7, 0])
+        self.assertEqual(results[0].stdout, "before\n")
+        self.assertEqual(results[1].stdout, "next\n")
+
+    def test_check_batch_times_out_a_hanging_check(self) -> None:
+        with mock.patch.object(agent_runner, "CHECK_TIMEOUT", 1):
+            started = time.monotonic()
+            results = self.run_batch("echo first", "echo waiting; sleep 30", "echo last")
+        self.assertLess(time.monotonic() - started, 10)
+        self.assertEqual([completed.returncode for completed in results], [0, 124, 0])
+        self.assertEqual(results[1].stdout, "waiting\n")
+        self.assertIn("timed out", results[1].stderr)
+        self.assertEqual(results[2].stdout, "last\n")
+
+    def test_declared_check_timeout_outlasts_the_default(self) -> None:
+        slow = self.tool("slow", check_cmd="sleep 1.5; echo slow", check_timeout=5)
+        hung = self.tool("hung", check_cmd="sleep 30")
+        after = self.tool("after", check_cmd="echo after")
+        with mock.patch.object(agent_runner, "CHECK_TIMEOUT", 1), mock.patch.object(
+            agent_runner, "_login_path", os.environ.get("PATH", "")
+        ):
+            results = agent_runner.run_check_batch([slow, hung, after])
+            single = agent_runner.run_check_command(slow)
+        self.assertEqual([completed.returncode for completed in results], [0, 124, 0])
+        self.assertEqual(results[0].stdout, "slow\n")
+        self.assertIn("after 1 seconds", results[1].stderr)
+        self.assertEqual((single.returncode, single.stdout), (0, "slow\n"))
+
+    def test_real_catalog_check_timeouts_cover_their_own_timeouts(self) -> None:
+        import re
+
+        data = json.loads(agent_runner.CONFIG_PATH.read_text(encoding="utf-8"))
+        _catalog, tool_map, _presets = agent_runner.parse_catalog(data)
+        for spec in tool_map.values():
+            match = re.match(r"timeout (\d+)s? ", spec.check_cmd)
+            if match:
+                self.assertGreater(agent_runner.check_timeout(spec), int(match.group(1)), spec.tool_id)
+
+    def test_check_batch_ignores_marker_like_output(self) -> None:
+        results = self.run_batch("echo '1 0'; echo '0 5' >&2; exit 3", "false")
+        self.assertEqual([completed.returncode for completed in results], [3, 1])
+        self.assertEqual(results[0].stdout, "1 0\n")
+        self.assertEqual(results[0].stderr, "0 5\n")
+
+    def supervise(self, *specs: agent_runner.ToolSpec, prefixed: bool = False):
+        """Run ``specs`` under one supervisor; return (finished children by id, stdout)."""
+        self.log_root.mkdir(parents=True, exist_ok=True)
+        supervisor = agent_runner.ScriptSupervisor()
+        finished = {}
+        with mock.patch("sys.stdout", new_callable=io.StringIO) as stdout, mock.patch(
+            "sys.stderr", new_callable=io.StringIO
+        ):
+            for spec in specs:
+                prefix = "[{}] ".format(spec.tool_id) if prefixed else ""
+                supervisor.start(spec.tool_id, spec, self.log_root / spec.tool_id, prefix)
+            while len(supervisor):
+                for child in supervisor.wait_any():
+                    finished[child.key] = child
+        return finished, stdout.getvalue()
+
+    def test_supervisor_times_out_a_script(self) -> None:
+        finished, _output = self.supervise(self.tool("slow", "echo hi\nsleep 30\n", timeout=1))
+        self.assertEqual(finished["slow"].return_code, 124)
+        self.assertLess(finished["slow"].runtime, 5)
+        self.assertIn("timed out", (self.log_root / "slow").read_text(encoding="utf-8"))
+
+    def test_supervisor_does_not_wait_for_a_grandchild_holding_the_pipe(self) -> None:
+        started = time.monotonic()
+        finished, output = self.supervise(self.tool("bg", "sleep 10 &\necho done\n"))
+        self.assertEqual(finished["bg"].return_code, 0)
+        self.assertEqual(output, "done\n")
+        self.assertLess(time.monotonic() - started, agent_runner.STREAM_DRAIN_GRACE + 3)
+
+    def test_supervisor_keeps_interleaved_prefixed_lines_whole(self) -> None:
+        body = "printf '{0}-one '\nsleep 0.2\necho {0}-two\nsleep 0.2\nprintf '{0}-tail'\n"
+        finished, output = self.supervise(
+            self.tool("a", body.format("a")), self.tool("b", body.format("b")), prefixed=True
+        )
+        self.assertEqual({child.return_code for child in finished.values()}, {0})
+        self.assertTrue(output.endswith("\n"))
+        self.assertEqual(
+            sorted(output.splitlines()),
+            ["[a] a-one a-two", "[a] a-tail", "[b] b-one b-two", "[b] b-tail"],
+        )
+
+    def test_supervisor_ends_an_unterminated_last_line(self) -> None:
+        _finished, output = self.supervise(self.tool("plain", "printf 'no newline'\n"))
+        self.assertEqual(output, "no newline\n")
+
+    def write_log(self, tool_id: str, stamp: str, text: str = "line\n", age: float = 600) -> Path:
+        self.log_root.mkdir(parents=True, exist_ok=True)
+        path = self.log_root / "{}_{}.log".format(tool_id, stamp)
+        path.write_text(text, encoding="utf-8")
+        mtime = time.time() - age
+        os.utime(str(path), (mtime, mtime))
+        return path
+
+    def run_main(self, *argv: str, **environ: str):
+        """Run ``main(argv)`` and return (exit code, stdout, stderr)."""
+        with mock.patch.dict(os.environ, environ), mock.patch(
+            "sys.stdout", new_callable=io.StringIO
+        ) as stdout, mock.patch("sys.stderr", new_callable=io.StringIO) as stderr:
+            return_code = agent_runner.main(list(argv))
+        return return_code, stdout.getvalue(), stderr.getvalue()
+
+    def test_log_maintenance_prunes_by_count_and_size(self) -> None:
+        for day in range(1, 6):
+            self.write_log("tool", "2026010{}T000000".format(day), "x" * 100)
+        self.write_log("big", "20260101T000000", "x" * 100)
+        self.write_log("big", "20260102T000000", "x" * 300)
+        with mock.patch.dict(os.environ, {"HPF_LOG_COMPRESSION": "none"}):
+            agent_runner.maintain_logs(keep=2, max_bytes=250, quiet=True)
+        self.assertEqual(
+            sorted(path.name for path in self.log_root.glob("*.log")),
+            ["big_20260102T000000.log", "tool_20260104T000000.log", "tool_20260105T000000.log"],
+        )
+
+    def test_log_maintenance_compresses_only_finished_logs(self) -> None:
+        settled = self.write_log("tool", "20260101T000000", "settled\n")
+        fresh = self.write_log("tool", "20260102T000000", age=0)
+        finished = self.write_log("tool", "20260103T000000", "finished\n", age=0)
+        held = self.write_log("tool", "20260104T000000")
+        hold = agent_runner.LogHold(held)
+        try:
+            with mock.patch.dict(os.environ, {"HPF_LOG_COMPRESSION": "gzip"}):
+                agent_runner.maintain_logs(100, 1 << 30, quiet=True, finished=[finished])
+        finally:
+            hold.release()
+        self.assertFalse(settled.exists())
+        self.assertTrue(settled.with_name(settled.name + ".gz").exists())
+        self.assertTrue(finished.with_name(finished.name + ".gz").exists())
+        self.assertTrue(fresh.exists())
+        self.assertTrue(held.exists())
+        self.assertEqual(
+            list(agent_runner.iter_log_lines(finished.with_name(finished.name + ".gz"))),
+            ["finished\n"],
+        )
+
+    def test_logs_subcommand_lists_tails_and_searches_compressed_logs(self) -> None:
+        self.write_log("tool", "20260101T000000", "old error\n")
+        self.write_log("tool", "20260102T000000", "one\ntwo error\nthree\n")
+        return_code, _stdout, _stderr = self.run_main(
+            "logs", "maintain", "--quiet", HPF_LOG_COMPRESSION="gzip"
+        )
+        self.assertEqual(return_code, 0)
+
+        return_code, stdout, _stderr = self.run_main("logs", "list", "tool")
+        self.assertEqual(return_code, 0)
+        self.assertEqual(len(stdout.splitlines()), 2)
+        self.assertIn("tool_20260102T000000.log.gz", stdout)
+
+        self.assertEqual(self.run_main("logs", "tail", "tool", "-n", "2")[:2], (0, "two error\nthree\n"))
+        self.assertEqual(self.run_main("logs", "tail", "missing")[0], 2)
+
+        return_code, stdout, _stderr = self.run_main("logs", "search", "ERROR", "-i", "--tool", "tool")
+        self.assertEqual(return_code, 0)
+        self.assertEqual(
+            stdout.splitlines(),
+            ["tool_20260101T000000.log.gz:1: old error", "tool_20260102T000000.log.gz:2: two error"],
+        )
+        self.assertEqual(self.run_main("logs", "search", "absent")[0], 1)
+
+    def test_bad_log_settings_fall_back_to_defaults(self) -> None:
+        for day in range(1, 4):
+            self.write_log("tool", "2026010{}T000000".format(day))
+        return_code, _stdout, stderr = self.run_main(
+            "logs", "maintain", "--quiet", HPF_LOG_KEEP="many", HPF_LOG_MAX_MB="0"
+        )
+        self.assertEqual(return_code, 0)
+        self.assertIn("ignoring HPF_LOG_KEEP='many'", stderr)
+        self.assertIn("ignoring HPF_LOG_MAX_MB='0'", stderr)
+        self.assertEqual(len(list(self.log_root.glob("tool_*"))), 3)
+        # Other subcommands never look at the log settings.
+        with mock.patch.dict(os.environ, {"HPF_LOG_KEEP": "many"}):
+            agent_runner.build_parser().parse_args(["list"])
+
+    def test_run_journal_feeds_stats_and_skips_a_truncated_line(self) -> None:
+        journal_root = self.root / "journal"
+
+        def child(runtime: float, exit_code: int, tool_id: str):
+            return mock.Mock(
+                return_code=exit_code,
+                runtime=runtime,
+                output_bytes=2048,
+                maxrss_kb=4096,
+                log_path=self.log_root / "{}.log".format(tool_id),
+            )
+
+        with mock.patch.object(agent_runner, "JOURNAL_ROOT", journal_root):
+            for runtime, exit_code in ((1.0, 0), (3.0, 2)):
+                journal = agent_runner.RunJournal("install", "git")
+                journal.timed("catalog_load", lambda: None)
+                spec = self.tool("git")
+                journal.add_step("git", spec, child(runtime, exit_code, "git"))
+                journal.finish(exit_code)
+            preset = agent_runner.RunJournal("preset", "preset-x")
+            preset.add_step("a", self.tool("a"), child(0.5, 0, "a"))
+            preset.add_step("b", self.tool("b"), None)
+            preset.finish(1)
+            self.assertEqual(preset.logs, [str(self.log_root / "a.log")])
+            (journal_file,) = journal_root.glob("runs-*.jsonl")
+            with journal_file.open("a", encoding="utf-8") as handle:
+                handle.write('{"version": 1, "tool_id": "git", "dura')
+
+            records = list(agent_runner.read_journals([journal_root]))
+            self.assertEqual([record["tool_id"] for record in records], ["git", "git", "preset-x"])
+            stats = agent_runner.aggregate_journals(iter(records))
+            self.assertEqual(sorted(stats), ["a", "b", "git", "preset-x"])
+            self.assertEqual((stats["git"]["runs"], stats["git"]["failures"]), (2, 1))
+            self.assertEqual(stats["git"]["metrics"]["script"], {"count": 2, "p50": 1.0, "p95": 3.0})
+            self.assertEqual(stats["git"]["metrics"]["catalog_load"]["count"], 2)
+            self.assertEqual((stats["b"]["runs"], stats["b"]["failures"]), (1, 1))
+            self.assertEqual((stats["preset-x"]["runs"], stats["preset-x"]["failures"]), (1, 1))
+
+            return_code, stdout, _stderr = self.run_main("stats", str(journal_root), "--json")
+            self.assertEqual(return_code, 0)
+            self.assertEqual(json.loads(stdout), stats)
+            return_code, stdout, _stderr = self.run_main("stats")
+        self.assertEqual(return_code, 0)
+        rows = [line.split() for line in stdout.splitlines()]
+        self.assertIn(["git", "2", "1", "catalog_load"], [row[:4] for row in rows])
+        self.assertIn(["script", "1.00s", "3.00s"], rows)
+        self.assertIn(["a", "1", "0", "maxrss_kb", "4.0MiB", "4.0MiB"], rows)
+        self.assertEqual(self.run_main("stats", str(self.root / "missing.jsonl"))[0], 2)
+
+    def test_preset_install_invalidates_member_checks(self) -> None:
+        data = json.loads(agent_runner.CONFIG_PATH.read_text(encoding="utf-8"))
+        _catalog, tool_map, presets = agent_runner.parse_catalog(data)
+        child = mock.Mock(return_code=0, runtime=0.0, output_bytes=0, maxrss_kb=0)
+        with mock.patch.object(agent_runner, "stream_script", return_value=child), mock.patch.object(
+            agent_runner, "verify_install", return_value=0
+        ), mock.patch.object(agent_runner, "ensure_sudo", return_value=0), mock.patch.object(
+            agent_runner, "invalidate_checks"
+        ) as invalidate, mock.patch("sys.stdout", new_callable=io.StringIO):
+            self.assertEqual(
+                agent_runner.command_install("preset-dev-cli", False, tool_map, presets=presets), 0
+            )
+            self.assertEqual(agent_runner.command_install("git", False, tool_map, presets=presets), 0)
+        preset_ids = invalidate.call_args_list[0].args[0]
+        self.assertIn("preset-dev-cli", preset_ids)
+        self.assertIn("preset-minimal", preset_ids)
+        self.assertTrue(set(agent_runner.preset_members("dev-cli", presets)) <= set(preset_ids))
+        self.assertEqual(invalidate.call_args_list[1].args[0], ["git"])
+
+
+if __name__ == "__main__":
+    unittest.main()
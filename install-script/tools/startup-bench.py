@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""Measure cold and warm startup of the install-script CLI entry points."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+SCRIPT_ROOT = Path(__file__).resolve().parents[1]
+REPO_ROOT = SCRIPT_ROOT.parent
+IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def default_cases(home: Path) -> dict[str, list[str]]:
+    runner = str(SCRIPT_ROOT / "agent-runner.py")
+    release = str(SCRIPT_ROOT / "nvim/nvim-release.py")
+    cases = {"agent-runner --help": [runner, "--help"]}
+    # The runner refuses every real subcommand outside ~/hpf_Linux_Config.
+    if REPO_ROOT == Path.home() / "hpf_Linux_Config":
+        cases.update(
+            {
+                "agent-runner list": [runner, "list"],
+                "agent-runner install --dry-run": [runner, "install", "git", "--dry-run"],
+                "agent-runner preset --dry-run": [runner, "preset", "minimal", "--dry-run"],
+            }
+        )
+    else:
+        print(f"[bench] {REPO_ROOT} is not ~/hpf_Linux_Config; skipping agent-runner subcommands", file=sys.stderr)
+    return cases | {
+        "check-preset minimal": [str(SCRIPT_ROOT / "presets/check-preset.py"), "minimal"],
+        "language_catalog validate": [str(SCRIPT_ROOT / "nvim/language_catalog.py"), "validate"],
+        "language_catalog plan": [str(SCRIPT_ROOT / "nvim/language_catalog.py"), "plan"],
+        "nvim-release --help": [release, "--help"],
+        "nvim-release preflight": [
+            release,
+            "preflight",
+            "--repo-root",
+            str(REPO_ROOT),
+            "--home",
+            str(home),
+            "--release-root",
+            str(home / "releases"),
+        ],
+    }
+
+
+def run_once(command: list[str], env: dict[str, str], *, importtime: bool = False) -> tuple[float, str]:
+    argv = [sys.executable]
+    if importtime:
+        argv += ["-X", "importtime"]
+    started = time.perf_counter()
+    result = subprocess.run(
+        argv + command,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=False,
+    )
+    elapsed = time.perf_counter() - started
+    # check-preset exits 1 when a member tool is missing; that is a result,
+    # not a broken entry point.
+    if result.returncode not in (0, 1):
+        raise RuntimeError(f"exit {result.returncode}: {' '.join(command)}\n{result.stderr.strip()}")
+    return elapsed, result.stderr
+
+
+def parse_importtime(stderr: str, top: int) -> dict[str, object]:
+    modules: list[tuple[int, str]] = []
+    total = 0
+    for line in stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if not match:
+            continue
+        cumulative = int(match.group(2))
+        modules.append((cumulative, match.group(4)))
+        # Top-level imports carry one space of indentation; their cumulative
+        # times add up to the whole import graph.
+        if len(match.group(3)) == 1:
+            total += cumulative
+    modules.sort(reverse=True)
+    return {
+        "total_us": total,
+        "modules": len(modules),
+        "heaviest": [{"module": name, "cumulative_us": value} for value, name in modules[:top]],
+    }
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    return {
+        "min_ms": round(min(samples) * 1000, 2),
+        "median_ms": round(statistics.median(samples) * 1000, 2),
+    }
+
+
+def bench_case(command: list[str], base_env: dict[str, str], runs: int, top: int) -> dict[str, object]:
+    cold: list[float] = []
+    for _ in range(runs):
+        # A fresh pycache prefix forces every module to be recompiled, which
+        # is what the first run after a checkout or upgrade pays.
+        with tempfile.TemporaryDirectory(prefix="hpf-bench-pycache-") as prefix:
+            elapsed, _ = run_once(command, {**base_env, "PYTHONPYCACHEPREFIX": prefix})
+            cold.append(elapsed)
+
+    with tempfile.TemporaryDirectory(prefix="hpf-bench-pycache-") as prefix:
+        env = {**base_env, "PYTHONPYCACHEPREFIX": prefix}
+        run_once(command, env)
+        warm = [run_once(command, env)[0] for _ in range(runs)]
+        _, stderr = run_once(command, env, importtime=True)
+
+    return {
+        "cold": summarize(cold),
+        "warm": summarize(warm),
+        "importtime": parse_importtime(stderr, top),
+    }
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], threshold: float) -> list[str]:
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        for phase in ("cold", "warm"):
+            before = previous[phase]["median_ms"]
+            after = result[phase]["median_ms"]
+            if before > 0 and after > before * (1 + threshold):
+                regressions.append(f"{name} {phase}: {before:.1f} ms -> {after:.1f} ms")
+    return regressions
+
+
+def print_report(results: dict[str, dict]) -> None:
+    print(f"{'case':34} {'cold min':>9} {'cold med':>9} {'warm min':>9} {'warm med':>9} {'imports':>9}")
+    for name, result in results.items():
+        importtime = result["importtime"]
+        print(
+            f"{name:34} {result['cold']['min_ms']:>9.1f} {result['cold']['median_ms']:>9.1f}"
+            f" {result['warm']['min_ms']:>9.1f} {result['warm']['median_ms']:>9.1f}"
+            f" {importtime['total_us'] / 1000:>7.1f}ms"
+        )
+        heaviest = ", ".join(f"{item['module']} {item['cumulative_us'] / 1000:.1f}ms" for item in importtime["heaviest"])
+        if heaviest:
+            print(f"  heaviest: {heaviest}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark CLI startup (wall clock and -X importtime).")
+    parser.add_argument("--runs", type=int, default=5, help="samples per phase (default: 5)")
+    parser.add_argument("--top", type=int, default=5, help="heaviest imports to report per case")
+    parser.add_argument("--case", action="append", default=[], help="only run cases containing this text")
+    parser.add_argument("--json", type=Path, help="write results to this JSON file")
+    parser.add_argument("--compare", type=Path, help="baseline JSON written by a previous --json run")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="allowed median slowdown against --compare before failing (default: 0.2 = 20%%)",
+    )
+    args = parser.parse_args(argv)
+    if args.runs < 1:
+        parser.error("--runs must be >= 1")
+
+    with tempfile.TemporaryDirectory(prefix="hpf-bench-home-") as home:
+        # nvim-release preflight takes a lock and probes free space under its
+        # release root; point it at a scratch home so the real one is untouched.
+        home_path = Path(home)
+        (home_path / "releases").mkdir()
+        base_env = dict(os.environ)
+        base_env.pop("PYTHONDONTWRITEBYTECODE", None)
+        cases = default_cases(home_path)
+        if args.case:
+            cases = {name: command for name, command in cases.items() if any(item in name for item in args.case)}
+        if not cases:
+            parser.error("no benchmark case matched --case")
+
+        results: dict[str, dict] = {}
+        for name, command in cases.items():
+            try:
+                results[name] = bench_case(command, base_env, args.runs, args.top)
+            except RuntimeError as error:
+                print(f"[bench] {name} failed: {error}", file=sys.stderr)
+                return 1
+
+    print_report(results)
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("[bench] startup regressions:", file=sys.stderr)
+            for line in regressions:
+                print(f"  {line}", file=sys.stderr)
+            return 1
+        print("[bench] no startup regression against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
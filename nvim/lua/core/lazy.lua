@@ -2,6 +2,11 @@
   Lazy.nvim plugin manager configuration
 --]]
 
+-- nvim-release sets this to its local bare-repo mirror (<mirror>/%s.git) while
+-- building a release whose locked commits are all mirrored; unset or empty
+-- means clone from GitHub.
+local url_format = vim.env.HPF_NVIM_LAZY_URL_FORMAT ~= "" and vim.env.HPF_NVIM_LAZY_URL_FORMAT or nil
+
 -- Bootstrap lazy.nvim
 local lazypath = vim.fn.stdpath "data" .. "/lazy/lazy.nvim"
 if not (vim.uv or vim.loop).fs_stat(lazypath) then
@@ -9,7 +14,7 @@ if not (vim.uv or vim.loop).fs_stat(lazypath) then
     "git",
     "clone",
     "--filter=blob:none",
-    "https://github.com/folke/lazy.nvim.git",
+    url_format and url_format:format "folke/lazy.nvim" or "https://github.com/folke/lazy.nvim.git",
     "--branch=stable",
     lazypath,
   }
@@ -19,6 +24,7 @@ vim.opt.rtp:prepend(lazypath)
 -- Load lazy.nvim with plugin specs from lua/plugins/
 require("lazy").setup("plugins", {
   lockfile = vim.env.HPF_NVIM_LOCKFILE or vim.fn.stdpath "config" .. "/lazy-lock.json",
+  git = url_format and { url_format = url_format } or nil,
   -- Lazy.nvim configuration
   defaults = {
     lazy = false,
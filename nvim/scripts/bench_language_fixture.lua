@@ -0,0 +1,109 @@
+-- Loaded with --cmd by `language_catalog.py bench`: hooks are registered before
+-- the fixture buffer is read, and finish() runs after startup from a +lua arg.
+local fixture = vim.json.decode(table.concat(vim.fn.readfile(vim.env.HPF_BENCH_FIXTURE), "\n"))
+local t0 = tonumber(vim.env.HPF_BENCH_T0)
+local timeout = tonumber(vim.env.HPF_BENCH_TIMEOUT_MS) or 20000
+-- Servers publish soon after attaching; clean fixtures may never publish at all.
+local diagnostic_grace = tonumber(vim.env.HPF_BENCH_DIAGNOSTIC_GRACE_MS) or 2000
+local result = {
+  filetype = nil,
+  lsp_attach_ms = nil,
+  first_diagnostic_ms = nil,
+  formatters = {},
+  linters = {},
+  errors = {},
+}
+
+-- Milliseconds since the driver spawned Neovim, so startup is included.
+local function since_spawn()
+  local seconds, microseconds = vim.uv.gettimeofday()
+  return (seconds + microseconds / 1e6 - t0) * 1000
+end
+
+local group = vim.api.nvim_create_augroup("HPFBench", { clear = true })
+vim.api.nvim_create_autocmd("LspAttach", {
+  group = group,
+  callback = function(event)
+    local client = vim.lsp.get_client_by_id(event.data.client_id)
+    if client and client.name == fixture.lsp_name and not result.lsp_attach_ms then
+      result.lsp_attach_ms = since_spawn()
+    end
+  end,
+})
+vim.api.nvim_create_autocmd("DiagnosticChanged", {
+  group = group,
+  callback = function()
+    result.first_diagnostic_ms = result.first_diagnostic_ms or since_spawn()
+  end,
+})
+
+local function elapsed(callback)
+  local started = vim.uv.hrtime()
+  callback()
+  return (vim.uv.hrtime() - started) / 1e6
+end
+
+_G.HPFBench = {}
+
+function HPFBench.finish()
+  result.filetype = vim.bo.filetype
+  if fixture.lsp_name then
+    if not vim.wait(timeout, function()
+      return result.lsp_attach_ms ~= nil
+    end, 5) then
+      table.insert(result.errors, "LSP did not attach: " .. fixture.lsp_name)
+    end
+  end
+  if result.lsp_attach_ms then
+    -- Linter diagnostics are caught while the linters run below.
+    vim.wait(math.min(timeout, diagnostic_grace), function()
+      return result.first_diagnostic_ms ~= nil
+    end, 5)
+  end
+
+  for _, formatter in ipairs(fixture.formatters) do
+    local ok, error = pcall(function()
+      local attempted, format_error
+      local ms = elapsed(function()
+        attempted = require("conform").format({
+          bufnr = 0,
+          formatters = { formatter.name },
+          async = false,
+          timeout_ms = timeout,
+          lsp_format = "never",
+        }, function(err)
+          format_error = err
+        end)
+      end)
+      -- conform returns false instead of raising when the formatter is unavailable.
+      assert(attempted, "did not run (unavailable or not configured)")
+      assert(not format_error, format_error)
+      result.formatters[formatter.name] = ms
+    end)
+    if not ok then
+      table.insert(result.errors, string.format("formatter %s: %s", formatter.name, tostring(error)))
+    end
+  end
+
+  for _, linter in ipairs(fixture.linters) do
+    local ok, error = pcall(function()
+      local lint = require "lint"
+      result.linters[linter.name] = elapsed(function()
+        lint.try_lint(linter.name)
+        -- try_lint only notifies when the linter command is missing.
+        assert(vim.tbl_contains(lint.get_running(0), linter.name), "did not run (unavailable or not configured)")
+        assert(
+          vim.wait(timeout, function()
+            return not vim.tbl_contains(lint.get_running(0), linter.name)
+          end, 5),
+          "timed out"
+        )
+      end)
+    end)
+    if not ok then
+      table.insert(result.errors, string.format("linter %s: %s", linter.name, tostring(error)))
+    end
+  end
+
+  vim.fn.writefile({ vim.json.encode(result) }, vim.env.HPF_BENCH_OUTPUT)
+end